@@ -1,4 +1,5 @@
 import base64
+import datetime
 import json
 import logging
 import secrets
@@ -10,8 +11,10 @@ from werkzeug.exceptions import NotFound
 
 from configs import dify_config
 from constants.languages import languages
+from core.helper.model_provider_cache import ProviderConfigurationsCache
 from core.rag.datasource.vdb.vector_factory import Vector
 from core.rag.datasource.vdb.vector_type import VectorType
+from core.rag.extractor import extraction_cache
 from core.rag.index_processor.constant.built_in_field import BuiltInField
 from core.rag.models.document import Document
 from events.app_event import app_was_created
@@ -27,6 +30,7 @@ from models.dataset import Document as DatasetDocument
 from models.model import Account, App, AppAnnotationSetting, AppMode, Conversation, MessageAnnotation
 from models.provider import Provider, ProviderModel
 from services.account_service import RegisterService, TenantService
+from services.app_statistic_rollup_service import AppStatisticRollupService
 from services.clear_free_plan_tenant_expired_logs import ClearFreePlanTenantExpiredLogs
 from services.plugin.data_migration import PluginDataMigration
 from services.plugin.plugin_migration import PluginMigration
@@ -134,6 +138,8 @@ def reset_encrypt_key_pair():
         db.session.query(ProviderModel).filter(ProviderModel.tenant_id == tenant.id).delete()
         db.session.commit()
 
+        ProviderConfigurationsCache(tenant_id=tenant.id).delete()
+
         click.echo(
             click.style(
                 "Congratulations! The asymmetric key pair of workspace {} has been reset.".format(tenant.id),
@@ -968,6 +974,14 @@ def clear_orphaned_file_records():
 
     # delete orphaned records for each file
     try:
+        # contents of the orphaned upload files, their extraction results are deleted with them
+        query = "SELECT tenant_id, hash FROM upload_files WHERE id IN :ids AND hash IS NOT NULL"
+        with db.engine.begin() as conn:
+            rs = conn.execute(db.text(query), {"ids": tuple(orphaned_files)})
+        orphaned_hashes_by_tenant: dict[str, set[str]] = {}
+        for i in rs:
+            orphaned_hashes_by_tenant.setdefault(str(i[0]), set()).add(i[1])
+
         for files_table in files_tables:
             click.echo(click.style(f"- Deleting orphaned file records in table {files_table['table']}", fg="white"))
             query = f"DELETE FROM {files_table['table']} WHERE {files_table['id_column']} IN :ids"
@@ -978,6 +992,16 @@ def clear_orphaned_file_records():
         return
     click.echo(click.style(f"Removed {len(orphaned_files)} orphaned file records.", fg="green"))
 
+    # delete the extraction results of the contents no other upload file has
+    try:
+        for tenant_id, hashes in orphaned_hashes_by_tenant.items():
+            query = "SELECT DISTINCT hash FROM upload_files WHERE tenant_id = :tenant_id AND hash IN :hashes"
+            with db.engine.begin() as conn:
+                rs = conn.execute(db.text(query), {"tenant_id": tenant_id, "hashes": tuple(hashes)})
+            extraction_cache.delete(tenant_id, list(hashes - {i[0] for i in rs}))
+    except Exception as e:
+        click.echo(click.style(f"Error deleting extraction results of orphaned files: {str(e)}", fg="red"))
+
 
 @click.command("remove-orphaned-files-on-storage", help="Remove orphaned files on the storage.")
 def remove_orphaned_files_on_storage():
@@ -989,8 +1013,9 @@ def remove_orphaned_files_on_storage():
     files_tables = [
         {"table": "upload_files", "key_column": "key"},
         {"table": "tool_files", "key_column": "file_key"},
+        {"table": "extraction_caches", "key_column": "storage_key"},
     ]
-    storage_paths = ["image_files", "tools", "upload_files"]
+    storage_paths = ["image_files", "tools", "upload_files", "extraction_caches"]
 
     # notify user and ask for confirmation
     click.echo(click.style("This command will find and remove orphaned files on the storage,", fg="yellow"))
@@ -1087,3 +1112,34 @@ def remove_orphaned_files_on_storage():
         click.echo(click.style(f"Removed {removed_files} orphaned files without errors.", fg="green"))
     else:
         click.echo(click.style(f"Removed {removed_files} orphaned files, with {error_files} errors.", fg="yellow"))
+
+
+@click.command("backfill-app-statistics", help="Backfill the hourly app statistic rollups.")
+@click.option(
+    "--start-date",
+    help="The UTC date (YYYY-MM-DD) to backfill from, defaults to the first message or workflow run.",
+    default=None,
+)
+def backfill_app_statistics(start_date: Optional[str]):
+    """
+    Backfill the hourly app statistic rollups of existing messages and workflow runs.
+    """
+    click.echo(click.style("Starting backfill app statistics.", fg="white"))
+
+    start_at: Optional[datetime.datetime]
+    if start_date:
+        start_at = datetime.datetime.strptime(start_date, "%Y-%m-%d")
+    else:
+        with db.engine.begin() as conn:
+            start_at = conn.execute(
+                db.text(
+                    "SELECT LEAST((SELECT MIN(created_at) FROM messages), (SELECT MIN(created_at) FROM workflow_runs))"
+                )
+            ).scalar()
+        if start_at is None:
+            click.echo(click.style("No messages or workflow runs to backfill.", fg="yellow"))
+            return
+
+    AppStatisticRollupService.backfill(start_at)
+
+    click.echo(click.style(f"Backfill app statistics from {start_at} completed.", fg="green"))
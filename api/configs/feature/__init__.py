@@ -65,6 +65,21 @@ class AppExecutionConfig(BaseSettings):
         description="Maximum number of requests per app per day",
         default=5000,
     )
+    APP_GENERATE_MAX_WORKERS: NonNegativeInt = Field(
+        description="Maximum number of app generations running concurrently per process"
+        " (0 for a new thread per generation)",
+        default=0,
+    )
+    APP_GENERATE_MAX_QUEUED: NonNegativeInt = Field(
+        description="Maximum number of app generations waiting for a worker per process,"
+        " further generations are rejected, only used with APP_GENERATE_MAX_WORKERS",
+        default=100,
+    )
+    STREAM_EVENT_ORJSON_ENABLED: bool = Field(
+        description="Encode the streamed events with orjson if installed,"
+        " which writes compact JSON without escaping non-ASCII characters",
+        default=False,
+    )
 
 
 class CodeExecutionSandboxConfig(BaseSettings):
@@ -337,6 +352,12 @@ class HttpConfig(BaseSettings):
         default=1 * 1024 * 1024,
     )
 
+    HTTP_REQUEST_NODE_STREAMING_THRESHOLD: PositiveInt = Field(
+        description="Size in bytes above which request files are streamed from storage and response bodies are"
+        " spooled to a temporary file, instead of being held in memory",
+        default=1 * 1024 * 1024,
+    )
+
     HTTP_REQUEST_NODE_SSL_VERIFY: bool = Field(
         description="Enable or disable SSL verification for HTTP requests",
         default=True,
@@ -456,6 +477,70 @@ class ModelLoadBalanceConfig(BaseSettings):
         default=False,
     )
 
+    GPT2_TOKENIZER_PROCESS_POOL_SIZE: NonNegativeInt = Field(
+        description="Number of worker processes used to count GPT-2 tokens of large texts (0 to count inline)",
+        default=0,
+    )
+
+    MODEL_LB_COOLDOWN_REFRESH_INTERVAL: PositiveInt = Field(
+        description="Interval in seconds at which load balancing cooldowns set by other processes are read from redis",
+        default=5,
+    )
+
+    MODEL_LB_LATENCY_WEIGHTING_ENABLED: bool = Field(
+        description="Enable or disable choosing load balancing configs weighted by their observed response times"
+        " instead of round robin",
+        default=False,
+    )
+
+
+class ProviderConfigurationsCacheConfig(BaseSettings):
+    """
+    Configuration for the in-process cache of workspace model provider configurations
+    """
+
+    PROVIDER_CONFIGURATIONS_CACHE_ENABLED: bool = Field(
+        description="Enable or disable caching of model provider configurations (including decrypted credentials)"
+        " in process memory",
+        default=True,
+    )
+
+    PROVIDER_CONFIGURATIONS_CACHE_TTL: PositiveInt = Field(
+        description="Maximum age in seconds of a cached model provider configurations snapshot",
+        default=60,
+    )
+
+    PROVIDER_CONFIGURATIONS_CACHE_MAX_TENANTS: PositiveInt = Field(
+        description="Maximum number of workspaces whose model provider configurations are cached per process",
+        default=1000,
+    )
+
+
+class CredentialDecryptionCacheConfig(BaseSettings):
+    """
+    Configuration for the in-process caches used when decrypting workspace credentials
+    """
+
+    CREDENTIAL_DECODING_CACHE_MAX_TENANTS: PositiveInt = Field(
+        description="Maximum number of workspaces whose parsed private keys are cached per process",
+        default=1024,
+    )
+
+    CREDENTIAL_DECODING_CACHE_TTL: PositiveInt = Field(
+        description="Maximum age in seconds of a cached parsed private key",
+        default=120,
+    )
+
+    DECRYPTED_CREDENTIAL_CACHE_MAX_SIZE: PositiveInt = Field(
+        description="Maximum number of decrypted credential tokens cached per process",
+        default=8192,
+    )
+
+    DECRYPTED_CREDENTIAL_CACHE_TTL: PositiveInt = Field(
+        description="Maximum age in seconds of a cached decrypted credential token",
+        default=300,
+    )
+
 
 class BillingConfig(BaseSettings):
     """
@@ -587,6 +672,17 @@ class ModerationConfig(BaseSettings):
         default=300,
     )
 
+    MODERATION_WINDOW_OVERLAP: NonNegativeInt = Field(
+        description="Number of already moderated characters sent again with each new window of a streamed output,"
+        " to catch content split across windows",
+        default=100,
+    )
+
+    MODERATION_WORKER_POOL_SIZE: PositiveInt = Field(
+        description="Number of threads moderating the streamed outputs of all responses of a process",
+        default=8,
+    )
+
 
 class ToolConfig(BaseSettings):
     """
@@ -755,6 +851,29 @@ class IndexingConfig(BaseSettings):
         default=50,
     )
 
+    PDF_EXTRACTION_PROCESS_POOL_SIZE: NonNegativeInt = Field(
+        description="Number of worker processes extracting the pages of large PDF files in parallel"
+        " (0 to extract them inline)",
+        default=0,
+    )
+
+    EXTRACTION_CACHE_ENABLED: bool = Field(
+        description="Whether to keep the text extracted from uploaded files in storage, by content hash,"
+        " to skip extracting the same content again",
+        default=True,
+    )
+
+    EXTRACTION_CACHE_RETENTION_DAYS: PositiveInt = Field(
+        description="Number of days after which an unused extraction result is deleted",
+        default=30,
+    )
+
+    EXTRACTION_CACHE_MAX_SIZE_PER_TENANT: PositiveInt = Field(
+        description="Maximum size in MB of the extraction results kept per workspace,"
+        " the least recently used ones are deleted beyond it",
+        default=1024,
+    )
+
 
 class MultiModalTransferConfig(BaseSettings):
     MULTIMODAL_SEND_FORMAT: Literal["base64", "url"] = Field(
@@ -762,6 +881,22 @@ class MultiModalTransferConfig(BaseSettings):
         default="base64",
     )
 
+    FILE_CONTENT_CACHE_ENABLED: bool = Field(
+        description="Enable or disable caching of the bytes and base64 encodings of storage files sent to models"
+        " in process memory",
+        default=True,
+    )
+
+    FILE_CONTENT_CACHE_MAX_SIZE: PositiveInt = Field(
+        description="Maximum total size in megabytes of the cached file contents per process",
+        default=64,
+    )
+
+    FILE_CONTENT_CACHE_MAX_ITEM_SIZE: PositiveInt = Field(
+        description="Maximum size in megabytes of a single cached file content, larger files are not cached",
+        default=10,
+    )
+
 
 class CeleryBeatConfig(BaseSettings):
     CELERY_BEAT_SCHEDULER_TIME: int = Field(
@@ -770,6 +905,73 @@ class CeleryBeatConfig(BaseSettings):
     )
 
 
+class AppStatisticRollupConfig(BaseSettings):
+    """
+    Configuration for the hourly app statistic rollups read by the console statistic endpoints
+    """
+
+    APP_STATISTIC_ROLLUP_ENABLED: bool = Field(
+        description="Enable or disable the hourly app statistic rollups and their compaction task",
+        default=True,
+    )
+
+    APP_STATISTIC_ROLLUP_INTERVAL: PositiveInt = Field(
+        description="Interval in minutes between app statistic rollup compactions",
+        default=10,
+    )
+
+    APP_STATISTIC_ROLLUP_LOOKBACK_HOURS: PositiveInt = Field(
+        description="Number of already compacted hours rebuilt on every compaction,"
+        " to pick up late updates of messages and workflow runs",
+        default=2,
+    )
+
+
+class RetrievalStatsBufferConfig(BaseSettings):
+    """
+    Configuration for the buffered segment hit counts and dataset queries of the app retrievals
+    """
+
+    RETRIEVAL_STATS_BUFFER_ENABLED: bool = Field(
+        description="Buffer the segment hit counts and dataset queries of the app retrievals in redis,"
+        " and write them to the database in batches from the celery beat, only enable it with a celery beat running",
+        default=False,
+    )
+
+    RETRIEVAL_STATS_FLUSH_INTERVAL: PositiveInt = Field(
+        description="Interval in seconds between flushes of the buffered segment hit counts and dataset queries",
+        default=60,
+    )
+
+    RETRIEVAL_STATS_FLUSH_BATCH_SIZE: PositiveInt = Field(
+        description="Number of buffered segment hit counts or dataset queries written per database statement",
+        default=1000,
+    )
+
+
+class AnnotationReplyConfig(BaseSettings):
+    """
+    Configuration for matching chat queries against the annotations of an app
+    """
+
+    ANNOTATION_REPLY_LOCAL_INDEX_ENABLED: bool = Field(
+        description="Match annotations against an in-process vector index of the app annotations"
+        " instead of searching the vector database on every chat turn",
+        default=False,
+    )
+
+    ANNOTATION_REPLY_LOCAL_INDEX_MAX_SIZE: PositiveInt = Field(
+        description="Maximum number of annotations of an app held in the in-process index,"
+        " apps with more annotations are searched in the vector database",
+        default=10000,
+    )
+
+    ANNOTATION_REPLY_LOCAL_INDEX_MAX_APPS: PositiveInt = Field(
+        description="Maximum number of apps whose annotation index is kept in memory per process",
+        default=256,
+    )
+
+
 class PositionConfig(BaseSettings):
     POSITION_PROVIDER_PINS: str = Field(
         description="Comma-separated list of pinned model providers",
@@ -871,6 +1073,7 @@ class FeatureConfig(
     AuthConfig,  # Changed from OAuthConfig to AuthConfig
     BillingConfig,
     CodeExecutionSandboxConfig,
+    CredentialDecryptionCacheConfig,
     PluginConfig,
     MarketplaceConfig,
     DataSetConfig,
@@ -886,6 +1089,7 @@ class FeatureConfig(
     ModerationConfig,
     MultiModalTransferConfig,
     PositionConfig,
+    ProviderConfigurationsCacheConfig,
     RagEtlConfig,
     SecurityConfig,
     ToolConfig,
@@ -898,5 +1102,8 @@ class FeatureConfig(
     # hosted services config
     HostedServiceConfig,
     CeleryBeatConfig,
+    AppStatisticRollupConfig,
+    AnnotationReplyConfig,
+    RetrievalStatsBufferConfig,
 ):
     pass
@@ -19,7 +19,8 @@ from fields.conversation_fields import (
     conversation_pagination_fields,
     conversation_with_summary_pagination_fields,
 )
-from libs.helper import DatetimeString
+from libs.helper import DatetimeString, uuid_value
+from libs.keyset_pagination import paginate_by_last_id
 from libs.login import login_required
 from models import Conversation, EndUser, Message, MessageAnnotation
 from models.model import AppMode
@@ -43,17 +44,13 @@ class CompletionConversationApi(Resource):
         )
         parser.add_argument("page", type=int_range(1, 99999), default=1, location="args")
         parser.add_argument("limit", type=int_range(1, 100), default=20, location="args")
+        parser.add_argument("last_id", type=uuid_value, location="args")
         args = parser.parse_args()
 
         query = db.select(Conversation).where(Conversation.app_id == app_model.id, Conversation.mode == "completion")
 
         if args["keyword"]:
-            query = query.join(Message, Message.conversation_id == Conversation.id).filter(
-                or_(
-                    Message.query.ilike("%{}%".format(args["keyword"])),
-                    Message.answer.ilike("%{}%".format(args["keyword"])),
-                )
-            )
+            query = query.where(Conversation.id.in_(_keyword_message_conversation_ids(app_model, args["keyword"])))
 
         account = current_user
         timezone = pytz.timezone(account.timezone)
@@ -79,8 +76,8 @@ class CompletionConversationApi(Resource):
 
         # FIXME, the type ignore in this file
         if args["annotation_status"] == "annotated":
-            query = query.options(joinedload(Conversation.message_annotations)).join(  # type: ignore
-                MessageAnnotation, MessageAnnotation.conversation_id == Conversation.id
+            query = query.options(joinedload(Conversation.message_annotations)).where(  # type: ignore
+                Conversation.id.in_(_annotated_conversation_ids(app_model))
             )
         elif args["annotation_status"] == "not_annotated":
             query = (
@@ -91,6 +88,15 @@ class CompletionConversationApi(Resource):
 
         query = query.order_by(Conversation.created_at.desc())
 
+        if args["last_id"]:
+            return paginate_by_last_id(
+                query,
+                id_column=Conversation.id,
+                order_column=Conversation.created_at,
+                last_id=args["last_id"],
+                limit=args["limit"],
+            )
+
         conversations = db.paginate(query, page=args["page"], per_page=args["limit"], error_out=False)
 
         return conversations
@@ -152,6 +158,7 @@ class ChatConversationApi(Resource):
         parser.add_argument("message_count_gte", type=int_range(1, 99999), required=False, location="args")
         parser.add_argument("page", type=int_range(1, 99999), required=False, default=1, location="args")
         parser.add_argument("limit", type=int_range(1, 100), required=False, default=20, location="args")
+        parser.add_argument("last_id", type=uuid_value, required=False, location="args")
         parser.add_argument(
             "sort_by",
             type=str,
@@ -162,34 +169,21 @@ class ChatConversationApi(Resource):
         )
         args = parser.parse_args()
 
-        subquery = (
-            db.session.query(
-                Conversation.id.label("conversation_id"), EndUser.session_id.label("from_end_user_session_id")
-            )
-            .outerjoin(EndUser, Conversation.from_end_user_id == EndUser.id)
-            .subquery()
-        )
-
         query = db.select(Conversation).where(Conversation.app_id == app_model.id)
 
         if args["keyword"]:
             keyword_filter = "%{}%".format(args["keyword"])
-            query = (
-                query.join(
-                    Message,
-                    Message.conversation_id == Conversation.id,
-                )
-                .join(subquery, subquery.c.conversation_id == Conversation.id)
-                .filter(
-                    or_(
-                        Message.query.ilike(keyword_filter),
-                        Message.answer.ilike(keyword_filter),
-                        Conversation.name.ilike(keyword_filter),
-                        Conversation.introduction.ilike(keyword_filter),
-                        subquery.c.from_end_user_session_id.ilike(keyword_filter),
-                    ),
+            # every branch is a separate lookup so that each one can use its trigram index
+            end_user_ids = db.select(EndUser.id).where(
+                EndUser.tenant_id == app_model.tenant_id, EndUser.session_id.ilike(keyword_filter)
+            )
+            query = query.where(
+                or_(
+                    Conversation.id.in_(_keyword_message_conversation_ids(app_model, args["keyword"])),
+                    Conversation.name.ilike(keyword_filter),
+                    Conversation.introduction.ilike(keyword_filter),
+                    Conversation.from_end_user_id.in_(end_user_ids),
                 )
-                .group_by(Conversation.id)
             )
 
         account = current_user
@@ -223,8 +217,8 @@ class ChatConversationApi(Resource):
                     query = query.where(Conversation.created_at <= end_datetime_utc)
 
         if args["annotation_status"] == "annotated":
-            query = query.options(joinedload(Conversation.message_annotations)).join(  # type: ignore
-                MessageAnnotation, MessageAnnotation.conversation_id == Conversation.id
+            query = query.options(joinedload(Conversation.message_annotations)).where(  # type: ignore
+                Conversation.id.in_(_annotated_conversation_ids(app_model))
             )
         elif args["annotation_status"] == "not_annotated":
             query = (
@@ -256,6 +250,17 @@ class ChatConversationApi(Resource):
             case _:
                 query = query.order_by(Conversation.created_at.desc())
 
+        if args["last_id"]:
+            sort_by = args["sort_by"] or "-updated_at"
+            return paginate_by_last_id(
+                query,
+                id_column=Conversation.id,
+                order_column=Conversation.updated_at if sort_by.endswith("updated_at") else Conversation.created_at,
+                last_id=args["last_id"],
+                limit=args["limit"],
+                descending=sort_by.startswith("-"),
+            )
+
         conversations = db.paginate(query, page=args["page"], per_page=args["limit"], error_out=False)
 
         return conversations
@@ -304,6 +309,19 @@ api.add_resource(ChatConversationApi, "/apps/<uuid:app_id>/chat-conversations")
 api.add_resource(ChatConversationDetailApi, "/apps/<uuid:app_id>/chat-conversations/<uuid:conversation_id>")
 
 
+def _keyword_message_conversation_ids(app_model, keyword: str):
+    keyword_filter = "%{}%".format(keyword)
+    return db.select(Message.conversation_id).where(
+        Message.app_id == app_model.id,
+        or_(Message.query.ilike(keyword_filter), Message.answer.ilike(keyword_filter)),
+    )
+
+
+def _annotated_conversation_ids(app_model):
+    # filtered with IN instead of a join, which repeats a conversation for each of its annotations
+    return db.select(MessageAnnotation.conversation_id).where(MessageAnnotation.app_id == app_model.id)
+
+
 def _get_conversation(app_model, conversation_id):
     conversation = (
         db.session.query(Conversation)
@@ -13,6 +13,7 @@ from extensions.ext_database import db
 from libs.helper import DatetimeString
 from libs.login import login_required
 from models.model import AppMode
+from services.app_statistic_rollup_service import AppStatisticRollupService
 
 
 class DailyMessageStatistic(Resource):
@@ -60,6 +61,12 @@ WHERE
             sql_query += " AND created_at < :end"
             arg_dict["end"] = end_datetime_utc
 
+        rollup_data = AppStatisticRollupService.get_daily_statistics(
+            "messages", app_model.id, account.timezone, arg_dict.get("start"), arg_dict.get("end")
+        )
+        if rollup_data is not None:
+            return jsonify({"data": [{"date": i["date"], "message_count": i["message_count"]} for i in rollup_data]})
+
         sql_query += " GROUP BY date ORDER BY date"
 
         response_data = []
@@ -232,6 +239,24 @@ WHERE
             sql_query += " AND created_at < :end"
             arg_dict["end"] = end_datetime_utc
 
+        rollup_data = AppStatisticRollupService.get_daily_statistics(
+            "messages", app_model.id, account.timezone, arg_dict.get("start"), arg_dict.get("end")
+        )
+        if rollup_data is not None:
+            return jsonify(
+                {
+                    "data": [
+                        {
+                            "date": i["date"],
+                            "token_count": i["message_tokens"] + i["answer_tokens"],
+                            "total_price": i["total_price"],
+                            "currency": "USD",
+                        }
+                        for i in rollup_data
+                    ]
+                }
+            )
+
         sql_query += " GROUP BY date ORDER BY date"
 
         response_data = []
@@ -433,6 +458,22 @@ WHERE
             sql_query += " AND created_at < :end"
             arg_dict["end"] = end_datetime_utc
 
+        rollup_data = AppStatisticRollupService.get_daily_statistics(
+            "messages", app_model.id, account.timezone, arg_dict.get("start"), arg_dict.get("end")
+        )
+        if rollup_data is not None:
+            return jsonify(
+                {
+                    "data": [
+                        {
+                            "date": i["date"],
+                            "latency": round(i["provider_response_latency"] / i["message_count"] * 1000, 4),
+                        }
+                        for i in rollup_data
+                    ]
+                }
+            )
+
         sql_query += " GROUP BY date ORDER BY date"
 
         response_data = []
@@ -493,6 +534,17 @@ WHERE
             sql_query += " AND created_at < :end"
             arg_dict["end"] = end_datetime_utc
 
+        rollup_data = AppStatisticRollupService.get_daily_statistics(
+            "messages", app_model.id, account.timezone, arg_dict.get("start"), arg_dict.get("end")
+        )
+        if rollup_data is not None:
+            response_data = []
+            for row in rollup_data:
+                latency = row["provider_response_latency"]
+                tokens_per_second = row["answer_tokens"] / latency if latency else 0
+                response_data.append({"date": row["date"], "tps": round(tokens_per_second, 4)})
+            return jsonify({"data": response_data})
+
         sql_query += " GROUP BY date ORDER BY date"
 
         response_data = []
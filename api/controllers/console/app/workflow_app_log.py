@@ -1,5 +1,5 @@
 from dateutil.parser import isoparse
-from flask_restful import Resource, marshal_with, reqparse  # type: ignore
+from flask_restful import Resource, inputs, marshal_with, reqparse  # type: ignore
 from flask_restful.inputs import int_range  # type: ignore
 from sqlalchemy.orm import Session
 
@@ -8,6 +8,7 @@ from controllers.console.app.wraps import get_app_model
 from controllers.console.wraps import account_initialization_required, setup_required
 from extensions.ext_database import db
 from fields.workflow_app_log_fields import workflow_app_log_pagination_fields
+from libs.helper import uuid_value
 from libs.login import login_required
 from models import App
 from models.model import AppMode
@@ -36,6 +37,8 @@ class WorkflowAppLogApi(Resource):
         )
         parser.add_argument("page", type=int_range(1, 99999), default=1, location="args")
         parser.add_argument("limit", type=int_range(1, 100), default=20, location="args")
+        parser.add_argument("last_id", type=uuid_value, location="args")
+        parser.add_argument("with_count", type=inputs.boolean, default=True, location="args")
         args = parser.parse_args()
 
         args.status = WorkflowRunStatus(args.status) if args.status else None
@@ -57,6 +60,8 @@ class WorkflowAppLogApi(Resource):
                 created_at_after=args.created_at__after,
                 page=args.page,
                 limit=args.limit,
+                last_id=args.last_id,
+                with_count=args.with_count,
             )
 
             return workflow_app_log_pagination
@@ -14,6 +14,7 @@ from libs.helper import DatetimeString
 from libs.login import login_required
 from models.enums import WorkflowRunTriggeredFrom
 from models.model import AppMode
+from services.app_statistic_rollup_service import AppStatisticRollupService
 
 
 class WorkflowDailyRunsStatistic(Resource):
@@ -66,6 +67,12 @@ WHERE
             sql_query += " AND created_at < :end"
             arg_dict["end"] = end_datetime_utc
 
+        rollup_data = AppStatisticRollupService.get_daily_statistics(
+            "workflow_runs", app_model.id, account.timezone, arg_dict.get("start"), arg_dict.get("end")
+        )
+        if rollup_data is not None:
+            return jsonify({"data": [{"date": i["date"], "runs": i["workflow_run_count"]} for i in rollup_data]})
+
         sql_query += " GROUP BY date ORDER BY date"
 
         response_data = []
@@ -190,6 +197,14 @@ WHERE
             sql_query += " AND created_at < :end"
             arg_dict["end"] = end_datetime_utc
 
+        rollup_data = AppStatisticRollupService.get_daily_statistics(
+            "workflow_runs", app_model.id, account.timezone, arg_dict.get("start"), arg_dict.get("end")
+        )
+        if rollup_data is not None:
+            return jsonify(
+                {"data": [{"date": i["date"], "token_count": i["workflow_total_tokens"]} for i in rollup_data]}
+            )
+
         sql_query += " GROUP BY date ORDER BY date"
 
         response_data = []
@@ -69,9 +69,9 @@ class FileApi(Resource):
             source = None
 
         try:
-            upload_file = FileService.upload_file(
+            upload_file = FileService.upload_file_stream(
                 filename=file.filename,
-                content=file.read(),
+                stream=file.stream,
                 mimetype=file.mimetype,
                 user=current_user,
                 source=source,
@@ -201,9 +201,9 @@ class WebappLogoWorkspaceApi(Resource):
             raise UnsupportedFileTypeError()
 
         try:
-            upload_file = FileService.upload_file(
+            upload_file = FileService.upload_file_stream(
                 filename=file.filename,
-                content=file.read(),
+                stream=file.stream,
                 mimetype=file.mimetype,
                 user=current_user,
             )
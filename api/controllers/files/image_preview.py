@@ -7,6 +7,7 @@ from werkzeug.exceptions import NotFound
 import services
 from controllers.files import api
 from controllers.files.error import UnsupportedFileTypeError
+from libs.helper import storage_range_response
 from services.account_service import TenantService
 from services.file_service import FileService
 
@@ -64,14 +65,17 @@ class FilePreviewApi(Resource):
         except services.errors.file.UnsupportedFileTypeError:
             raise UnsupportedFileTypeError()
 
-        response = Response(
-            generator,
-            mimetype=upload_file.mime_type,
-            direct_passthrough=True,
-            headers={},
-        )
-        if upload_file.size > 0:
-            response.headers["Content-Length"] = str(upload_file.size)
+        response = storage_range_response(upload_file.key, upload_file.size, upload_file.mime_type)
+        if response is None:
+            response = Response(
+                generator,
+                mimetype=upload_file.mime_type,
+                direct_passthrough=True,
+                headers={},
+            )
+            if upload_file.size > 0:
+                response.headers["Content-Length"] = str(upload_file.size)
+                response.headers["Accept-Ranges"] = "bytes"
         if args["as_attachment"]:
             encoded_filename = quote(upload_file.name)
             response.headers["Content-Disposition"] = f"attachment; filename*=UTF-8''{encoded_filename}"
@@ -5,6 +5,7 @@ from werkzeug.exceptions import Forbidden, NotFound
 from controllers.files import api
 from controllers.files.error import UnsupportedFileTypeError
 from core.tools.tool_file_manager import ToolFileManager
+from libs.helper import storage_range_response
 
 
 class ToolFilePreviewApi(Resource):
@@ -38,14 +39,17 @@ class ToolFilePreviewApi(Resource):
         except Exception:
             raise UnsupportedFileTypeError()
 
-        response = Response(
-            stream,
-            mimetype=tool_file.mimetype,
-            direct_passthrough=True,
-            headers={},
-        )
-        if tool_file.size > 0:
-            response.headers["Content-Length"] = str(tool_file.size)
+        response = storage_range_response(tool_file.file_key, tool_file.size, tool_file.mimetype)
+        if response is None:
+            response = Response(
+                stream,
+                mimetype=tool_file.mimetype,
+                direct_passthrough=True,
+                headers={},
+            )
+            if tool_file.size > 0:
+                response.headers["Content-Length"] = str(tool_file.size)
+                response.headers["Accept-Ranges"] = "bytes"
         if args["as_attachment"]:
             response.headers["Content-Disposition"] = f"attachment; filename={tool_file.name}"
 
@@ -36,9 +36,9 @@ class FileApi(Resource):
             raise FilenameNotExistsError
 
         try:
-            upload_file = FileService.upload_file(
+            upload_file = FileService.upload_file_stream(
                 filename=file.filename,
-                content=file.read(),
+                stream=file.stream,
                 mimetype=file.mimetype,
                 user=end_user,
             )
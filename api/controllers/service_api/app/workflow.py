@@ -1,7 +1,7 @@
 import logging
 
 from dateutil.parser import isoparse
-from flask_restful import Resource, fields, marshal_with, reqparse  # type: ignore
+from flask_restful import Resource, fields, inputs, marshal_with, reqparse  # type: ignore
 from flask_restful.inputs import int_range  # type: ignore
 from sqlalchemy.orm import Session
 from werkzeug.exceptions import InternalServerError
@@ -27,7 +27,7 @@ from core.model_runtime.errors.invoke import InvokeError
 from extensions.ext_database import db
 from fields.workflow_app_log_fields import workflow_app_log_pagination_fields
 from libs import helper
-from libs.helper import TimestampField
+from libs.helper import TimestampField, uuid_value
 from models.model import App, AppMode, EndUser
 from models.workflow import WorkflowRun, WorkflowRunStatus
 from services.app_generate_service import AppGenerateService
@@ -136,6 +136,8 @@ class WorkflowAppLogApi(Resource):
         parser.add_argument("created_at__after", type=str, location="args")
         parser.add_argument("page", type=int_range(1, 99999), default=1, location="args")
         parser.add_argument("limit", type=int_range(1, 100), default=20, location="args")
+        parser.add_argument("last_id", type=uuid_value, location="args")
+        parser.add_argument("with_count", type=inputs.boolean, default=True, location="args")
         args = parser.parse_args()
 
         args.status = WorkflowRunStatus(args.status) if args.status else None
@@ -157,6 +159,8 @@ class WorkflowAppLogApi(Resource):
                 created_at_after=args.created_at__after,
                 page=args.page,
                 limit=args.limit,
+                last_id=args.last_id,
+                with_count=args.with_count,
             )
 
             return workflow_app_log_pagination
@@ -190,9 +190,9 @@ class DocumentAddByFileApi(DatasetApiResource):
         if not file.filename:
             raise FilenameNotExistsError
 
-        upload_file = FileService.upload_file(
+        upload_file = FileService.upload_file_stream(
             filename=file.filename,
-            content=file.read(),
+            stream=file.stream,
             mimetype=file.mimetype,
             user=current_user,
             source="datasets",
@@ -257,9 +257,9 @@ class DocumentUpdateByFileApi(DatasetApiResource):
                 raise FilenameNotExistsError
 
             try:
-                upload_file = FileService.upload_file(
+                upload_file = FileService.upload_file_stream(
                     filename=file.filename,
-                    content=file.read(),
+                    stream=file.stream,
                     mimetype=file.mimetype,
                     user=current_user,
                     source="datasets",
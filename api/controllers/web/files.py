@@ -28,9 +28,9 @@ class FileApi(WebApiResource):
             source = None
 
         try:
-            upload_file = FileService.upload_file(
+            upload_file = FileService.upload_file_stream(
                 filename=file.filename,
-                content=file.read(),
+                stream=file.stream,
                 mimetype=file.mimetype,
                 user=end_user,
                 source="datasets" if source == "datasets" else None,
@@ -4,9 +4,11 @@ import logging
 import queue
 import re
 import threading
+import time
 from collections.abc import Iterable
 from typing import Optional
 
+from configs import dify_config
 from core.app.entities.queue_entities import (
     MessageQueueMessage,
     QueueAgentMessageEvent,
@@ -19,6 +21,28 @@ from core.model_manager import ModelInstance, ModelManager
 from core.model_runtime.entities.message_entities import TextPromptMessageContent
 from core.model_runtime.entities.model_entities import ModelType
 
+logger = logging.getLogger(__name__)
+
+_first_audio_latency_histogram = None
+
+
+def _record_first_audio_latency(latency: float):
+    global _first_audio_latency_histogram
+    logger.info(f"TTS first audio latency: {latency * 1000:.0f} ms")
+    if not dify_config.ENABLE_OTEL:
+        return
+
+    if _first_audio_latency_histogram is None:
+        from opentelemetry.metrics import get_meter
+
+        meter = get_meter("tts_metrics", version=dify_config.CURRENT_VERSION)
+        _first_audio_latency_histogram = meter.create_histogram(
+            "tts.audio.first_byte.latency",
+            description="Time from the first streamed text to the first synthesized audio of a message",
+            unit="s",
+        )
+    _first_audio_latency_histogram.record(latency)
+
 
 class AudioTrunk:
     def __init__(self, status: str, audio):
@@ -72,8 +96,10 @@ class AppGeneratorTTSPublisher:
         self.voice = voice
         if not voice or voice not in values:
             self.voice = self.voices[0].get("value")
-        self.MAX_SENTENCE = 2
+        # the first sentence is synthesized alone to start playing early, later batches grow up to 7 sentences
+        self.MAX_SENTENCE = 1
         self._last_audio_event: Optional[AudioTrunk] = None
+        self._first_text_at: Optional[float] = None
         # FIXME better way to handle this threading.start
         threading.Thread(target=self._runtime).start()
         self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=3)
@@ -112,6 +138,8 @@ class AppGeneratorTTSPublisher:
                         continue
                     self.msg_text += message.event.outputs.get("output", "")
                 self.last_message = message
+                if self._first_text_at is None and self.msg_text:
+                    self._first_text_at = time.perf_counter()
                 sentence_arr, text_tmp = self._extract_sentence(self.msg_text)
                 if len(sentence_arr) >= min(self.MAX_SENTENCE, 7):
                     self.MAX_SENTENCE += 1
@@ -130,20 +158,39 @@ class AppGeneratorTTSPublisher:
                 break
         future_queue.put(None)
 
-    def check_and_get_audio(self):
+    def check_and_get_audio(self) -> Optional[AudioTrunk]:
+        """
+        Get the next audio trunk without blocking, None if no audio is ready
+        """
+        if self._last_audio_event and self._last_audio_event.status == "finish":
+            return self._on_audio(self._last_audio_event)
         try:
-            if self._last_audio_event and self._last_audio_event.status == "finish":
-                if self.executor:
-                    self.executor.shutdown(wait=False)
-                return self._last_audio_event
             audio = self._audio_queue.get_nowait()
-            if audio and audio.status == "finish":
-                self.executor.shutdown(wait=False)
-            if audio:
-                self._last_audio_event = audio
-            return audio
         except queue.Empty:
             return None
+        return self._on_audio(audio)
+
+    def wait_for_audio(self, timeout: float) -> Optional[AudioTrunk]:
+        """
+        Block until the next audio trunk is synthesized
+        :param timeout: seconds to wait
+        :return: audio trunk, None if no audio arrived in time
+        """
+        if self._last_audio_event and self._last_audio_event.status == "finish":
+            return self._on_audio(self._last_audio_event)
+        try:
+            audio = self._audio_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        return self._on_audio(audio)
+
+    def _on_audio(self, audio: AudioTrunk) -> AudioTrunk:
+        if audio.status == "finish":
+            self.executor.shutdown(wait=False)
+        elif self._last_audio_event is None and self._first_text_at is not None:
+            _record_first_audio_latency(time.perf_counter() - self._first_text_at)
+        self._last_audio_event = audio
+        return audio
 
     def _extract_sentence(self, org_text):
         tx = self.match.finditer(org_text)
@@ -2,6 +2,7 @@ from collections.abc import Generator
 from typing import Any, cast
 
 from core.app.apps.base_app_generate_response_converter import AppGenerateResponseConverter
+from core.app.apps.stream_event_encoder import StreamEventEncoder
 from core.app.entities.task_entities import (
     AppBlockingResponse,
     AppStreamResponse,
@@ -63,6 +64,7 @@ class AdvancedChatAppGenerateResponseConverter(AppGenerateResponseConverter):
         :param stream_response: stream response
         :return:
         """
+        encoder = StreamEventEncoder()
         for chunk in stream_response:
             chunk = cast(ChatbotAppStreamResponse, chunk)
             sub_stream_response = chunk.stream_response
@@ -78,6 +80,11 @@ class AdvancedChatAppGenerateResponseConverter(AppGenerateResponseConverter):
                 "created_at": chunk.created_at,
             }
 
+            delta_chunk = encoder.delta_chunk(response_chunk, sub_stream_response)
+            if delta_chunk is not None:
+                yield delta_chunk
+                continue
+
             if isinstance(sub_stream_response, ErrorStreamResponse):
                 data = cls._error_to_stream_response(sub_stream_response.err)
                 response_chunk.update(data)
@@ -94,6 +101,7 @@ class AdvancedChatAppGenerateResponseConverter(AppGenerateResponseConverter):
         :param stream_response: stream response
         :return:
         """
+        encoder = StreamEventEncoder()
         for chunk in stream_response:
             chunk = cast(ChatbotAppStreamResponse, chunk)
             sub_stream_response = chunk.stream_response
@@ -109,6 +117,11 @@ class AdvancedChatAppGenerateResponseConverter(AppGenerateResponseConverter):
                 "created_at": chunk.created_at,
             }
 
+            delta_chunk = encoder.delta_chunk(response_chunk, sub_stream_response)
+            if delta_chunk is not None:
+                yield delta_chunk
+                continue
+
             if isinstance(sub_stream_response, MessageEndStreamResponse):
                 sub_stream_response_dict = sub_stream_response.to_dict()
                 metadata = sub_stream_response_dict.get("metadata", {})
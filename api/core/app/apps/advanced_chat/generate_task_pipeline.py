@@ -8,7 +8,7 @@ from typing import Any, Optional, Union
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from constants.tts_auto_play_timeout import TTS_AUTO_PLAY_TIMEOUT, TTS_AUTO_PLAY_YIELD_CPU_TIME
+from constants.tts_auto_play_timeout import TTS_AUTO_PLAY_TIMEOUT
 from core.app.apps.advanced_chat.app_generator_tts_publisher import AppGeneratorTTSPublisher, AudioTrunk
 from core.app.apps.base_app_queue_manager import AppQueueManager, PublishFrom
 from core.app.entities.app_invoke_entities import (
@@ -241,18 +241,14 @@ class AdvancedChatAppGenerateTaskPipeline:
             yield response
 
         start_listener_time = time.time()
-        # timeout
-        while (time.time() - start_listener_time) < TTS_AUTO_PLAY_TIMEOUT:
+        # wait for the remaining audio, until no audio arrives within the timeout
+        while tts_publisher:
             try:
-                if not tts_publisher:
+                timeout = TTS_AUTO_PLAY_TIMEOUT - (time.time() - start_listener_time)
+                if timeout <= 0:
                     break
-                audio_trunk = tts_publisher.check_and_get_audio()
-                if audio_trunk is None:
-                    # release cpu
-                    # sleep 20 ms ( 40ms => 1280 byte audio file,20ms => 640 byte audio file)
-                    time.sleep(TTS_AUTO_PLAY_YIELD_CPU_TIME)
-                    continue
-                if audio_trunk.status == "finish":
+                audio_trunk = tts_publisher.wait_for_audio(timeout=timeout)
+                if audio_trunk is None or audio_trunk.status == "finish":
                     break
                 else:
                     start_listener_time = time.time()
@@ -0,0 +1,182 @@
+import contextvars
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Optional
+
+from configs import dify_config
+from core.errors.error import AppInvokeQuotaExceededError
+
+if TYPE_CHECKING:
+    from opentelemetry.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+# set while a generate worker runs, the threads started by the worker inherit it with the copied context
+_in_generate_worker: contextvars.ContextVar[bool] = contextvars.ContextVar("in_generate_worker", default=False)
+
+
+class AppGenerateExecutor:
+    """
+    Executor of the generate workers of the apps in the process.
+
+    With APP_GENERATE_MAX_WORKERS set, the workers run on a persistent pool of that many threads,
+    and up to APP_GENERATE_MAX_QUEUED generations wait for a free thread, further generations are rejected
+    like the requests over the active requests limit of an app.
+    Otherwise each generation gets a new thread, as the generators did before.
+
+    Nested generations, e.g. of workflow tools, are awaited by the running worker that starts them.
+    Queueing them behind that worker could exhaust the pool with workers waiting for their own nested generations,
+    so they get a new thread and are not counted.
+    """
+
+    _instance: Optional["AppGenerateExecutor"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_workers: int, max_queued: int):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="app_generate") if max_workers else None
+        )
+        self._queue_wait_histogram: Optional[Histogram] = None
+        if dify_config.ENABLE_OTEL:
+            self._init_metrics()
+
+    @classmethod
+    def get_instance(cls) -> "AppGenerateExecutor":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(
+                    max_workers=dify_config.APP_GENERATE_MAX_WORKERS,
+                    max_queued=dify_config.APP_GENERATE_MAX_QUEUED,
+                )
+            return cls._instance
+
+    @property
+    def active_count(self) -> int:
+        return self._active
+
+    @property
+    def queued_count(self) -> int:
+        return self._queued
+
+    @staticmethod
+    @contextmanager
+    def nested() -> Iterator[None]:
+        """
+        Run the generations started in the block as nested generations,
+        for generations awaited by a generation that is not visible from this thread, e.g. plugin invocations
+        """
+        token = _in_generate_worker.set(True)
+        try:
+            yield
+        finally:
+            _in_generate_worker.reset(token)
+
+    def check_admission(self):
+        """
+        Reject the generation early if it would not fit in the queue,
+        before the conversation and message of the generation are created
+        """
+        with self._lock:
+            self._check_capacity()
+
+    def submit(self, fn: Callable[..., Any], **kwargs: Any):
+        """
+        Run the generate worker
+        :param fn: generate worker
+        :param kwargs: arguments of the worker
+        """
+        if _in_generate_worker.get():
+            threading.Thread(target=self._run_in_new_context, args=(fn, kwargs)).start()
+            return
+
+        with self._lock:
+            self._check_capacity()
+            self._queued += 1
+
+        submitted_at = time.perf_counter()
+        if self._executor is None:
+            threading.Thread(target=self._run, args=(fn, kwargs, submitted_at)).start()
+            return
+
+        try:
+            self._executor.submit(self._run, fn, kwargs, submitted_at)
+        except Exception:
+            with self._lock:
+                self._queued -= 1
+            raise
+
+    def _check_capacity(self):
+        if not self._executor:
+            return
+        if self._active + self._queued >= self.max_workers + self.max_queued:
+            raise AppInvokeQuotaExceededError(
+                "Too many generations in progress, please try again later. "
+                f"Max generations per process: {self.max_workers}, max queued: {self.max_queued}."
+            )
+
+    def _run(self, fn: Callable[..., Any], kwargs: dict[str, Any], submitted_at: float):
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        if self._queue_wait_histogram is not None:
+            self._queue_wait_histogram.record(time.perf_counter() - submitted_at)
+
+        try:
+            self._run_in_new_context(fn, kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _run_in_new_context(self, fn: Callable[..., Any], kwargs: dict[str, Any]):
+        try:
+            # the workers set the context variables of the request, which must not leak to the next worker
+            contextvars.Context().run(self._run_worker, fn, kwargs)
+        except Exception:
+            logger.exception("Unexpected error in app generate worker")
+
+    @staticmethod
+    def _run_worker(fn: Callable[..., Any], kwargs: dict[str, Any]):
+        _in_generate_worker.set(True)
+        fn(**kwargs)
+
+    def _init_metrics(self):
+        from opentelemetry.metrics import CallbackOptions, Observation, get_meter
+
+        meter = get_meter("app_generate_metrics", version=dify_config.CURRENT_VERSION)
+
+        def observe(value: Callable[[], int]):
+            def callback(options: CallbackOptions):
+                yield Observation(value())
+
+            return [callback]
+
+        meter.create_observable_gauge(
+            "app.generate.active",
+            callbacks=observe(lambda: self._active),
+            description="Number of app generations running",
+            unit="{generation}",
+        )
+        meter.create_observable_gauge(
+            "app.generate.queued",
+            callbacks=observe(lambda: self._queued),
+            description="Number of app generations waiting for a worker thread",
+            unit="{generation}",
+        )
+        meter.create_observable_gauge(
+            "app.generate.threads",
+            callbacks=observe(threading.active_count),
+            description="Number of threads of the process",
+            unit="{thread}",
+        )
+        self._queue_wait_histogram = meter.create_histogram(
+            "app.generate.queue_wait", description="Time app generations waited for a worker thread", unit="s"
+        )
@@ -3,6 +3,7 @@ from collections.abc import Generator, Mapping, Sequence
 from typing import TYPE_CHECKING, Any, Optional, Union
 
 from core.app.app_config.entities import VariableEntityType
+from core.app.apps.stream_event_encoder import StreamEventChunk
 from core.file import File, FileUploadConfig
 from factories import file_factory
 
@@ -153,7 +154,9 @@ class BaseAppGenerator:
 
             def gen():
                 for message in generator:
-                    if isinstance(message, Mapping | dict):
+                    if isinstance(message, StreamEventChunk):
+                        yield message.to_sse()
+                    elif isinstance(message, Mapping | dict):
                         yield f"data: {json.dumps(message)}\n\n"
                     else:
                         yield f"event: {message}\n\n"
@@ -1,5 +1,4 @@
 import logging
-import threading
 import uuid
 from collections.abc import Generator, Mapping
 from typing import Any, Literal, Union, overload
@@ -11,6 +10,7 @@ from configs import dify_config
 from constants import UUID_NIL
 from core.app.app_config.easy_ui_based_app.model_config.converter import ModelConfigConverter
 from core.app.app_config.features.file_upload.manager import FileUploadConfigManager
+from core.app.apps.app_generate_executor import AppGenerateExecutor
 from core.app.apps.base_app_queue_manager import AppQueueManager, GenerateTaskStoppedError, PublishFrom
 from core.app.apps.chat.app_config_manager import ChatAppConfigManager
 from core.app.apps.chat.app_runner import ChatAppRunner
@@ -170,20 +170,16 @@ class ChatAppGenerator(MessageBasedAppGenerator):
             message_id=message.id,
         )
 
-        # new thread
-        worker_thread = threading.Thread(
-            target=self._generate_worker,
-            kwargs={
-                "flask_app": current_app._get_current_object(),  # type: ignore
-                "application_generate_entity": application_generate_entity,
-                "queue_manager": queue_manager,
-                "conversation_id": conversation.id,
-                "message_id": message.id,
-            },
+        # run the worker on a generate thread
+        AppGenerateExecutor.get_instance().submit(
+            self._generate_worker,
+            flask_app=current_app._get_current_object(),  # type: ignore
+            application_generate_entity=application_generate_entity,
+            queue_manager=queue_manager,
+            conversation_id=conversation.id,
+            message_id=message.id,
         )
 
-        worker_thread.start()
-
         # return response or stream generator
         response = self._handle_response(
             application_generate_entity=application_generate_entity,
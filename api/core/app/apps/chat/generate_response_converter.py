@@ -2,6 +2,7 @@ from collections.abc import Generator
 from typing import cast
 
 from core.app.apps.base_app_generate_response_converter import AppGenerateResponseConverter
+from core.app.apps.stream_event_encoder import StreamEventEncoder
 from core.app.entities.task_entities import (
     AppStreamResponse,
     ChatbotAppBlockingResponse,
@@ -59,6 +60,7 @@ class ChatAppGenerateResponseConverter(AppGenerateResponseConverter):
         :param stream_response: stream response
         :return:
         """
+        encoder = StreamEventEncoder()
         for chunk in stream_response:
             chunk = cast(ChatbotAppStreamResponse, chunk)
             sub_stream_response = chunk.stream_response
@@ -74,6 +76,11 @@ class ChatAppGenerateResponseConverter(AppGenerateResponseConverter):
                 "created_at": chunk.created_at,
             }
 
+            delta_chunk = encoder.delta_chunk(response_chunk, sub_stream_response)
+            if delta_chunk is not None:
+                yield delta_chunk
+                continue
+
             if isinstance(sub_stream_response, ErrorStreamResponse):
                 data = cls._error_to_stream_response(sub_stream_response.err)
                 response_chunk.update(data)
@@ -90,6 +97,7 @@ class ChatAppGenerateResponseConverter(AppGenerateResponseConverter):
         :param stream_response: stream response
         :return:
         """
+        encoder = StreamEventEncoder()
         for chunk in stream_response:
             chunk = cast(ChatbotAppStreamResponse, chunk)
             sub_stream_response = chunk.stream_response
@@ -105,6 +113,11 @@ class ChatAppGenerateResponseConverter(AppGenerateResponseConverter):
                 "created_at": chunk.created_at,
             }
 
+            delta_chunk = encoder.delta_chunk(response_chunk, sub_stream_response)
+            if delta_chunk is not None:
+                yield delta_chunk
+                continue
+
             if isinstance(sub_stream_response, MessageEndStreamResponse):
                 sub_stream_response_dict = sub_stream_response.to_dict()
                 metadata = sub_stream_response_dict.get("metadata", {})
@@ -2,6 +2,7 @@ from collections.abc import Generator
 from typing import cast
 
 from core.app.apps.base_app_generate_response_converter import AppGenerateResponseConverter
+from core.app.apps.stream_event_encoder import StreamEventEncoder
 from core.app.entities.task_entities import (
     AppStreamResponse,
     CompletionAppBlockingResponse,
@@ -58,6 +59,7 @@ class CompletionAppGenerateResponseConverter(AppGenerateResponseConverter):
         :param stream_response: stream response
         :return:
         """
+        encoder = StreamEventEncoder()
         for chunk in stream_response:
             chunk = cast(CompletionAppStreamResponse, chunk)
             sub_stream_response = chunk.stream_response
@@ -72,6 +74,11 @@ class CompletionAppGenerateResponseConverter(AppGenerateResponseConverter):
                 "created_at": chunk.created_at,
             }
 
+            delta_chunk = encoder.delta_chunk(response_chunk, sub_stream_response)
+            if delta_chunk is not None:
+                yield delta_chunk
+                continue
+
             if isinstance(sub_stream_response, ErrorStreamResponse):
                 data = cls._error_to_stream_response(sub_stream_response.err)
                 response_chunk.update(data)
@@ -88,6 +95,7 @@ class CompletionAppGenerateResponseConverter(AppGenerateResponseConverter):
         :param stream_response: stream response
         :return:
         """
+        encoder = StreamEventEncoder()
         for chunk in stream_response:
             chunk = cast(CompletionAppStreamResponse, chunk)
             sub_stream_response = chunk.stream_response
@@ -102,6 +110,11 @@ class CompletionAppGenerateResponseConverter(AppGenerateResponseConverter):
                 "created_at": chunk.created_at,
             }
 
+            delta_chunk = encoder.delta_chunk(response_chunk, sub_stream_response)
+            if delta_chunk is not None:
+                yield delta_chunk
+                continue
+
             if isinstance(sub_stream_response, MessageEndStreamResponse):
                 sub_stream_response_dict = sub_stream_response.to_dict()
                 metadata = sub_stream_response_dict.get("metadata", {})
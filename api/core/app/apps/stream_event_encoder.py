@@ -0,0 +1,98 @@
+import json
+from collections.abc import Mapping
+from typing import Any, Optional
+
+from configs import dify_config
+from core.app.entities.task_entities import MessageStreamResponse, StreamResponse, TextChunkStreamResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+
+def _use_orjson() -> bool:
+    return orjson is not None and dify_config.STREAM_EVENT_ORJSON_ENABLED
+
+
+def _dumps(obj: Mapping[str, Any]) -> str:
+    if _use_orjson():
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except TypeError:
+            # e.g. non str keys or integers out of the 64 bit range
+            pass
+    return json.dumps(obj)
+
+
+class StreamEventChunk(dict):
+    """
+    A stream response chunk whose envelope was serialized once per stream.
+    Behaves as the plain dict of the chunk, the event stream encodes it with to_sse instead of json.dumps,
+    so the chunk must not be modified after it was created.
+    """
+
+    __slots__ = ("_template", "_delta")
+
+    def __init__(self, template: str, envelope: Mapping[str, Any], delta: Mapping[str, Any]):
+        super().__init__(envelope)
+        self.update(delta)
+        self._template = template
+        self._delta = delta
+
+    def to_sse(self) -> str:
+        if not self._delta:
+            return f"data: {self._template}}}\n\n"
+        # the template is the envelope without its closing brace, the delta without its opening brace
+        separator = "," if _use_orjson() else ", "
+        return f"data: {self._template}{separator}{_dumps(self._delta)[1:]}\n\n"
+
+
+class StreamEventEncoder:
+    """
+    Encoder of the chunks of one stream.
+
+    The envelope of a delta event (event name, task id, message or workflow run id, created_at) is constant
+    within a stream, so it is serialized once into a template and only the delta of each chunk is encoded.
+    """
+
+    def __init__(self):
+        self._templates: dict[tuple, str] = {}
+
+    def chunk(self, envelope: Mapping[str, Any], delta: Mapping[str, Any]) -> StreamEventChunk:
+        """
+        Create a chunk of the envelope and delta, the keys of both must not overlap
+        :param envelope: constant fields of the event, with hashable values
+        :param delta: fields changing per chunk
+        """
+        key = tuple(envelope.items())
+        template = self._templates.get(key)
+        if template is None:
+            template = _dumps(envelope)[:-1]
+            self._templates[key] = template
+
+        return StreamEventChunk(template, envelope, delta)
+
+    def delta_chunk(self, envelope: dict[str, Any], stream_response: StreamResponse) -> Optional[StreamEventChunk]:
+        """
+        Create the chunk of a high frequency delta event, the other events are left to the converters
+        :param envelope: fields of the app stream response, starting with the event name
+        :param stream_response: stream response
+        :return: chunk with the same items as envelope updated with stream_response.to_dict(), or None
+        """
+        if isinstance(stream_response, MessageStreamResponse):
+            return self.chunk(
+                {**envelope, "task_id": stream_response.task_id, "id": stream_response.id},
+                {"answer": stream_response.answer, "from_variable_selector": stream_response.from_variable_selector},
+            )
+        if isinstance(stream_response, TextChunkStreamResponse):
+            return self.chunk(
+                {**envelope, "task_id": stream_response.task_id},
+                {
+                    "data": {
+                        "text": stream_response.data.text,
+                        "from_variable_selector": stream_response.data.from_variable_selector,
+                    }
+                },
+            )
+        return None
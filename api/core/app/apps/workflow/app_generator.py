@@ -12,6 +12,7 @@ from sqlalchemy.orm import sessionmaker
 import contexts
 from configs import dify_config
 from core.app.app_config.features.file_upload.manager import FileUploadConfigManager
+from core.app.apps.app_generate_executor import AppGenerateExecutor
 from core.app.apps.base_app_generator import BaseAppGenerator
 from core.app.apps.base_app_queue_manager import AppQueueManager, GenerateTaskStoppedError, PublishFrom
 from core.app.apps.workflow.app_config_manager import WorkflowAppConfigManager
@@ -189,20 +190,16 @@ class WorkflowAppGenerator(BaseAppGenerator):
             app_mode=app_model.mode,
         )
 
-        # new thread
-        worker_thread = threading.Thread(
-            target=self._generate_worker,
-            kwargs={
-                "flask_app": current_app._get_current_object(),  # type: ignore
-                "application_generate_entity": application_generate_entity,
-                "queue_manager": queue_manager,
-                "context": contextvars.copy_context(),
-                "workflow_thread_pool_id": workflow_thread_pool_id,
-            },
+        # run the worker on a generate thread
+        AppGenerateExecutor.get_instance().submit(
+            self._generate_worker,
+            flask_app=current_app._get_current_object(),  # type: ignore
+            application_generate_entity=application_generate_entity,
+            queue_manager=queue_manager,
+            context=contextvars.copy_context(),
+            workflow_thread_pool_id=workflow_thread_pool_id,
         )
 
-        worker_thread.start()
-
         # return response or stream generator
         response = self._handle_response(
             application_generate_entity=application_generate_entity,
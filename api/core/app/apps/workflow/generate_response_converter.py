@@ -2,6 +2,7 @@ from collections.abc import Generator
 from typing import cast
 
 from core.app.apps.base_app_generate_response_converter import AppGenerateResponseConverter
+from core.app.apps.stream_event_encoder import StreamEventEncoder
 from core.app.entities.task_entities import (
     AppStreamResponse,
     ErrorStreamResponse,
@@ -43,6 +44,7 @@ class WorkflowAppGenerateResponseConverter(AppGenerateResponseConverter):
         :param stream_response: stream response
         :return:
         """
+        encoder = StreamEventEncoder()
         for chunk in stream_response:
             chunk = cast(WorkflowAppStreamResponse, chunk)
             sub_stream_response = chunk.stream_response
@@ -56,6 +58,11 @@ class WorkflowAppGenerateResponseConverter(AppGenerateResponseConverter):
                 "workflow_run_id": chunk.workflow_run_id,
             }
 
+            delta_chunk = encoder.delta_chunk(response_chunk, sub_stream_response)
+            if delta_chunk is not None:
+                yield delta_chunk
+                continue
+
             if isinstance(sub_stream_response, ErrorStreamResponse):
                 data = cls._error_to_stream_response(sub_stream_response.err)
                 response_chunk.update(data)
@@ -72,6 +79,7 @@ class WorkflowAppGenerateResponseConverter(AppGenerateResponseConverter):
         :param stream_response: stream response
         :return:
         """
+        encoder = StreamEventEncoder()
         for chunk in stream_response:
             chunk = cast(WorkflowAppStreamResponse, chunk)
             sub_stream_response = chunk.stream_response
@@ -85,6 +93,11 @@ class WorkflowAppGenerateResponseConverter(AppGenerateResponseConverter):
                 "workflow_run_id": chunk.workflow_run_id,
             }
 
+            delta_chunk = encoder.delta_chunk(response_chunk, sub_stream_response)
+            if delta_chunk is not None:
+                yield delta_chunk
+                continue
+
             if isinstance(sub_stream_response, ErrorStreamResponse):
                 data = cls._error_to_stream_response(sub_stream_response.err)
                 response_chunk.update(data)
@@ -5,7 +5,7 @@ from typing import Optional, Union
 
 from sqlalchemy.orm import Session
 
-from constants.tts_auto_play_timeout import TTS_AUTO_PLAY_TIMEOUT, TTS_AUTO_PLAY_YIELD_CPU_TIME
+from constants.tts_auto_play_timeout import TTS_AUTO_PLAY_TIMEOUT
 from core.app.apps.advanced_chat.app_generator_tts_publisher import AppGeneratorTTSPublisher, AudioTrunk
 from core.app.apps.base_app_queue_manager import AppQueueManager
 from core.app.entities.app_invoke_entities import (
@@ -212,17 +212,13 @@ class WorkflowAppGenerateTaskPipeline:
             yield response
 
         start_listener_time = time.time()
-        while (time.time() - start_listener_time) < TTS_AUTO_PLAY_TIMEOUT:
+        while tts_publisher:
             try:
-                if not tts_publisher:
+                timeout = TTS_AUTO_PLAY_TIMEOUT - (time.time() - start_listener_time)
+                if timeout <= 0:
                     break
-                audio_trunk = tts_publisher.check_and_get_audio()
-                if audio_trunk is None:
-                    # release cpu
-                    # sleep 20 ms ( 40ms => 1280 byte audio file,20ms => 640 byte audio file)
-                    time.sleep(TTS_AUTO_PLAY_YIELD_CPU_TIME)
-                    continue
-                if audio_trunk.status == "finish":
+                audio_trunk = tts_publisher.wait_for_audio(timeout=timeout)
+                if audio_trunk is None or audio_trunk.status == "finish":
                     break
                 else:
                     yield MessageAudioStreamResponse(audio=audio_trunk.audio, task_id=task_id)
@@ -631,9 +627,10 @@ class WorkflowAppGenerateTaskPipeline:
         :param text: text
         :return:
         """
-        response = TextChunkStreamResponse(
+        # constructed without validation, the fields are already typed and this runs for every chunk
+        response = TextChunkStreamResponse.model_construct(
             task_id=self._application_generate_entity.task_id,
-            data=TextChunkStreamResponse.Data(text=text, from_variable_selector=from_variable_selector),
+            data=TextChunkStreamResponse.Data.model_construct(text=text, from_variable_selector=from_variable_selector),
         )
 
         return response
@@ -0,0 +1,188 @@
+import logging
+import threading
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import func
+
+from configs import dify_config
+from core.helper.versioned_cache import VersionedLocalCache
+from core.model_manager import ModelManager
+from core.model_runtime.entities.model_entities import ModelType
+from core.rag.embedding.cached_embedding import CacheEmbedding
+from extensions.ext_database import db
+from libs import helper
+from models.dataset import Embedding
+from models.model import MessageAnnotation
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# number of cached embeddings read per query
+_EMBEDDING_QUERY_BATCH_SIZE = 1000
+
+
+class AnnotationIndex:
+    """
+    Brute force cosine similarity index of the annotation questions of an app.
+    """
+
+    def __init__(self, annotation_ids: list[str], vectors: np.ndarray):
+        self.annotation_ids = annotation_ids
+        self.vectors = vectors
+
+    def search(self, query_vector: list[float], score_threshold: float) -> Optional[tuple[str, float]]:
+        """
+        Get the annotation most similar to the query
+        :param query_vector: normalized query embedding
+        :param score_threshold: minimum similarity of the annotation
+        :return: annotation id and similarity, None if no annotation reaches the threshold
+        """
+        if not self.annotation_ids:
+            return None
+
+        # the embeddings are normalized, so the dot product is the cosine similarity
+        scores = self.vectors @ np.asarray(query_vector, dtype=np.float32)
+        index = int(np.argmax(scores))
+        score = float(scores[index])
+        if score < score_threshold:
+            return None
+        return self.annotation_ids[index], score
+
+
+class AnnotationIndexManager:
+    """
+    In-process annotation indexes of apps, built lazily from the annotations and their cached embeddings.
+    The annotation tasks bump a version stamp in redis, which drops the indexes of the app in all processes.
+
+    The annotation tasks cache the embeddings of the questions they index, so a build reads them in a few queries.
+    Only one request of a process builds the index of an app, the others search the vector database meanwhile.
+    """
+
+    # app id -> index, None if the app has too many annotations
+    _indexes = VersionedLocalCache(
+        "annotation_index_version:app_id", maxsize=dify_config.ANNOTATION_REPLY_LOCAL_INDEX_MAX_APPS
+    )
+    # ids of the apps whose index is being built
+    _building: set[str] = set()
+    _building_lock = threading.Lock()
+
+    @classmethod
+    def get_index(
+        cls, app_id: str, tenant_id: str, collection_binding_id: str, provider_name: str, model_name: str
+    ) -> Optional[AnnotationIndex]:
+        """
+        Get the annotation index of the app
+        :param app_id: app id
+        :param tenant_id: tenant id
+        :param collection_binding_id: collection binding of the annotation embeddings
+        :param provider_name: embedding provider name
+        :param model_name: embedding model name
+        :return: index, None if the app has too many annotations to be held in memory
+            or if another request is building it
+        """
+        version = f"{cls._indexes.get_version(app_id)}:{collection_binding_id}"
+        index = cls._indexes.get(app_id, version, _MISSING)
+        if index is not _MISSING:
+            return index  # type: ignore[no-any-return]
+
+        with cls._building_lock:
+            if app_id in cls._building:
+                return None
+            cls._building.add(app_id)
+        try:
+            built_index = cls._build_index(app_id, tenant_id, provider_name, model_name)
+            cls._indexes.set(app_id, version, built_index)
+            return built_index
+        finally:
+            with cls._building_lock:
+                cls._building.discard(app_id)
+
+    @classmethod
+    def invalidate(cls, app_id: str):
+        """
+        Drop the annotation index of the app in all processes
+        :param app_id: app id
+        """
+        cls._indexes.invalidate(app_id)
+
+    @staticmethod
+    def embed_query(tenant_id: str, provider_name: str, model_name: str, query: str) -> list[float]:
+        """
+        Embed the query with the embedding model of the annotations
+        """
+        embedding_model = ModelManager().get_model_instance(
+            tenant_id=tenant_id,
+            provider=provider_name,
+            model_type=ModelType.TEXT_EMBEDDING,
+            model=model_name,
+        )
+        return CacheEmbedding(embedding_model).embed_query(query)
+
+    @staticmethod
+    def _build_index(app_id: str, tenant_id: str, provider_name: str, model_name: str) -> Optional[AnnotationIndex]:
+        annotations_count = (
+            db.session.query(func.count(MessageAnnotation.id)).filter(MessageAnnotation.app_id == app_id).scalar()
+        )
+        if annotations_count > dify_config.ANNOTATION_REPLY_LOCAL_INDEX_MAX_SIZE:
+            logger.info(f"App {app_id} has {annotations_count} annotations, annotations searched in vector database")
+            return None
+
+        annotations = (
+            db.session.query(MessageAnnotation.id, MessageAnnotation.question)
+            .filter(MessageAnnotation.app_id == app_id)
+            .all()
+        )
+        if not annotations:
+            return AnnotationIndex([], np.empty((0, 0), dtype=np.float32))
+
+        embedding_model = ModelManager().get_model_instance(
+            tenant_id=tenant_id,
+            provider=provider_name,
+            model_type=ModelType.TEXT_EMBEDDING,
+            model=model_name,
+        )
+        hashes = [helper.generate_text_hash(annotation.question) for annotation in annotations]
+        embeddings = AnnotationIndexManager._load_cached_embeddings(
+            embedding_model.provider, embedding_model.model, set(hashes)
+        )
+
+        # questions missing from the embedding cache, e.g. indexed before the cache was filled, are embedded now
+        missing_questions = {
+            text_hash: annotation.question
+            for text_hash, annotation in zip(hashes, annotations)
+            if text_hash not in embeddings
+        }
+        if missing_questions:
+            missing_embeddings = CacheEmbedding(embedding_model).embed_documents(list(missing_questions.values()))
+            embeddings.update(zip(missing_questions, missing_embeddings))
+
+        annotation_ids = []
+        vectors = []
+        for text_hash, annotation in zip(hashes, annotations):
+            # the embedding of a question is missing if the model returned an invalid one
+            if embeddings.get(text_hash) is not None:
+                annotation_ids.append(annotation.id)
+                vectors.append(embeddings[text_hash])
+        if not vectors:
+            return AnnotationIndex([], np.empty((0, 0), dtype=np.float32))
+
+        return AnnotationIndex(annotation_ids, np.asarray(vectors, dtype=np.float32))
+
+    @staticmethod
+    def _load_cached_embeddings(provider_name: str, model_name: str, hashes: set[str]) -> dict[str, list[float]]:
+        """
+        Get the cached embeddings of the texts
+        :return: embedding by text hash, of the cached texts only
+        """
+        embeddings = {}
+        sorted_hashes = sorted(hashes)
+        for i in range(0, len(sorted_hashes), _EMBEDDING_QUERY_BATCH_SIZE):
+            for embedding in db.session.query(Embedding).filter(
+                Embedding.provider_name == provider_name,
+                Embedding.model_name == model_name,
+                Embedding.hash.in_(sorted_hashes[i : i + _EMBEDDING_QUERY_BATCH_SIZE]),
+            ):
+                embeddings[embedding.hash] = embedding.get_embedding()
+        return embeddings
@@ -1,7 +1,9 @@
 import logging
 from typing import Optional
 
+from configs import dify_config
 from core.app.entities.app_invoke_entities import InvokeFrom
+from core.app.features.annotation_reply.annotation_index import AnnotationIndexManager
 from core.rag.datasource.vdb.vector_factory import Vector
 from extensions.ext_database import db
 from models.dataset import Dataset
@@ -52,15 +54,10 @@ class AnnotationReplyFeature:
                 collection_binding_id=dataset_collection_binding.id,
             )
 
-            vector = Vector(dataset, attributes=["doc_id", "annotation_id", "app_id"])
+            match = self._search_annotation(dataset, dataset_collection_binding.id, query, score_threshold)
 
-            documents = vector.search_by_vector(
-                query=query, top_k=1, score_threshold=score_threshold, filter={"group_id": [dataset.id]}
-            )
-
-            if documents and documents[0].metadata:
-                annotation_id = documents[0].metadata["annotation_id"]
-                score = documents[0].metadata["score"]
+            if match:
+                annotation_id, score = match
                 annotation = AppAnnotationService.get_annotation_by_id(annotation_id)
                 if annotation:
                     if invoke_from in {InvokeFrom.SERVICE_API, InvokeFrom.WEB_APP}:
@@ -87,3 +84,35 @@ class AnnotationReplyFeature:
             return None
 
         return None
+
+    @staticmethod
+    def _search_annotation(
+        dataset: Dataset, collection_binding_id: str, query: str, score_threshold: float
+    ) -> Optional[tuple[str, float]]:
+        """
+        Search the annotation most similar to the query
+        :return: annotation id and score, None if no annotation reaches the score threshold
+        """
+        if dify_config.ANNOTATION_REPLY_LOCAL_INDEX_ENABLED:
+            index = AnnotationIndexManager.get_index(
+                dataset.id,
+                dataset.tenant_id,
+                collection_binding_id,
+                dataset.embedding_model_provider,
+                dataset.embedding_model,
+            )
+            if index is not None:
+                query_vector = AnnotationIndexManager.embed_query(
+                    dataset.tenant_id, dataset.embedding_model_provider, dataset.embedding_model, query
+                )
+                return index.search(query_vector, score_threshold)
+
+        vector = Vector(dataset, attributes=["doc_id", "annotation_id", "app_id"])
+
+        documents = vector.search_by_vector(
+            query=query, top_k=1, score_threshold=score_threshold, filter={"group_id": [dataset.id]}
+        )
+
+        if documents and documents[0].metadata:
+            return documents[0].metadata["annotation_id"], documents[0].metadata["score"]
+        return None
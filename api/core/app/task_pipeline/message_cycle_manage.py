@@ -175,7 +175,8 @@ class MessageCycleManage:
         :param message_id: message id
         :return:
         """
-        return MessageStreamResponse(
+        # constructed without validation, the fields are already typed and this runs for every token
+        return MessageStreamResponse.model_construct(
             task_id=self._application_generate_entity.task_id,
             id=message_id,
             answer=answer,
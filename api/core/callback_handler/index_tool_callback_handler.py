@@ -1,11 +1,8 @@
 from core.app.apps.base_app_queue_manager import AppQueueManager, PublishFrom
 from core.app.entities.app_invoke_entities import InvokeFrom
 from core.app.entities.queue_entities import QueueRetrieverResourcesEvent
-from core.rag.index_processor.constant.index_type import IndexType
 from core.rag.models.document import Document
-from extensions.ext_database import db
-from models.dataset import ChildChunk, DatasetQuery, DocumentSegment
-from models.dataset import Document as DatasetDocument
+from core.rag.retrieval.retrieval_stats_buffer import RetrievalStatsBuffer
 
 
 class DatasetIndexToolCallbackHandler:
@@ -24,49 +21,17 @@ class DatasetIndexToolCallbackHandler:
         """
         Handle query.
         """
-        dataset_query = DatasetQuery(
-            dataset_id=dataset_id,
-            content=query,
-            source="app",
-            source_app_id=self._app_id,
-            created_by_role=(
-                "account" if self._invoke_from in {InvokeFrom.EXPLORE, InvokeFrom.DEBUGGER} else "end_user"
-            ),
-            created_by=self._user_id,
+        RetrievalStatsBuffer.add_queries(
+            query,
+            [dataset_id],
+            self._app_id,
+            "account" if self._invoke_from in {InvokeFrom.EXPLORE, InvokeFrom.DEBUGGER} else "end_user",
+            self._user_id,
         )
 
-        db.session.add(dataset_query)
-        db.session.commit()
-
     def on_tool_end(self, documents: list[Document]) -> None:
         """Handle tool end."""
-        for document in documents:
-            if document.metadata is not None:
-                dataset_document = DatasetDocument.query.filter(
-                    DatasetDocument.id == document.metadata["document_id"]
-                ).first()
-                if dataset_document.doc_form == IndexType.PARENT_CHILD_INDEX:
-                    child_chunk = ChildChunk.query.filter(
-                        ChildChunk.index_node_id == document.metadata["doc_id"],
-                        ChildChunk.dataset_id == dataset_document.dataset_id,
-                        ChildChunk.document_id == dataset_document.id,
-                    ).first()
-                    if child_chunk:
-                        segment = DocumentSegment.query.filter(DocumentSegment.id == child_chunk.segment_id).update(
-                            {DocumentSegment.hit_count: DocumentSegment.hit_count + 1}, synchronize_session=False
-                        )
-                else:
-                    query = db.session.query(DocumentSegment).filter(
-                        DocumentSegment.index_node_id == document.metadata["doc_id"]
-                    )
-
-                    if "dataset_id" in document.metadata:
-                        query = query.filter(DocumentSegment.dataset_id == document.metadata["dataset_id"])
-
-                    # add hit count to document segment
-                    query.update({DocumentSegment.hit_count: DocumentSegment.hit_count + 1}, synchronize_session=False)
-
-                db.session.commit()
+        RetrievalStatsBuffer.add_segment_hits(documents)
 
     def return_retriever_resource_info(self, resource: list):
         """Handle return_retriever_resource_info."""
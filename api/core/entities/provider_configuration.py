@@ -17,7 +17,11 @@ from core.entities.provider_entities import (
     SystemConfigurationStatus,
 )
 from core.helper import encrypter
-from core.helper.model_provider_cache import ProviderCredentialsCache, ProviderCredentialsCacheType
+from core.helper.model_provider_cache import (
+    ProviderConfigurationsCache,
+    ProviderCredentialsCache,
+    ProviderCredentialsCacheType,
+)
 from core.model_runtime.entities.model_entities import AIModelEntity, FetchFrom, ModelType
 from core.model_runtime.entities.provider_entities import (
     ConfigurateMethod,
@@ -280,6 +284,8 @@ class ProviderConfiguration(BaseModel):
 
         provider_model_credentials_cache.delete()
 
+        ProviderConfigurationsCache(tenant_id=self.tenant_id).delete()
+
         self.switch_preferred_provider_type(ProviderType.CUSTOM)
 
     def delete_custom_credentials(self) -> None:
@@ -305,6 +311,8 @@ class ProviderConfiguration(BaseModel):
 
             provider_model_credentials_cache.delete()
 
+            ProviderConfigurationsCache(tenant_id=self.tenant_id).delete()
+
     def get_custom_model_credentials(
         self, model_type: ModelType, model: str, obfuscated: bool = False
     ) -> Optional[dict]:
@@ -447,6 +455,8 @@ class ProviderConfiguration(BaseModel):
 
         provider_model_credentials_cache.delete()
 
+        ProviderConfigurationsCache(tenant_id=self.tenant_id).delete()
+
     def delete_custom_model_credentials(self, model_type: ModelType, model: str) -> None:
         """
         Delete custom model credentials.
@@ -470,6 +480,8 @@ class ProviderConfiguration(BaseModel):
 
             provider_model_credentials_cache.delete()
 
+            ProviderConfigurationsCache(tenant_id=self.tenant_id).delete()
+
     def _get_provider_model_setting(self, model_type: ModelType, model: str) -> ProviderModelSetting | None:
         """
         Get provider model setting.
@@ -513,6 +525,8 @@ class ProviderConfiguration(BaseModel):
             db.session.add(model_setting)
             db.session.commit()
 
+        ProviderConfigurationsCache(tenant_id=self.tenant_id).delete()
+
         return model_setting
 
     def disable_model(self, model_type: ModelType, model: str) -> ProviderModelSetting:
@@ -538,6 +552,8 @@ class ProviderConfiguration(BaseModel):
             db.session.add(model_setting)
             db.session.commit()
 
+        ProviderConfigurationsCache(tenant_id=self.tenant_id).delete()
+
         return model_setting
 
     def get_provider_model_setting(self, model_type: ModelType, model: str) -> Optional[ProviderModelSetting]:
@@ -611,6 +627,8 @@ class ProviderConfiguration(BaseModel):
             db.session.add(model_setting)
             db.session.commit()
 
+        ProviderConfigurationsCache(tenant_id=self.tenant_id).delete()
+
         return model_setting
 
     def disable_model_load_balancing(self, model_type: ModelType, model: str) -> ProviderModelSetting:
@@ -650,6 +668,8 @@ class ProviderConfiguration(BaseModel):
             db.session.add(model_setting)
             db.session.commit()
 
+        ProviderConfigurationsCache(tenant_id=self.tenant_id).delete()
+
         return model_setting
 
     def get_model_type_instance(self, model_type: ModelType) -> AIModel:
@@ -711,6 +731,8 @@ class ProviderConfiguration(BaseModel):
 
         db.session.commit()
 
+        ProviderConfigurationsCache(tenant_id=self.tenant_id).delete()
+
     def extract_secret_variables(self, credential_form_schemas: list[CredentialFormSchema]) -> list[str]:
         """
         Extract secret input form variables.
@@ -0,0 +1,120 @@
+import threading
+from collections.abc import Callable
+from typing import Literal, Optional, TypeVar, Union
+
+from cachetools import LRUCache  # type: ignore
+
+from configs import dify_config
+
+_MB = 1024 * 1024
+
+_T = TypeVar("_T", bytes, str)
+
+_ContentKind = Literal["bytes", "base64"]
+
+_lookup_counter = None
+_evicted_bytes_counter = None
+
+
+def _record_lookup(kind: _ContentKind, hit: bool):
+    global _lookup_counter
+    if not dify_config.ENABLE_OTEL:
+        return
+
+    if _lookup_counter is None:
+        from opentelemetry.metrics import get_meter
+
+        meter = get_meter("file_content_cache_metrics", version=dify_config.CURRENT_VERSION)
+        _lookup_counter = meter.create_counter(
+            "file.content_cache.lookup.count", description="Number of file content cache lookups", unit="{lookup}"
+        )
+    _lookup_counter.add(1, {"kind": kind, "hit": hit})
+
+
+def _record_eviction(size: int):
+    global _evicted_bytes_counter
+    if not dify_config.ENABLE_OTEL:
+        return
+
+    if _evicted_bytes_counter is None:
+        from opentelemetry.metrics import get_meter
+
+        meter = get_meter("file_content_cache_metrics", version=dify_config.CURRENT_VERSION)
+        _evicted_bytes_counter = meter.create_counter(
+            "file.content_cache.evicted.size", description="Size of the evicted file contents", unit="By"
+        )
+    _evicted_bytes_counter.add(size)
+
+
+class _SizedLRUCache(LRUCache):
+    def __init__(self, maxsize: int, on_evict: Callable[[int], None]):
+        super().__init__(maxsize=maxsize, getsizeof=len)
+        self._on_evict = on_evict
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._on_evict(len(value))
+        return key, value
+
+
+class FileContentCache:
+    """
+    Byte budgeted in-process cache of the contents of storage files and of their base64 encodings.
+
+    Storage keys are never rewritten, so entries do not need to be invalidated and are only evicted,
+    least recently used first, when the budget is exceeded.
+    """
+
+    def __init__(self, max_size: int, max_item_size: int):
+        self._max_size = max_size
+        self._max_item_size = min(max_item_size, max_size)
+        self._cache = _SizedLRUCache(maxsize=max_size, on_evict=self._evicted)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _evicted(self, size: int):
+        self.evictions += 1
+        _record_eviction(size)
+
+    def get_or_load(self, kind: _ContentKind, storage_key: str, loader: Callable[[], _T]) -> _T:
+        key = (kind, storage_key)
+        with self._lock:
+            value: Optional[Union[bytes, str]] = self._cache.get(key)
+            if value is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        _record_lookup(kind, value is not None)
+        if value is not None:
+            return value  # type: ignore[return-value]
+
+        # loaded outside of the lock, concurrent misses of the same key may load it twice
+        loaded = loader()
+        if len(loaded) <= self._max_item_size:
+            with self._lock:
+                self._cache[key] = loaded
+        return loaded
+
+    @property
+    def size(self) -> int:
+        return int(self._cache.currsize)
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        with self._lock:
+            self._cache = _SizedLRUCache(maxsize=self._max_size, on_evict=self._evicted)
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+file_content_cache = FileContentCache(
+    max_size=dify_config.FILE_CONTENT_CACHE_MAX_SIZE * _MB,
+    max_item_size=dify_config.FILE_CONTENT_CACHE_MAX_ITEM_SIZE * _MB,
+)
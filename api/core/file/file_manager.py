@@ -1,5 +1,7 @@
 import base64
-from collections.abc import Mapping
+import io
+from collections.abc import Generator, Mapping
+from typing import IO, cast
 
 from configs import dify_config
 from core.helper import ssrf_proxy
@@ -13,6 +15,7 @@ from core.model_runtime.entities.message_entities import PromptMessageContentUni
 from extensions.ext_storage import storage
 
 from . import helpers
+from .content_cache import file_content_cache
 from .enums import FileAttribute
 from .models import File, FileTransferMethod, FileType
 from .tool_file_parser import ToolFileParser
@@ -81,6 +84,42 @@ def download(f: File, /):
     raise ValueError(f"unsupported transfer method: {f.transfer_method}")
 
 
+def download_stream(f: File, /) -> IO[bytes]:
+    """
+    Open the content of a file as a readable binary stream.
+
+    Local and tool files are read from storage chunk by chunk while the stream is read,
+    other files are downloaded into memory.
+    """
+    if f.transfer_method in (FileTransferMethod.TOOL_FILE, FileTransferMethod.LOCAL_FILE):
+        return cast(IO[bytes], _ChunkReader(storage.load(f._storage_key, stream=True)))
+    return io.BytesIO(download(f))
+
+
+class _ChunkReader(io.RawIOBase):
+    def __init__(self, chunks: Generator[bytes, None, None]):
+        self._chunks = chunks
+        self._chunk = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._chunk:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._chunk = memoryview(chunk)
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
+
+    def close(self):
+        self._chunks.close()
+        super().close()
+
+
 def _download_file_content(path: str, /):
     """
     Download and return the contents of a file as bytes.
@@ -96,6 +135,12 @@ def _download_file_content(path: str, /):
     Raises:
         ValueError: If the loaded file is not a bytes object.
     """
+    if dify_config.FILE_CONTENT_CACHE_ENABLED:
+        return file_content_cache.get_or_load("bytes", path, lambda: _load_file_content(path))
+    return _load_file_content(path)
+
+
+def _load_file_content(path: str, /) -> bytes:
     data = storage.load(path, stream=False)
     if not isinstance(data, bytes):
         raise ValueError(f"file {path} is not a bytes object")
@@ -108,13 +153,20 @@ def _get_encoded_string(f: File, /):
             response = ssrf_proxy.get(f.remote_url, follow_redirects=True)
             response.raise_for_status()
             data = response.content
-        case FileTransferMethod.LOCAL_FILE:
-            data = _download_file_content(f._storage_key)
-        case FileTransferMethod.TOOL_FILE:
+        case FileTransferMethod.LOCAL_FILE | FileTransferMethod.TOOL_FILE:
+            if dify_config.FILE_CONTENT_CACHE_ENABLED:
+                # the encoding is cached on its own, the bytes are only needed to build it
+                storage_key = f._storage_key
+                return file_content_cache.get_or_load(
+                    "base64", storage_key, lambda: _encode(_load_file_content(storage_key))
+                )
             data = _download_file_content(f._storage_key)
 
-    encoded_string = base64.b64encode(data).decode("utf-8")
-    return encoded_string
+    return _encode(data)
+
+
+def _encode(data: bytes, /) -> str:
+    return base64.b64encode(data).decode("utf-8")
 
 
 def _to_url(f: File, /):
@@ -1,8 +1,10 @@
 import json
 from enum import Enum
 from json import JSONDecodeError
-from typing import Optional
+from typing import Any, Optional
 
+from configs import dify_config
+from core.helper.versioned_cache import VersionedLocalCache
 from extensions.ext_redis import redis_client
 
 
@@ -50,3 +52,66 @@ class ProviderCredentialsCache:
         :return:
         """
         redis_client.delete(self.cache_key)
+
+
+class ProviderConfigurationsCache:
+    """
+    In-process cache of the provider configurations snapshot of a workspace.
+
+    Snapshots are guarded by a version stamp kept in redis, which is bumped on every provider,
+    provider model, preferred provider, model setting or load balancing config write,
+    so that snapshots held by other processes are dropped on their next lookup.
+    The usage of the hosted quotas is not versioned, it is read again whenever a snapshot is used.
+    """
+
+    _snapshots = VersionedLocalCache(
+        "provider_configurations_version:tenant_id",
+        maxsize=dify_config.PROVIDER_CONFIGURATIONS_CACHE_MAX_TENANTS,
+        ttl=dify_config.PROVIDER_CONFIGURATIONS_CACHE_TTL,
+    )
+
+    def __init__(self, tenant_id: str):
+        self.tenant_id = tenant_id
+
+    def get_version(self) -> str:
+        """
+        Get current version stamp of the provider configurations.
+
+        :return:
+        """
+        return self._snapshots.get_version(self.tenant_id)
+
+    def get(self, version: str, fingerprint: str) -> Optional[Any]:
+        """
+        Get cached provider configurations snapshot.
+
+        :param version: current version stamp
+        :param fingerprint: fingerprint of the installed model provider plugins
+        :return:
+        """
+        if not dify_config.PROVIDER_CONFIGURATIONS_CACHE_ENABLED:
+            return None
+
+        return self._snapshots.get(self.tenant_id, f"{version}:{fingerprint}")
+
+    def set(self, version: str, fingerprint: str, provider_configurations: Any) -> None:
+        """
+        Cache provider configurations snapshot.
+
+        :param version: version stamp read before the snapshot was built
+        :param fingerprint: fingerprint of the installed model provider plugins
+        :param provider_configurations: provider configurations
+        :return:
+        """
+        if not dify_config.PROVIDER_CONFIGURATIONS_CACHE_ENABLED:
+            return
+
+        self._snapshots.set(self.tenant_id, f"{version}:{fingerprint}", provider_configurations)
+
+    def delete(self) -> None:
+        """
+        Invalidate cached provider configurations in all processes.
+
+        :return:
+        """
+        self._snapshots.invalidate(self.tenant_id)
@@ -0,0 +1,39 @@
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+from typing import Any, Optional
+
+
+class LazyProcessPool:
+    """
+    Process pool of spawned workers, started on first use and shared by the threads of the process.
+    """
+
+    def __init__(self, get_max_workers: Callable[[], int], initializer: Optional[Callable[[], Any]] = None):
+        """
+        :param get_max_workers: gets the configured number of workers, the pool is disabled if it is 0
+        :param initializer: called in each worker when it starts, e.g. to preload models
+        """
+        self._get_max_workers = get_max_workers
+        self._initializer = initializer
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = Lock()
+
+    def get(self) -> Optional[ProcessPoolExecutor]:
+        """
+        Get the process pool, None if it is disabled
+        """
+        max_workers = self._get_max_workers()
+        if not max_workers:
+            return None
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self._initializer,
+                )
+
+            return self._executor
@@ -4,6 +4,8 @@ Proxy requests to avoid SSRF
 
 import logging
 import time
+from collections.abc import Iterator
+from typing import cast
 
 import httpx
 
@@ -34,7 +36,58 @@ class MaxRetriesExceededError(ValueError):
     pass
 
 
+class _ClientClosingStream(httpx.SyncByteStream):
+    """
+    Body stream of a streamed response, closing the client of the response together with it
+    """
+
+    def __init__(self, stream: httpx.SyncByteStream, client: httpx.Client):
+        self._stream = stream
+        self._client = client
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._client.close()
+
+
+def _create_client(ssl_verify) -> httpx.Client:
+    if dify_config.SSRF_PROXY_ALL_URL:
+        return httpx.Client(proxy=dify_config.SSRF_PROXY_ALL_URL, verify=ssl_verify)
+    elif dify_config.SSRF_PROXY_HTTP_URL and dify_config.SSRF_PROXY_HTTPS_URL:
+        proxy_mounts = {
+            "http://": httpx.HTTPTransport(proxy=dify_config.SSRF_PROXY_HTTP_URL, verify=ssl_verify),
+            "https://": httpx.HTTPTransport(proxy=dify_config.SSRF_PROXY_HTTPS_URL, verify=ssl_verify),
+        }
+        return httpx.Client(mounts=proxy_mounts, verify=ssl_verify)
+    else:
+        return httpx.Client(verify=ssl_verify)
+
+
+def _send_streaming(client: httpx.Client, method, url, **kwargs) -> httpx.Response:
+    follow_redirects = kwargs.pop("follow_redirects", False)
+    auth = kwargs.pop("auth", None)
+    try:
+        request = client.build_request(method=method, url=url, **kwargs)
+        response = client.send(request, stream=True, auth=auth, follow_redirects=follow_redirects)
+    except BaseException:
+        client.close()
+        raise
+    # responses of a sync client always have a sync body stream
+    response.stream = _ClientClosingStream(cast(httpx.SyncByteStream, response.stream), client)
+    return response
+
+
 def make_request(method, url, max_retries=SSRF_DEFAULT_MAX_RETRIES, **kwargs):
+    """
+    Make a request through the SSRF proxy, retrying on request errors and on the status codes of STATUS_FORCELIST.
+
+    With `stream=True`, the body of the response is not read, the caller iterates and closes the response.
+    """
     if "allow_redirects" in kwargs:
         allow_redirects = kwargs.pop("allow_redirects")
         if "follow_redirects" not in kwargs:
@@ -52,28 +105,24 @@ def make_request(method, url, max_retries=SSRF_DEFAULT_MAX_RETRIES, **kwargs):
         kwargs["ssl_verify"] = HTTP_REQUEST_NODE_SSL_VERIFY
 
     ssl_verify = kwargs.pop("ssl_verify")
+    stream = kwargs.pop("stream", False)
 
     retries = 0
     while retries <= max_retries:
         try:
-            if dify_config.SSRF_PROXY_ALL_URL:
-                with httpx.Client(proxy=dify_config.SSRF_PROXY_ALL_URL, verify=ssl_verify) as client:
-                    response = client.request(method=method, url=url, **kwargs)
-            elif dify_config.SSRF_PROXY_HTTP_URL and dify_config.SSRF_PROXY_HTTPS_URL:
-                proxy_mounts = {
-                    "http://": httpx.HTTPTransport(proxy=dify_config.SSRF_PROXY_HTTP_URL, verify=ssl_verify),
-                    "https://": httpx.HTTPTransport(proxy=dify_config.SSRF_PROXY_HTTPS_URL, verify=ssl_verify),
-                }
-                with httpx.Client(mounts=proxy_mounts, verify=ssl_verify) as client:
-                    response = client.request(method=method, url=url, **kwargs)
+            client = _create_client(ssl_verify)
+            if stream:
+                response = _send_streaming(client, method, url, **kwargs)
             else:
-                with httpx.Client(verify=ssl_verify) as client:
+                with client:
                     response = client.request(method=method, url=url, **kwargs)
 
             if response.status_code not in STATUS_FORCELIST:
                 return response
             else:
                 logging.warning(f"Received status code {response.status_code} for URL {url} which is in the force list")
+                if stream:
+                    response.close()
 
         except httpx.RequestError as e:
             logging.warning(f"Request to URL {url} failed on attempt {retries + 1}: {e}")
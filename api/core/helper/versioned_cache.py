@@ -0,0 +1,103 @@
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any, Optional, TypeVar
+
+from cachetools import LRUCache  # type: ignore
+
+from extensions.ext_redis import redis_client
+
+_T = TypeVar("_T")
+
+_MISSING = object()
+
+# a version stamp expiring only makes the processes load the values of its key again
+_VERSION_TTL = 86400
+
+
+class VersionedLocalCache:
+    """
+    In-process LRU cache of values guarded by version stamps kept in redis.
+
+    Invalidating a key bumps its version stamp, which drops the values of the key held by other processes
+    on their next lookup. The version is read before a value is loaded,
+    so a write made while the value is loaded leaves it stale instead of cached.
+    """
+
+    def __init__(self, version_key_prefix: str, maxsize: int, ttl: Optional[float] = None):
+        """
+        :param version_key_prefix: prefix of the redis keys of the version stamps
+        :param maxsize: maximum number of cached keys
+        :param ttl: seconds after which the values are loaded again, even if their version is current
+        """
+        self._version_key_prefix = version_key_prefix
+        self._ttl = ttl
+        self._entries: LRUCache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def get_version(self, key: str) -> str:
+        """
+        Get the current version stamp of the key
+        """
+        version = redis_client.get(self._get_version_key(key))
+        return version.decode("utf-8") if version else ""
+
+    def get(self, key: str, version: str, default: Any = None) -> Any:
+        """
+        Get the value of the key cached with the given version
+        :param key: key
+        :param version: current version stamp, and any other state the value depends on
+        :param default: returned if no value is cached, or if it is stale
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        cached_version, cached_at, value = entry
+        if cached_version != version or (self._ttl is not None and time.monotonic() - cached_at > self._ttl):
+            return default
+        return value
+
+    def set(self, key: str, version: str, value: Any) -> None:
+        """
+        Cache the value of the key
+        :param key: key
+        :param version: version stamp read before the value was loaded
+        :param value: value
+        """
+        with self._lock:
+            self._entries[key] = (version, time.monotonic(), value)
+
+    def get_or_load(self, key: str, loader: Callable[[], _T], variant: str = "") -> _T:
+        """
+        Get the value of the key, or load and cache it
+        :param key: key
+        :param loader: loads the value, which may be None
+        :param variant: other state the value depends on, a value cached for another variant is loaded again
+        """
+        version = f"{self.get_version(key)}:{variant}"
+        value = self.get(key, version, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, version, value)
+        return value  # type: ignore[no-any-return]
+
+    def invalidate(self, key: str) -> None:
+        """
+        Drop the values of the key in all processes
+        """
+        redis_client.setex(self._get_version_key(key), _VERSION_TTL, uuid.uuid4().hex)
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Drop the values cached by this process
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _get_version_key(self, key: str) -> str:
+        return f"{self._version_key_prefix}:{key}"
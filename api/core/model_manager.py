@@ -1,5 +1,9 @@
+import hashlib
 import logging
+import random
+import time
 from collections.abc import Callable, Generator, Iterable, Sequence
+from threading import Lock
 from typing import IO, Any, Literal, Optional, Union, cast, overload
 
 from configs import dify_config
@@ -7,6 +11,7 @@ from core.entities.embedding_type import EmbeddingInputType
 from core.entities.provider_configuration import ProviderConfiguration, ProviderModelBundle
 from core.entities.provider_entities import ModelLoadBalancingConfiguration
 from core.errors.error import ProviderTokenNotInitError
+from core.helper.lru_cache import LRUCache
 from core.model_runtime.callbacks.base_callback import Callback
 from core.model_runtime.entities.llm_entities import LLMResult
 from core.model_runtime.entities.message_entities import PromptMessage, PromptMessageTool
@@ -26,6 +31,11 @@ from models.provider import ProviderType
 
 logger = logging.getLogger(__name__)
 
+TEXT_EMBEDDING_NUM_TOKENS_BATCH_SIZE = 1000
+
+_text_embedding_num_tokens_cache = LRUCache(capacity=100000)
+_text_embedding_num_tokens_cache_lock = Lock()
+
 
 class ModelInstance:
     """
@@ -239,15 +249,45 @@ class ModelInstance:
             raise Exception("Model type instance is not TextEmbeddingModel")
 
         self.model_type_instance = cast(TextEmbeddingModel, self.model_type_instance)
-        return cast(
-            list[int],
-            self._round_robin_invoke(
-                function=self.model_type_instance.get_num_tokens,
-                model=self.model,
-                credentials=self.credentials,
-                texts=texts,
-            ),
-        )
+
+        # the same texts are counted again while indexing, so counts are memoized by model and text digest
+        # and only the distinct uncached texts are sent to the model, in batches
+        cache_keys = [
+            (
+                self.provider_model_bundle.configuration.tenant_id,
+                self.provider,
+                self.model,
+                hashlib.sha256(text.encode()).digest(),
+            )
+            for text in texts
+        ]
+        with _text_embedding_num_tokens_cache_lock:
+            num_tokens = {key: _text_embedding_num_tokens_cache.get(key) for key in cache_keys}
+
+        uncached_texts = {}
+        for key, text in zip(cache_keys, texts):
+            if num_tokens[key] is None:
+                uncached_texts[key] = text
+
+        uncached_keys = list(uncached_texts.keys())
+        for i in range(0, len(uncached_keys), TEXT_EMBEDDING_NUM_TOKENS_BATCH_SIZE):
+            batch_keys = uncached_keys[i : i + TEXT_EMBEDDING_NUM_TOKENS_BATCH_SIZE]
+            batch_num_tokens = cast(
+                list[int],
+                self._round_robin_invoke(
+                    function=self.model_type_instance.get_num_tokens,
+                    model=self.model,
+                    credentials=self.credentials,
+                    texts=[uncached_texts[key] for key in batch_keys],
+                ),
+            )
+
+            with _text_embedding_num_tokens_cache_lock:
+                for key, tokens in zip(batch_keys, batch_num_tokens):
+                    num_tokens[key] = tokens
+                    _text_embedding_num_tokens_cache.put(key, tokens)
+
+        return [cast(int, num_tokens[key]) for key in cache_keys]
 
     def invoke_rerank(
         self,
@@ -381,7 +421,13 @@ class ModelInstance:
             try:
                 if "credentials" in kwargs:
                     del kwargs["credentials"]
-                return function(*args, **kwargs, credentials=lb_config.credentials)
+                started_at = time.perf_counter()
+                result = function(*args, **kwargs, credentials=lb_config.credentials)
+                if isinstance(result, Generator):
+                    return self._observe_first_chunk_latency(result, lb_config, started_at)
+
+                self.load_balancing_manager.observe_latency(lb_config, time.perf_counter() - started_at)
+                return result
             except InvokeRateLimitError as e:
                 # expire in 60 seconds
                 self.load_balancing_manager.cooldown(lb_config, expire=60)
@@ -395,6 +441,24 @@ class ModelInstance:
             except Exception as e:
                 raise e
 
+    def _observe_first_chunk_latency(
+        self, result: Generator, lb_config: ModelLoadBalancingConfiguration, started_at: float
+    ) -> Generator:
+        """
+        Record the time to the first chunk of a streaming result as response time of the load balancing config
+        :param result: streaming result
+        :param lb_config: model load balancing config
+        :param started_at: time.perf_counter() before invoking
+        :return:
+        """
+        first_chunk = True
+        for chunk in result:
+            if first_chunk and self.load_balancing_manager:
+                self.load_balancing_manager.observe_latency(lb_config, time.perf_counter() - started_at)
+                first_chunk = False
+
+            yield chunk
+
     def get_tts_voices(self, language: Optional[str] = None) -> list:
         """
         Invoke large language tts model voices
@@ -462,6 +526,26 @@ class ModelManager:
         )
 
 
+class LBModelState:
+    """
+    Process local load balancing state of a model.
+    Cooldowns are mirrored from redis and refreshed every MODEL_LB_COOLDOWN_REFRESH_INTERVAL seconds.
+    """
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.index = 0
+        # config id -> time.monotonic() at which the cooldown ends
+        self.cooldowns: dict[str, float] = {}
+        self.cooldowns_refreshed_at: Optional[float] = None
+        # config id -> moving average of the observed response time in seconds
+        self.latencies: dict[str, float] = {}
+
+
+_lb_model_states = LRUCache(capacity=10000)
+_lb_model_states_lock = Lock()
+
+
 class LBModelManager:
     def __init__(
         self,
@@ -495,54 +579,95 @@ class LBModelManager:
                 else:
                     load_balancing_config.credentials = managed_credentials
 
-    def fetch_next(self) -> Optional[ModelLoadBalancingConfiguration]:
+        self._state = self._get_state()
+
+    def _get_state(self) -> LBModelState:
         """
-        Get next model load balancing config
-        Strategy: Round Robin
+        Get process local load balancing state of the model
         :return:
         """
-        cache_key = "model_lb_index:{}:{}:{}:{}".format(
+        state_key = "model_lb_index:{}:{}:{}:{}".format(
             self._tenant_id, self._provider, self._model_type.value, self._model
         )
 
-        cooldown_load_balancing_configs = []
-        max_index = len(self._load_balancing_configs)
-
-        while True:
-            current_index = redis_client.incr(cache_key)
-            current_index = cast(int, current_index)
-            if current_index >= 10000000:
-                current_index = 1
-                redis_client.set(cache_key, current_index)
-
-            redis_client.expire(cache_key, 3600)
-            if current_index > max_index:
-                current_index = current_index % max_index
-
-            real_index = current_index - 1
-            if real_index > max_index:
-                real_index = 0
+        with _lb_model_states_lock:
+            state = _lb_model_states.get(state_key)
+            if not state:
+                state = LBModelState()
+                _lb_model_states.put(state_key, state)
 
-            config: ModelLoadBalancingConfiguration = self._load_balancing_configs[real_index]
+        return cast(LBModelState, state)
 
-            if self.in_cooldown(config):
-                cooldown_load_balancing_configs.append(config)
-                if len(cooldown_load_balancing_configs) >= len(self._load_balancing_configs):
-                    # all configs are in cooldown
-                    return None
-
-                continue
+    def fetch_next(self) -> Optional[ModelLoadBalancingConfiguration]:
+        """
+        Get next model load balancing config
+        Strategy: Round Robin, or weighted by observed response times if MODEL_LB_LATENCY_WEIGHTING_ENABLED
+        :return:
+        """
+        available_configs = [config for config in self._load_balancing_configs if not self.in_cooldown(config)]
+        available_config_ids = {config.id for config in available_configs}
+        if not available_configs:
+            # all configs are in cooldown
+            return None
+
+        with self._state.lock:
+            if dify_config.MODEL_LB_LATENCY_WEIGHTING_ENABLED and self._state.latencies:
+                config = self._choose_by_latency(available_configs)
+            else:
+                max_index = len(self._load_balancing_configs)
+                while True:
+                    current_index = self._state.index % max_index
+                    self._state.index = current_index + 1
+
+                    config = self._load_balancing_configs[current_index]
+                    if config.id in available_config_ids:
+                        break
+
+        if dify_config.DEBUG:
+            logger.info(
+                f"Model LB\nid: {config.id}\nname:{config.name}\n"
+                f"tenant_id: {self._tenant_id}\nprovider: {self._provider}\n"
+                f"model_type: {self._model_type.value}\nmodel: {self._model}"
+            )
+
+        return config
+
+    def _choose_by_latency(
+        self, available_configs: list[ModelLoadBalancingConfiguration]
+    ) -> ModelLoadBalancingConfiguration:
+        """
+        Choose config randomly, weighted by the inverse of its observed response time.
+        Configs without observed response time get the weight of the fastest one, so they are tried as well.
+        :param available_configs: configs not in cooldown
+        :return:
+        """
+        weights = [
+            1 / self._state.latencies[config.id] if self._state.latencies.get(config.id) else 0.0
+            for config in available_configs
+        ]
+        max_weight = max(weights) or 1.0
+        weights = [weight or max_weight for weight in weights]
 
-            if dify_config.DEBUG:
-                logger.info(
-                    f"Model LB\nid: {config.id}\nname:{config.name}\n"
-                    f"tenant_id: {self._tenant_id}\nprovider: {self._provider}\n"
-                    f"model_type: {self._model_type.value}\nmodel: {self._model}"
-                )
+        return random.choices(available_configs, weights=weights)[0]
 
-            return config
+    def observe_latency(self, config: ModelLoadBalancingConfiguration, latency: float) -> None:
+        """
+        Record response time of model load balancing config
+        :param config: model load balancing config
+        :param latency: response time in seconds
+        :return:
+        """
+        with self._state.lock:
+            previous_latency = self._state.latencies.get(config.id)
+            if previous_latency is None:
+                self._state.latencies[config.id] = latency
+            else:
+                self._state.latencies[config.id] = 0.7 * previous_latency + 0.3 * latency
 
-        return None
+    def _get_cooldown_cache_key(self, config_id: str) -> str:
+        return "model_lb_index:cooldown:{}:{}:{}:{}:{}".format(
+            self._tenant_id, self._provider, self._model_type.value, self._model, config_id
+        )
 
     def cooldown(self, config: ModelLoadBalancingConfiguration, expire: int = 60) -> None:
         """
@@ -551,11 +676,10 @@ class LBModelManager:
         :param expire: cooldown time
         :return:
         """
-        cooldown_cache_key = "model_lb_index:cooldown:{}:{}:{}:{}:{}".format(
-            self._tenant_id, self._provider, self._model_type.value, self._model, config.id
-        )
+        redis_client.setex(self._get_cooldown_cache_key(config.id), expire, "true")
 
-        redis_client.setex(cooldown_cache_key, expire, "true")
+        with self._state.lock:
+            self._state.cooldowns[config.id] = time.monotonic() + expire
 
     def in_cooldown(self, config: ModelLoadBalancingConfiguration) -> bool:
         """
@@ -563,12 +687,35 @@ class LBModelManager:
         :param config: model load balancing config
         :return:
         """
-        cooldown_cache_key = "model_lb_index:cooldown:{}:{}:{}:{}:{}".format(
-            self._tenant_id, self._provider, self._model_type.value, self._model, config.id
-        )
+        self._refresh_cooldowns()
+
+        with self._state.lock:
+            return self._state.cooldowns.get(config.id, 0) > time.monotonic()
 
-        res: bool = redis_client.exists(cooldown_cache_key)
-        return res
+    def _refresh_cooldowns(self) -> None:
+        """
+        Mirror cooldowns set by other processes from redis, in a single round trip
+        :return:
+        """
+        now = time.monotonic()
+        with self._state.lock:
+            refreshed_at = self._state.cooldowns_refreshed_at
+            if refreshed_at is not None and now - refreshed_at < dify_config.MODEL_LB_COOLDOWN_REFRESH_INTERVAL:
+                return
+
+            self._state.cooldowns_refreshed_at = now
+
+        pipeline = redis_client.pipeline(transaction=False)
+        for config in self._load_balancing_configs:
+            pipeline.pttl(self._get_cooldown_cache_key(config.id))
+        ttls = pipeline.execute()
+
+        with self._state.lock:
+            for config, ttl in zip(self._load_balancing_configs, ttls):
+                if ttl and ttl > 0:
+                    self._state.cooldowns[config.id] = now + ttl / 1000
+                else:
+                    self._state.cooldowns.pop(config.id, None)
 
     @staticmethod
     def get_config_in_cooldown_and_ttl(
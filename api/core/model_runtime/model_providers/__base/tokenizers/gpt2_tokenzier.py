@@ -1,12 +1,19 @@
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from threading import Lock
-from typing import Any
+from typing import Any, Optional
+
+from configs import dify_config
+from core.helper.process_pool import LazyProcessPool
 
 logger = logging.getLogger(__name__)
 
 _tokenizer: Any = None
 _lock = Lock()
 
+# texts shorter than this are encoded inline, sending them to a worker costs more than encoding them
+_POOL_MIN_TEXT_LENGTH = 8192
+
 
 class GPT2Tokenizer:
     @staticmethod
@@ -20,12 +27,36 @@ class GPT2Tokenizer:
 
     @staticmethod
     def get_num_tokens(text: str) -> int:
-        # Because this process needs more cpu resource, we turn this back before we find a better way to handle it.
-        #
-        # future = _executor.submit(GPT2Tokenizer._get_num_tokens_by_gpt2, text)
-        # result = future.result()
-        # return cast(int, result)
-        return GPT2Tokenizer._get_num_tokens_by_gpt2(text)
+        return GPT2Tokenizer.get_num_tokens_batch([text])[0]
+
+    @staticmethod
+    def get_num_tokens_batch(texts: list[str]) -> list[int]:
+        """
+        Get num tokens of texts.
+        Large texts are encoded by the tokenizer process pool if GPT2_TOKENIZER_PROCESS_POOL_SIZE is set,
+        so that encoding does not hold the GIL of the calling process.
+        """
+        executor = GPT2Tokenizer.get_executor()
+        if not executor or all(len(text) < _POOL_MIN_TEXT_LENGTH for text in texts):
+            return [GPT2Tokenizer._get_num_tokens_by_gpt2(text) for text in texts]
+
+        futures = {
+            i: executor.submit(GPT2Tokenizer._get_num_tokens_by_gpt2, text)
+            for i, text in enumerate(texts)
+            if len(text) >= _POOL_MIN_TEXT_LENGTH
+        }
+
+        return [
+            futures[i].result() if i in futures else GPT2Tokenizer._get_num_tokens_by_gpt2(text)
+            for i, text in enumerate(texts)
+        ]
+
+    @staticmethod
+    def get_executor() -> Optional[ProcessPoolExecutor]:
+        """
+        Get the tokenizer process pool, workers are spawned with the encoder preloaded
+        """
+        return _executor.get()
 
     @staticmethod
     def get_encoder() -> Any:
@@ -49,3 +80,7 @@ class GPT2Tokenizer:
                     logger.info("Fallback to Transformers' GPT-2 tokenizer from tiktoken")
 
             return _tokenizer
+
+
+# defined after GPT2Tokenizer, whose encoder is preloaded by the workers
+_executor = LazyProcessPool(lambda: dify_config.GPT2_TOKENIZER_PROCESS_POOL_SIZE, initializer=GPT2Tokenizer.get_encoder)
@@ -1,10 +1,15 @@
+import hashlib
+import json
 import logging
 import threading
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 
+from cachetools import TTLCache  # type: ignore
 from flask import Flask, current_app
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 
 from configs import dify_config
 from core.app.apps.base_app_queue_manager import AppQueueManager, PublishFrom
@@ -14,12 +19,106 @@ from core.moderation.factory import ModerationFactory
 
 logger = logging.getLogger(__name__)
 
+# verdicts of the moderated texts, keyed by app, rule and text hash
+_verdict_cache: TTLCache = TTLCache(maxsize=4096, ttl=600)
+_verdict_cache_lock = threading.Lock()
+
+_check_counter = None
+_check_latency_histogram = None
+
+
+def _record_check(latency: Optional[float], cached: bool):
+    global _check_counter, _check_latency_histogram
+    if not dify_config.ENABLE_OTEL:
+        return
+
+    if _check_counter is None or _check_latency_histogram is None:
+        from opentelemetry.metrics import get_meter
+
+        meter = get_meter("moderation_metrics", version=dify_config.CURRENT_VERSION)
+        _check_counter = meter.create_counter(
+            "moderation.output.check.count", description="Number of output moderation checks", unit="{check}"
+        )
+        _check_latency_histogram = meter.create_histogram(
+            "moderation.output.check.latency", description="Latency of uncached output moderation checks", unit="s"
+        )
+    _check_counter.add(1, {"cached": cached})
+    if latency is not None:
+        _check_latency_histogram.record(latency)
+
 
 class ModerationRule(BaseModel):
     type: str
     config: dict[str, Any]
 
 
+class OutputModerationWorker:
+    """
+    Shared worker of the streaming output moderations of the process.
+
+    A single scheduler thread collects the streams with enough new text, and their windows are moderated
+    on a bounded thread pool, instead of one polling thread per streaming response.
+    """
+
+    _instance: Optional["OutputModerationWorker"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_workers: int):
+        # streams are referenced weakly, so a stream which is never stopped does not leak
+        self._streams: dict[int, tuple[weakref.ref[OutputModeration], Flask]] = {}
+        self._in_flight: set[int] = set()
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="output_moderation")
+        threading.Thread(target=self._schedule, daemon=True).start()
+
+    @classmethod
+    def get_instance(cls) -> "OutputModerationWorker":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(max_workers=dify_config.MODERATION_WORKER_POOL_SIZE)
+            return cls._instance
+
+    def register(self, stream: "OutputModeration", flask_app: Flask):
+        with self._condition:
+            self._streams[id(stream)] = (weakref.ref(stream), flask_app)
+            self._condition.notify()
+
+    def unregister(self, stream: "OutputModeration"):
+        with self._condition:
+            self._streams.pop(id(stream), None)
+
+    def notify(self):
+        with self._condition:
+            self._condition.notify()
+
+    def _schedule(self):
+        while True:
+            with self._condition:
+                # streams are woken up as they fill a window, the timeout picks up streams after a check
+                self._condition.wait(timeout=1)
+                due = []
+                for stream_id, (stream_ref, flask_app) in list(self._streams.items()):
+                    stream = stream_ref()
+                    if stream is None:
+                        del self._streams[stream_id]
+                    elif stream_id not in self._in_flight and stream.has_pending_window():
+                        due.append((stream_id, stream, flask_app))
+                self._in_flight.update(stream_id for stream_id, _, _ in due)
+
+            for stream_id, stream, flask_app in due:
+                self._executor.submit(self._check, stream_id, stream, flask_app)
+
+    def _check(self, stream_id: int, stream: "OutputModeration", flask_app: Flask):
+        try:
+            with flask_app.app_context():
+                stream.check_pending_window()
+        except Exception:
+            logger.exception(f"Output moderation check failed, app_id: {stream.app_id}")
+        finally:
+            with self._condition:
+                self._in_flight.discard(stream_id)
+
+
 class OutputModeration(BaseModel):
     tenant_id: str
     app_id: str
@@ -27,13 +126,18 @@ class OutputModeration(BaseModel):
     rule: ModerationRule
     queue_manager: AppQueueManager
 
-    thread: Optional[threading.Thread] = None
-    thread_running: bool = True
+    running: bool = True
     buffer: str = ""
     is_final_chunk: bool = False
     final_output: Optional[str] = None
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
+    # length of the buffer already moderated
+    _checked_length: int = PrivateAttr(default=0)
+    # once a window was flagged, the whole buffer is moderated to keep the replaced text consistent
+    _flagged: bool = PrivateAttr(default=False)
+    _registered: bool = PrivateAttr(default=False)
+
     def should_direct_output(self) -> bool:
         return self.final_output is not None
 
@@ -43,14 +147,30 @@ class OutputModeration(BaseModel):
     def append_new_token(self, token: str) -> None:
         self.buffer += token
 
-        if not self.thread:
-            self.thread = self.start_thread()
+        if not self._registered:
+            self._registered = True
+            OutputModerationWorker.get_instance().register(
+                self,
+                current_app._get_current_object(),  # type: ignore
+            )
+        elif self.has_pending_window():
+            OutputModerationWorker.get_instance().notify()
 
     def moderation_completion(self, completion: str, public_event: bool = False) -> tuple[str, bool]:
         self.buffer = completion
         self.is_final_chunk = True
 
-        result = self.moderation(tenant_id=self.tenant_id, app_id=self.app_id, moderation_buffer=completion)
+        result = None
+        if not self._flagged and self._checked_length:
+            # the moderated prefix passed, only the rest is checked before the whole completion is
+            result = self.moderation(
+                tenant_id=self.tenant_id, app_id=self.app_id, moderation_buffer=self._get_window(completion)
+            )
+            if not result or not result.flagged:
+                return completion, False
+
+        if not result or result.action != ModerationAction.DIRECT_OUTPUT:
+            result = self.moderation(tenant_id=self.tenant_id, app_id=self.app_id, moderation_buffer=completion)
 
         if not result or not result.flagged:
             return completion, False
@@ -70,72 +190,82 @@ class OutputModeration(BaseModel):
 
         return final_output, True
 
-    def start_thread(self) -> threading.Thread:
-        buffer_size = dify_config.MODERATION_BUFFER_SIZE
-        thread = threading.Thread(
-            target=self.worker,
-            kwargs={
-                "flask_app": current_app._get_current_object(),  # type: ignore
-                "buffer_size": buffer_size if buffer_size > 0 else dify_config.MODERATION_BUFFER_SIZE,
-            },
+    def stop_moderation(self):
+        self.running = False
+        if self._registered:
+            OutputModerationWorker.get_instance().unregister(self)
+
+    def has_pending_window(self) -> bool:
+        if not self.running:
+            return False
+        return len(self.buffer) - self._checked_length >= dify_config.MODERATION_BUFFER_SIZE
+
+    def check_pending_window(self):
+        """
+        Moderate the text appended since the last check
+        """
+        moderation_buffer = self.buffer
+        window_start = 0 if self._flagged else len(moderation_buffer) - len(self._get_window(moderation_buffer))
+        self._checked_length = len(moderation_buffer)
+
+        result = self.moderation(
+            tenant_id=self.tenant_id, app_id=self.app_id, moderation_buffer=moderation_buffer[window_start:]
         )
 
-        thread.start()
-
-        return thread
-
-    def stop_thread(self):
-        if self.thread and self.thread.is_alive():
-            self.thread_running = False
-
-    def worker(self, flask_app: Flask, buffer_size: int):
-        with flask_app.app_context():
-            current_length = 0
-            while self.thread_running:
-                moderation_buffer = self.buffer
-                buffer_length = len(moderation_buffer)
-                if not self.is_final_chunk:
-                    chunk_length = buffer_length - current_length
-                    if 0 <= chunk_length < buffer_size:
-                        time.sleep(1)
-                        continue
-
-                current_length = buffer_length
-
-                result = self.moderation(
-                    tenant_id=self.tenant_id, app_id=self.app_id, moderation_buffer=moderation_buffer
-                )
-
-                if not result or not result.flagged:
-                    continue
-
-                if result.action == ModerationAction.DIRECT_OUTPUT:
-                    final_output = result.preset_response
-                    self.final_output = final_output
-                else:
-                    final_output = result.text + self.buffer[len(moderation_buffer) :]
-
-                # trigger replace event
-                if self.thread_running:
-                    self.queue_manager.publish(
-                        QueueMessageReplaceEvent(
-                            text=final_output, reason=QueueMessageReplaceEvent.MessageReplaceReason.OUTPUT_MODERATION
-                        ),
-                        PublishFrom.TASK_PIPELINE,
-                    )
-
-                if result.action == ModerationAction.DIRECT_OUTPUT:
-                    break
+        if not result or not result.flagged:
+            return
+
+        self._flagged = True
+        if result.action == ModerationAction.DIRECT_OUTPUT:
+            final_output = result.preset_response
+            self.final_output = final_output
+        else:
+            final_output = moderation_buffer[:window_start] + result.text + self.buffer[len(moderation_buffer) :]
+
+        # trigger replace event
+        if self.running:
+            self.queue_manager.publish(
+                QueueMessageReplaceEvent(
+                    text=final_output, reason=QueueMessageReplaceEvent.MessageReplaceReason.OUTPUT_MODERATION
+                ),
+                PublishFrom.TASK_PIPELINE,
+            )
+
+        if result.action == ModerationAction.DIRECT_OUTPUT:
+            self.stop_moderation()
+
+    def _get_window(self, text: str) -> str:
+        """
+        Get the text after the moderated prefix, with an overlap to catch content across windows
+        """
+        return text[max(0, self._checked_length - dify_config.MODERATION_WINDOW_OVERLAP) :]
 
     def moderation(self, tenant_id: str, app_id: str, moderation_buffer: str) -> Optional[ModerationOutputsResult]:
+        cache_key = (
+            tenant_id,
+            app_id,
+            self.rule.type,
+            json.dumps(self.rule.config, sort_keys=True, default=str),
+            hashlib.sha256(moderation_buffer.encode("utf-8")).hexdigest(),
+        )
+        with _verdict_cache_lock:
+            cached: Optional[ModerationOutputsResult] = _verdict_cache.get(cache_key)
+        if cached is not None:
+            _record_check(None, cached=True)
+            return cached
+
         try:
             moderation_factory = ModerationFactory(
                 name=self.rule.type, app_id=app_id, tenant_id=tenant_id, config=self.rule.config
             )
 
+            start_at = time.perf_counter()
             result: ModerationOutputsResult = moderation_factory.moderation_for_outputs(moderation_buffer)
-            return result
+            _record_check(time.perf_counter() - start_at, cached=False)
         except Exception as e:
             logger.exception(f"Moderation Output error, app_id: {app_id}")
+            return None
 
-        return None
+        with _verdict_cache_lock:
+            _verdict_cache[cache_key] = result
+        return result
@@ -111,4 +111,5 @@ class WeaveConfig(BaseTracingConfig):
 
 
 OPS_FILE_PATH = "ops_trace/"
+OPS_BATCH_DIR = "batches/"
 OPS_TRACE_FAILED_KEY = "FAILED_OPS_TRACE"
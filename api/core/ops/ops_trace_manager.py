@@ -14,7 +14,9 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from core.helper.encrypter import decrypt_token, encrypt_token, obfuscated_token
+from core.helper.versioned_cache import VersionedLocalCache
 from core.ops.entities.config_entity import (
+    OPS_BATCH_DIR,
     OPS_FILE_PATH,
     LangfuseConfig,
     LangSmithConfig,
@@ -79,6 +81,8 @@ provider_config_map: dict[str, dict[str, Any]] = {
 
 class OpsTraceManager:
     ops_trace_instances_cache: LRUCache = LRUCache(maxsize=128)
+    # app_id -> tracing instance or None, dropped when the tracing config of the app changes
+    app_ops_trace_instances_cache = VersionedLocalCache("ops_trace_config_version:app_id", maxsize=1024, ttl=60)
 
     @classmethod
     def encrypt_tracing_config(
@@ -208,6 +212,10 @@ class OpsTraceManager:
         if app_id is None:
             return None
 
+        return cls.app_ops_trace_instances_cache.get_or_load(app_id, lambda: cls._get_ops_trace_instance(app_id))
+
+    @classmethod
+    def _get_ops_trace_instance(cls, app_id: str):
         app: Optional[App] = db.session.query(App).filter(App.id == app_id).first()
 
         if app is None:
@@ -241,6 +249,15 @@ class OpsTraceManager:
             logging.info(f"new tracing_instance for app_id: {app_id}")
         return tracing_instance
 
+    @classmethod
+    def invalidate_app_tracing_config(cls, app_id: str):
+        """
+        Drop cached tracing instance of the app in all processes
+        :param app_id: app id
+        :return:
+        """
+        cls.app_ops_trace_instances_cache.invalidate(app_id)
+
     @classmethod
     def get_app_config_through_message_id(cls, message_id: str):
         app_model_config = None
@@ -286,6 +303,7 @@ class OpsTraceManager:
             }
         )
         db.session.commit()
+        cls.invalidate_app_tracing_config(app_id)
 
     @classmethod
     def get_app_tracing_config(cls, app_id: str):
@@ -760,9 +778,12 @@ class TraceTask:
 
 
 trace_manager_timer: Optional[threading.Timer] = None
-trace_manager_queue: queue.Queue = queue.Queue()
 trace_manager_interval = int(os.getenv("TRACE_QUEUE_MANAGER_INTERVAL", 5))
 trace_manager_batch_size = int(os.getenv("TRACE_QUEUE_MANAGER_BATCH_SIZE", 100))
+trace_manager_max_queue_size = int(os.getenv("TRACE_QUEUE_MANAGER_MAX_QUEUE_SIZE", 10000))
+trace_manager_queue: queue.Queue = queue.Queue(maxsize=trace_manager_max_queue_size)
+# number of trace tasks dropped because the queue was full
+trace_manager_dropped_count = 0
 
 
 class TraceQueueManager:
@@ -777,11 +798,19 @@ class TraceQueueManager:
             self.start_timer()
 
     def add_trace_task(self, trace_task: TraceTask):
-        global trace_manager_timer, trace_manager_queue
+        global trace_manager_timer, trace_manager_queue, trace_manager_dropped_count
         try:
             if self.trace_instance:
                 trace_task.app_id = self.app_id
-                trace_manager_queue.put(trace_task)
+                trace_manager_queue.put_nowait(trace_task)
+        except queue.Full:
+            # drop the trace instead of blocking the request when the exporter falls behind
+            trace_manager_dropped_count += 1
+            if trace_manager_dropped_count % trace_manager_batch_size == 1:
+                logging.warning(
+                    f"Trace queue is full, {trace_manager_dropped_count} trace tasks dropped so far, "
+                    f"trace_type {trace_task.trace_type}"
+                )
         except Exception as e:
             logging.exception(f"Error adding trace task, trace_type {trace_task.trace_type}")
         finally:
@@ -798,8 +827,8 @@ class TraceQueueManager:
 
     def run(self):
         try:
-            tasks = self.collect_tasks()
-            if tasks:
+            # drain the queue, every batch is exported as one storage object and one celery task
+            while tasks := self.collect_tasks():
                 self.send_to_celery(tasks)
         except Exception as e:
             logging.exception("Error processing trace tasks")
@@ -814,20 +843,30 @@ class TraceQueueManager:
 
     def send_to_celery(self, tasks: list[TraceTask]):
         with self.flask_app.app_context():
+            lines: list[str] = []
             for task in tasks:
                 if task.app_id is None:
                     continue
-                file_id = uuid4().hex
-                trace_info = task.execute()
+                try:
+                    trace_info = task.execute()
+                except Exception:
+                    logging.exception(f"Error executing trace task, trace_type {task.trace_type}")
+                    continue
                 task_data = TaskData(
                     app_id=task.app_id,
                     trace_info_type=type(trace_info).__name__,
                     trace_info=trace_info.model_dump() if trace_info else None,
                 )
-                file_path = f"{OPS_FILE_PATH}{task.app_id}/{file_id}.json"
-                storage.save(file_path, task_data.model_dump_json().encode("utf-8"))
-                file_info = {
-                    "file_id": file_id,
-                    "app_id": task.app_id,
-                }
-                process_trace_tasks.delay(file_info)
+                lines.append(task_data.model_dump_json())
+
+            if not lines:
+                return
+
+            file_id = uuid4().hex
+            file_path = f"{OPS_FILE_PATH}{OPS_BATCH_DIR}{file_id}.jsonl"
+            storage.save(file_path, "\n".join(lines).encode("utf-8"))
+            file_info = {
+                "file_id": file_id,
+                "batch": True,
+            }
+            process_trace_tasks.delay(file_info)
@@ -20,7 +20,11 @@ from core.entities.provider_entities import (
     SystemConfiguration,
 )
 from core.helper import encrypter
-from core.helper.model_provider_cache import ProviderCredentialsCache, ProviderCredentialsCacheType
+from core.helper.model_provider_cache import (
+    ProviderConfigurationsCache,
+    ProviderCredentialsCache,
+    ProviderCredentialsCacheType,
+)
 from core.helper.position_helper import is_filtered
 from core.model_runtime.entities.model_entities import ModelType
 from core.model_runtime.entities.provider_entities import (
@@ -92,6 +96,25 @@ class ProviderManager:
         :param tenant_id:
         :return:
         """
+        # Read the version stamp before building, so that writes made meanwhile invalidate the snapshot
+        provider_configurations_cache = ProviderConfigurationsCache(tenant_id)
+        cache_version = provider_configurations_cache.get_version()
+
+        # Get all provider entities
+        model_provider_factory = ModelProviderFactory(tenant_id)
+        provider_entities = model_provider_factory.get_providers()
+        plugin_fingerprint = ",".join(
+            plugin_model_provider.plugin_unique_identifier
+            for plugin_model_provider in model_provider_factory.get_plugin_model_providers()
+        )
+
+        cached_provider_configurations = provider_configurations_cache.get(cache_version, plugin_fingerprint)
+        if cached_provider_configurations is not None:
+            provider_configurations = self._copy_configurations(cached_provider_configurations)
+            # a quota running out or being renewed changes the provider types in use, the snapshot is built again
+            if self._refresh_quota_configurations(tenant_id, provider_configurations):
+                return provider_configurations
+
         # Get all provider records of the workspace
         provider_name_to_provider_records_dict = self._get_all_providers(tenant_id)
 
@@ -118,10 +141,6 @@ class ProviderManager:
                     provider_name_to_provider_model_records_dict[provider_name]
                 )
 
-        # Get all provider entities
-        model_provider_factory = ModelProviderFactory(tenant_id)
-        provider_entities = model_provider_factory.get_providers()
-
         # Get All preferred provider types of the workspace
         provider_name_to_preferred_model_provider_records_dict = self._get_all_preferred_model_providers(tenant_id)
         # Ensure that both the original provider name and its ModelProviderID string representation
@@ -237,8 +256,78 @@ class ProviderManager:
 
             provider_configurations[str(provider_id_entity)] = provider_configuration
 
+        provider_configurations_cache.set(cache_version, plugin_fingerprint, provider_configurations)
+
         # Return the encapsulated object
-        return provider_configurations
+        return self._copy_configurations(provider_configurations)
+
+    @staticmethod
+    def _copy_configurations(provider_configurations: ProviderConfigurations) -> ProviderConfigurations:
+        """
+        Copy cached provider configurations, so that callers can not mutate the cached credentials and settings.
+        Provider entities are shared, they are not modified after the configurations are constructed.
+
+        :param provider_configurations: cached provider configurations
+        :return:
+        """
+        copied_provider_configurations = ProviderConfigurations(tenant_id=provider_configurations.tenant_id)
+        for provider_name, provider_configuration in provider_configurations.configurations.items():
+            copied_provider_configurations[provider_name] = provider_configuration.model_copy(
+                update={
+                    "system_configuration": provider_configuration.system_configuration.model_copy(deep=True),
+                    "custom_configuration": provider_configuration.custom_configuration.model_copy(deep=True),
+                    "model_settings": [
+                        model_setting.model_copy(deep=True) for model_setting in provider_configuration.model_settings
+                    ],
+                }
+            )
+
+        return copied_provider_configurations
+
+    @staticmethod
+    def _refresh_quota_configurations(tenant_id: str, provider_configurations: ProviderConfigurations) -> bool:
+        """
+        Update the usage of the hosted provider quotas of copied provider configurations.
+        The usage changes with every message, so it is not covered by the version stamp of the cached snapshot.
+
+        :param tenant_id: workspace id
+        :param provider_configurations: copied provider configurations
+        :return: False if a quota became valid or invalid since the configurations were built
+        """
+        quota_configurations: dict[tuple[str, ProviderQuotaType], QuotaConfiguration] = {}
+        for provider_name, provider_configuration in provider_configurations.configurations.items():
+            for quota_configuration in provider_configuration.system_configuration.quota_configurations:
+                quota_configurations[(provider_name, quota_configuration.quota_type)] = quota_configuration
+        if not quota_configurations:
+            return True
+
+        provider_records = (
+            db.session.query(Provider.provider_name, Provider.quota_type, Provider.quota_used, Provider.quota_limit)
+            .filter(
+                Provider.tenant_id == tenant_id,
+                Provider.provider_type == ProviderType.SYSTEM.value,
+                Provider.is_valid == True,
+            )
+            .all()
+        )
+        for provider_record in provider_records:
+            cached_quota_configuration = quota_configurations.get(
+                # TODO: Use provider name with prefix after the data migration
+                (
+                    str(ModelProviderID(provider_record.provider_name)),
+                    ProviderQuotaType.value_of(provider_record.quota_type),
+                )
+            )
+            if cached_quota_configuration is None:
+                continue
+
+            is_valid = provider_record.quota_limit > provider_record.quota_used or provider_record.quota_limit == -1
+            if is_valid != cached_quota_configuration.is_valid:
+                return False
+            cached_quota_configuration.quota_used = provider_record.quota_used
+            cached_quota_configuration.quota_limit = provider_record.quota_limit
+
+        return True
 
     def get_provider_model_bundle(self, tenant_id: str, provider: str, model_type: ModelType) -> ProviderModelBundle:
         """
@@ -32,9 +32,10 @@ class DataPostProcessor:
         score_threshold: Optional[float] = None,
         top_n: Optional[int] = None,
         user: Optional[str] = None,
+        query_vector: Optional[list[float]] = None,
     ) -> list[Document]:
         if self.rerank_runner:
-            documents = self.rerank_runner.run(query, documents, score_threshold, top_n, user)
+            documents = self.rerank_runner.run(query, documents, score_threshold, top_n, user, query_vector)
 
         if self.reorder_runner:
             documents = self.reorder_runner.run(documents)
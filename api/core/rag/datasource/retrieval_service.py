@@ -3,12 +3,16 @@ from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from flask import Flask, current_app
+from sqlalchemy import or_
 from sqlalchemy.orm import load_only
 
 from configs import dify_config
+from core.model_manager import ModelManager
+from core.model_runtime.entities.model_entities import ModelType
 from core.rag.data_post_processor.data_post_processor import DataPostProcessor
 from core.rag.datasource.keyword.keyword_factory import Keyword
 from core.rag.datasource.vdb.vector_factory import Vector
+from core.rag.embedding.cached_embedding import CacheEmbedding
 from core.rag.embedding.retrieval import RetrievalSegments
 from core.rag.index_processor.constant.index_type import IndexType
 from core.rag.models.document import Document
@@ -42,6 +46,7 @@ class RetrievalService:
         reranking_mode: str = "reranking_model",
         weights: Optional[dict] = None,
         document_ids_filter: Optional[list[str]] = None,
+        query_vector: Optional[list[float]] = None,
     ):
         if not query:
             return []
@@ -51,6 +56,7 @@ class RetrievalService:
 
         all_documents: list[Document] = []
         exceptions: list[str] = []
+        query_vectors: list[list[float]] = []
 
         # Optimize multithreading with thread pools
         with ThreadPoolExecutor(max_workers=dify_config.RETRIEVAL_SERVICE_EXECUTORS) as executor:  # type: ignore
@@ -82,6 +88,8 @@ class RetrievalService:
                         retrieval_method=retrieval_method,
                         exceptions=exceptions,
                         document_ids_filter=document_ids_filter,
+                        query_vectors=query_vectors,
+                        query_vector=query_vector,
                     )
                 )
             if RetrievalMethod.is_support_fulltext_search(retrieval_method):
@@ -114,6 +122,7 @@ class RetrievalService:
                 documents=all_documents,
                 score_threshold=score_threshold,
                 top_n=top_k,
+                query_vector=cls._get_rerank_query_vector(dataset, weights, query_vectors),
             )
 
         return all_documents
@@ -128,6 +137,38 @@ class RetrievalService:
         )
         return all_documents
 
+    @classmethod
+    def embed_query(cls, dataset: Dataset, query: str) -> list[float]:
+        """
+        Embed the query with the embedding model of the dataset, to share it between the searches of datasets
+        with the same embedding model
+        """
+        model_manager = ModelManager()
+        embedding_model = model_manager.get_model_instance(
+            tenant_id=dataset.tenant_id,
+            provider=dataset.embedding_model_provider,
+            model_type=ModelType.TEXT_EMBEDDING,
+            model=dataset.embedding_model,
+        )
+        return CacheEmbedding(embedding_model).embed_query(query)
+
+    @staticmethod
+    def _get_rerank_query_vector(
+        dataset: Dataset, weights: Optional[dict], query_vectors: list[list[float]]
+    ) -> Optional[list[float]]:
+        """
+        Get the query embedding of the vector search, if the weighted rerank uses the same embedding model
+        """
+        if not query_vectors or not weights:
+            return None
+        vector_setting = weights.get("vector_setting") or {}
+        if (
+            vector_setting.get("embedding_provider_name") != dataset.embedding_model_provider
+            or vector_setting.get("embedding_model_name") != dataset.embedding_model
+        ):
+            return None
+        return query_vectors[0]
+
     @classmethod
     def _get_dataset(cls, dataset_id: str) -> Optional[Dataset]:
         return db.session.query(Dataset).filter(Dataset.id == dataset_id).first()
@@ -171,6 +212,8 @@ class RetrievalService:
         retrieval_method: str,
         exceptions: list,
         document_ids_filter: Optional[list[str]] = None,
+        query_vectors: Optional[list] = None,
+        query_vector: Optional[list[float]] = None,
     ):
         with flask_app.app_context():
             try:
@@ -179,8 +222,14 @@ class RetrievalService:
                     raise ValueError("dataset not found")
 
                 vector = Vector(dataset=dataset)
+                if query_vector is None:
+                    query_vector = vector.embed_query(query)
+                if query_vectors is not None:
+                    # the query embedding is reused by the weighted rerank
+                    query_vectors.append(query_vector)
                 documents = vector.search_by_vector(
                     query,
+                    query_vector=query_vector,
                     search_type="similarity_score_threshold",
                     top_k=top_k,
                     score_threshold=score_threshold,
@@ -284,6 +333,50 @@ class RetrievalService:
                 .all()
             }
 
+            # Batch query the child chunks of the parent-child documents
+            child_index_node_ids = set()
+            index_node_ids = set()
+            for document in documents:
+                dataset_document = dataset_documents.get(document.metadata.get("document_id"))
+                if not dataset_document or not document.metadata.get("doc_id"):
+                    continue
+                if dataset_document.doc_form == IndexType.PARENT_CHILD_INDEX:
+                    child_index_node_ids.add(document.metadata["doc_id"])
+                else:
+                    index_node_ids.add(document.metadata["doc_id"])
+
+            child_chunks: dict[str, ChildChunk] = {}
+            if child_index_node_ids:
+                for chunk in (
+                    db.session.query(ChildChunk).filter(ChildChunk.index_node_id.in_(child_index_node_ids)).all()
+                ):
+                    child_chunks.setdefault(chunk.index_node_id, chunk)
+
+            # Batch query the segments of the child chunks and of the normal documents
+            segment_conditions = []
+            if child_chunks:
+                segment_conditions.append(
+                    DocumentSegment.id.in_({child_chunk.segment_id for child_chunk in child_chunks.values()})
+                )
+            if index_node_ids:
+                segment_conditions.append(DocumentSegment.index_node_id.in_(index_node_ids))
+
+            segments_by_id: dict[str, DocumentSegment] = {}
+            segments_by_index_node_id: dict[tuple[str, str], DocumentSegment] = {}
+            if segment_conditions:
+                for row in (
+                    db.session.query(DocumentSegment)
+                    .filter(
+                        DocumentSegment.dataset_id.in_({doc.dataset_id for doc in dataset_documents.values()}),
+                        DocumentSegment.enabled == True,
+                        DocumentSegment.status == "completed",
+                        or_(*segment_conditions),
+                    )
+                    .all()
+                ):
+                    segments_by_id[row.id] = row
+                    segments_by_index_node_id.setdefault((row.dataset_id, row.index_node_id), row)
+
             records = []
             include_segment_ids = set()
             segment_child_map = {}
@@ -300,44 +393,22 @@ class RetrievalService:
 
                 if dataset_document.doc_form == IndexType.PARENT_CHILD_INDEX:
                     # Handle parent-child documents
-                    child_index_node_id = document.metadata.get("doc_id")
-
-                    child_chunk = (
-                        db.session.query(ChildChunk).filter(ChildChunk.index_node_id == child_index_node_id).first()
-                    )
-
+                    child_chunk = child_chunks.get(document.metadata.get("doc_id", ""))
                     if not child_chunk:
                         continue
 
-                    segment = (
-                        db.session.query(DocumentSegment)
-                        .filter(
-                            DocumentSegment.dataset_id == dataset_document.dataset_id,
-                            DocumentSegment.enabled == True,
-                            DocumentSegment.status == "completed",
-                            DocumentSegment.id == child_chunk.segment_id,
-                        )
-                        .options(
-                            load_only(
-                                DocumentSegment.id,
-                                DocumentSegment.content,
-                                DocumentSegment.answer,
-                            )
-                        )
-                        .first()
-                    )
-
-                    if not segment:
+                    segment = segments_by_id.get(child_chunk.segment_id)
+                    if not segment or segment.dataset_id != dataset_document.dataset_id:
                         continue
 
+                    child_chunk_detail = {
+                        "id": child_chunk.id,
+                        "content": child_chunk.content,
+                        "position": child_chunk.position,
+                        "score": document.metadata.get("score", 0.0),
+                    }
                     if segment.id not in include_segment_ids:
                         include_segment_ids.add(segment.id)
-                        child_chunk_detail = {
-                            "id": child_chunk.id,
-                            "content": child_chunk.content,
-                            "position": child_chunk.position,
-                            "score": document.metadata.get("score", 0.0),
-                        }
                         map_detail = {
                             "max_score": document.metadata.get("score", 0.0),
                             "child_chunks": [child_chunk_detail],
@@ -348,12 +419,6 @@ class RetrievalService:
                         }
                         records.append(record)
                     else:
-                        child_chunk_detail = {
-                            "id": child_chunk.id,
-                            "content": child_chunk.content,
-                            "position": child_chunk.position,
-                            "score": document.metadata.get("score", 0.0),
-                        }
                         segment_child_map[segment.id]["child_chunks"].append(child_chunk_detail)
                         segment_child_map[segment.id]["max_score"] = max(
                             segment_child_map[segment.id]["max_score"], document.metadata.get("score", 0.0)
@@ -364,17 +429,7 @@ class RetrievalService:
                     if not index_node_id:
                         continue
 
-                    segment = (
-                        db.session.query(DocumentSegment)
-                        .filter(
-                            DocumentSegment.dataset_id == dataset_document.dataset_id,
-                            DocumentSegment.enabled == True,
-                            DocumentSegment.status == "completed",
-                            DocumentSegment.index_node_id == index_node_id,
-                        )
-                        .first()
-                    )
-
+                    segment = segments_by_index_node_id.get((dataset_document.dataset_id, index_node_id))
                     if not segment:
                         continue
 
@@ -6,6 +6,7 @@ from urllib.parse import unquote
 
 from configs import dify_config
 from core.helper import ssrf_proxy
+from core.rag.extractor import extraction_cache
 from core.rag.extractor.csv_extractor import CSVExtractor
 from core.rag.extractor.entity.datasource_type import DatasourceType
 from core.rag.extractor.entity.extract_setting import ExtractSetting
@@ -33,6 +34,10 @@ from extensions.ext_storage import storage
 from models.model import UploadFile
 
 SUPPORT_URL_CONTENT_TYPES = ["application/pdf", "text/plain", "application/json"]
+# the word extractor saves the images of the document as upload files and links them from its text,
+# its results are specific to the extracted upload file
+UNCACHED_FILE_EXTENSIONS = {".docx"}
+
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124"
     " Safari/537.36"
@@ -93,116 +98,139 @@ class ExtractProcessor:
         cls, extract_setting: ExtractSetting, is_automatic: bool = False, file_path: Optional[str] = None
     ) -> list[Document]:
         if extract_setting.datasource_type == DatasourceType.FILE.value:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                if not file_path:
-                    assert extract_setting.upload_file is not None, "upload_file is required"
-                    upload_file: UploadFile = extract_setting.upload_file
-                    suffix = Path(upload_file.key).suffix
-                    # FIXME mypy: Cannot determine type of 'tempfile._get_candidate_names' better not use it here
-                    file_path = f"{temp_dir}/{next(tempfile._get_candidate_names())}{suffix}"  # type: ignore
-                    storage.download(upload_file.key, file_path)
-                input_file = Path(file_path)
-                file_extension = input_file.suffix.lower()
-                etl_type = dify_config.ETL_TYPE
-                extractor: Optional[BaseExtractor] = None
-                if etl_type == "Unstructured":
-                    unstructured_api_url = dify_config.UNSTRUCTURED_API_URL or ""
-                    unstructured_api_key = dify_config.UNSTRUCTURED_API_KEY or ""
-
-                    if file_extension in {".xlsx", ".xls"}:
-                        extractor = ExcelExtractor(file_path)
-                    elif file_extension == ".pdf":
-                        extractor = PdfExtractor(file_path)
-                    elif file_extension in {".md", ".markdown", ".mdx"}:
-                        extractor = (
-                            UnstructuredMarkdownExtractor(file_path, unstructured_api_url, unstructured_api_key)
-                            if is_automatic
-                            else MarkdownExtractor(file_path, autodetect_encoding=True)
-                        )
-                    elif file_extension in {".htm", ".html"}:
-                        extractor = HtmlExtractor(file_path)
-                    elif file_extension == ".docx":
-                        extractor = WordExtractor(file_path, upload_file.tenant_id, upload_file.created_by)
-                    elif file_extension == ".doc":
-                        extractor = UnstructuredWordExtractor(file_path, unstructured_api_url, unstructured_api_key)
-                    elif file_extension == ".csv":
-                        extractor = CSVExtractor(file_path, autodetect_encoding=True)
-                    elif file_extension == ".msg":
-                        extractor = UnstructuredMsgExtractor(file_path, unstructured_api_url, unstructured_api_key)
-                    elif file_extension == ".eml":
-                        extractor = UnstructuredEmailExtractor(file_path, unstructured_api_url, unstructured_api_key)
-                    elif file_extension == ".ppt":
-                        extractor = UnstructuredPPTExtractor(file_path, unstructured_api_url, unstructured_api_key)
-                        # You must first specify the API key
-                        # because unstructured_api_key is necessary to parse .ppt documents
-                    elif file_extension == ".pptx":
-                        extractor = UnstructuredPPTXExtractor(file_path, unstructured_api_url, unstructured_api_key)
-                    elif file_extension == ".xml":
-                        extractor = UnstructuredXmlExtractor(file_path, unstructured_api_url, unstructured_api_key)
-                    elif file_extension == ".epub":
-                        extractor = UnstructuredEpubExtractor(file_path, unstructured_api_url, unstructured_api_key)
-                    else:
-                        # txt
-                        extractor = TextExtractor(file_path, autodetect_encoding=True)
-                else:
-                    if file_extension in {".xlsx", ".xls"}:
-                        extractor = ExcelExtractor(file_path)
-                    elif file_extension == ".pdf":
-                        extractor = PdfExtractor(file_path)
-                    elif file_extension in {".md", ".markdown", ".mdx"}:
-                        extractor = MarkdownExtractor(file_path, autodetect_encoding=True)
-                    elif file_extension in {".htm", ".html"}:
-                        extractor = HtmlExtractor(file_path)
-                    elif file_extension == ".docx":
-                        extractor = WordExtractor(file_path, upload_file.tenant_id, upload_file.created_by)
-                    elif file_extension == ".csv":
-                        extractor = CSVExtractor(file_path, autodetect_encoding=True)
-                    elif file_extension == ".epub":
-                        extractor = UnstructuredEpubExtractor(file_path)
-                    else:
-                        # txt
-                        extractor = TextExtractor(file_path, autodetect_encoding=True)
-                return extractor.extract()
+            upload_file = extract_setting.upload_file
+            if (
+                not file_path
+                and upload_file is not None
+                and upload_file.hash
+                and Path(upload_file.key).suffix.lower()
+                not in UNCACHED_FILE_EXTENSIONS | extraction_cache.TRIVIAL_FILE_TYPES
+            ):
+                extractor_key = ":".join(
+                    [
+                        dify_config.ETL_TYPE,
+                        Path(upload_file.key).suffix.lower(),
+                        "automatic" if is_automatic else "custom",
+                    ]
+                )
+                return extraction_cache.get_or_extract(
+                    upload_file.tenant_id,
+                    upload_file.hash,
+                    extractor_key,
+                    lambda: cls._extract_file(extract_setting, is_automatic),
+                )
+            return cls._extract_file(extract_setting, is_automatic, file_path)
         elif extract_setting.datasource_type == DatasourceType.NOTION.value:
             assert extract_setting.notion_info is not None, "notion_info is required"
-            extractor = NotionExtractor(
+            return NotionExtractor(
                 notion_workspace_id=extract_setting.notion_info.notion_workspace_id,
                 notion_obj_id=extract_setting.notion_info.notion_obj_id,
                 notion_page_type=extract_setting.notion_info.notion_page_type,
                 document_model=extract_setting.notion_info.document,
                 tenant_id=extract_setting.notion_info.tenant_id,
-            )
-            return extractor.extract()
+            ).extract()
         elif extract_setting.datasource_type == DatasourceType.WEBSITE.value:
             assert extract_setting.website_info is not None, "website_info is required"
             if extract_setting.website_info.provider == "firecrawl":
-                extractor = FirecrawlWebExtractor(
+                return FirecrawlWebExtractor(
                     url=extract_setting.website_info.url,
                     job_id=extract_setting.website_info.job_id,
                     tenant_id=extract_setting.website_info.tenant_id,
                     mode=extract_setting.website_info.mode,
                     only_main_content=extract_setting.website_info.only_main_content,
-                )
-                return extractor.extract()
+                ).extract()
             elif extract_setting.website_info.provider == "watercrawl":
-                extractor = WaterCrawlWebExtractor(
+                return WaterCrawlWebExtractor(
                     url=extract_setting.website_info.url,
                     job_id=extract_setting.website_info.job_id,
                     tenant_id=extract_setting.website_info.tenant_id,
                     mode=extract_setting.website_info.mode,
                     only_main_content=extract_setting.website_info.only_main_content,
-                )
-                return extractor.extract()
+                ).extract()
             elif extract_setting.website_info.provider == "jinareader":
-                extractor = JinaReaderWebExtractor(
+                return JinaReaderWebExtractor(
                     url=extract_setting.website_info.url,
                     job_id=extract_setting.website_info.job_id,
                     tenant_id=extract_setting.website_info.tenant_id,
                     mode=extract_setting.website_info.mode,
                     only_main_content=extract_setting.website_info.only_main_content,
-                )
-                return extractor.extract()
+                ).extract()
             else:
                 raise ValueError(f"Unsupported website provider: {extract_setting.website_info.provider}")
         else:
             raise ValueError(f"Unsupported datasource type: {extract_setting.datasource_type}")
+
+    @classmethod
+    def _extract_file(
+        cls, extract_setting: ExtractSetting, is_automatic: bool = False, file_path: Optional[str] = None
+    ) -> list[Document]:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            if not file_path:
+                assert extract_setting.upload_file is not None, "upload_file is required"
+                upload_file: UploadFile = extract_setting.upload_file
+                suffix = Path(upload_file.key).suffix
+                # FIXME mypy: Cannot determine type of 'tempfile._get_candidate_names' better not use it here
+                file_path = f"{temp_dir}/{next(tempfile._get_candidate_names())}{suffix}"  # type: ignore
+                storage.download(upload_file.key, file_path)
+            input_file = Path(file_path)
+            file_extension = input_file.suffix.lower()
+            etl_type = dify_config.ETL_TYPE
+            extractor: Optional[BaseExtractor] = None
+            if etl_type == "Unstructured":
+                unstructured_api_url = dify_config.UNSTRUCTURED_API_URL or ""
+                unstructured_api_key = dify_config.UNSTRUCTURED_API_KEY or ""
+
+                if file_extension in {".xlsx", ".xls"}:
+                    extractor = ExcelExtractor(file_path)
+                elif file_extension == ".pdf":
+                    extractor = PdfExtractor(file_path)
+                elif file_extension in {".md", ".markdown", ".mdx"}:
+                    extractor = (
+                        UnstructuredMarkdownExtractor(file_path, unstructured_api_url, unstructured_api_key)
+                        if is_automatic
+                        else MarkdownExtractor(file_path, autodetect_encoding=True)
+                    )
+                elif file_extension in {".htm", ".html"}:
+                    extractor = HtmlExtractor(file_path)
+                elif file_extension == ".docx":
+                    extractor = WordExtractor(file_path, upload_file.tenant_id, upload_file.created_by)
+                elif file_extension == ".doc":
+                    extractor = UnstructuredWordExtractor(file_path, unstructured_api_url, unstructured_api_key)
+                elif file_extension == ".csv":
+                    extractor = CSVExtractor(file_path, autodetect_encoding=True)
+                elif file_extension == ".msg":
+                    extractor = UnstructuredMsgExtractor(file_path, unstructured_api_url, unstructured_api_key)
+                elif file_extension == ".eml":
+                    extractor = UnstructuredEmailExtractor(file_path, unstructured_api_url, unstructured_api_key)
+                elif file_extension == ".ppt":
+                    extractor = UnstructuredPPTExtractor(file_path, unstructured_api_url, unstructured_api_key)
+                    # You must first specify the API key
+                    # because unstructured_api_key is necessary to parse .ppt documents
+                elif file_extension == ".pptx":
+                    extractor = UnstructuredPPTXExtractor(file_path, unstructured_api_url, unstructured_api_key)
+                elif file_extension == ".xml":
+                    extractor = UnstructuredXmlExtractor(file_path, unstructured_api_url, unstructured_api_key)
+                elif file_extension == ".epub":
+                    extractor = UnstructuredEpubExtractor(file_path, unstructured_api_url, unstructured_api_key)
+                else:
+                    # txt
+                    extractor = TextExtractor(file_path, autodetect_encoding=True)
+            else:
+                if file_extension in {".xlsx", ".xls"}:
+                    extractor = ExcelExtractor(file_path)
+                elif file_extension == ".pdf":
+                    extractor = PdfExtractor(file_path)
+                elif file_extension in {".md", ".markdown", ".mdx"}:
+                    extractor = MarkdownExtractor(file_path, autodetect_encoding=True)
+                elif file_extension in {".htm", ".html"}:
+                    extractor = HtmlExtractor(file_path)
+                elif file_extension == ".docx":
+                    extractor = WordExtractor(file_path, upload_file.tenant_id, upload_file.created_by)
+                elif file_extension == ".csv":
+                    extractor = CSVExtractor(file_path, autodetect_encoding=True)
+                elif file_extension == ".epub":
+                    extractor = UnstructuredEpubExtractor(file_path)
+                else:
+                    # txt
+                    extractor = TextExtractor(file_path, autodetect_encoding=True)
+            return extractor.extract()
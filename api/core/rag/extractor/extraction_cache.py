@@ -0,0 +1,207 @@
+import hashlib
+import json
+import logging
+from collections.abc import Callable, Iterable, Sequence
+from datetime import UTC, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from configs import dify_config
+from core.rag.models.document import Document
+from extensions.ext_database import db
+from extensions.ext_storage import storage
+from models.model import ExtractionCache
+
+logger = logging.getLogger(__name__)
+
+# bump when extractors change their output, results of previous versions are then extracted again
+_EXTRACTION_CACHE_VERSION = 1
+
+# the last use of a result is only recorded again after this delay, so hits do not all write to the database
+_LAST_USED_AT_UPDATE_INTERVAL = timedelta(hours=1)
+
+# plain text formats by file extension or MIME type, extracting them again costs less than keeping their results
+TRIVIAL_FILE_TYPES = frozenset(
+    {
+        ".txt",
+        ".markdown",
+        ".md",
+        ".mdx",
+        ".html",
+        ".htm",
+        ".xml",
+        ".json",
+        ".yaml",
+        ".yml",
+        ".csv",
+        ".vtt",
+        ".properties",
+        "text/plain",
+        "text/html",
+        "text/htm",
+        "text/markdown",
+        "text/xml",
+        "text/csv",
+        "application/json",
+        "application/x-yaml",
+        "text/yaml",
+        "text/vtt",
+        "text/properties",
+    }
+)
+
+
+def get_or_extract(
+    tenant_id: str, content_hash: str, extractor: str, extract: Callable[[], list[Document]]
+) -> list[Document]:
+    """
+    Get the documents extracted from a content, or extract them and keep them for the next extraction.
+    Results unused for EXTRACTION_CACHE_RETENTION_DAYS, and the least recently used ones of a tenant beyond
+    EXTRACTION_CACHE_MAX_SIZE_PER_TENANT, are deleted whenever a result of the tenant is saved.
+
+    :param tenant_id: tenant id, extraction results are not shared between tenants
+    :param content_hash: hash of the extracted content
+    :param extractor: how the content is extracted, e.g. ETL type and file extension
+    :param extract: extracts the documents on a miss
+    """
+    if not dify_config.EXTRACTION_CACHE_ENABLED:
+        return extract()
+
+    extractor = f"v{_EXTRACTION_CACHE_VERSION}:{extractor}"
+    documents = _load(tenant_id, content_hash, extractor)
+    if documents is not None:
+        return documents
+
+    documents = extract()
+    _save(tenant_id, content_hash, extractor, documents)
+    return documents
+
+
+def get_or_extract_text(tenant_id: str, content_hash: str, extractor: str, extract: Callable[[], str]) -> str:
+    """
+    Get the text extracted from a content, or extract it, see `get_or_extract`
+    """
+    documents = get_or_extract(tenant_id, content_hash, extractor, lambda: [Document(page_content=extract())])
+    return documents[0].page_content
+
+
+def _load(tenant_id: str, content_hash: str, extractor: str) -> Optional[list[Document]]:
+    storage_key = None
+    try:
+        with Session(db.engine) as session:
+            extraction_cache = session.execute(
+                select(ExtractionCache.id, ExtractionCache.storage_key, ExtractionCache.last_used_at).where(
+                    ExtractionCache.tenant_id == tenant_id,
+                    ExtractionCache.content_hash == content_hash,
+                    ExtractionCache.extractor == extractor,
+                )
+            ).first()
+            if extraction_cache is None:
+                return None
+            storage_key = extraction_cache.storage_key
+            now = datetime.now(UTC).replace(tzinfo=None)
+            if extraction_cache.last_used_at < now - _LAST_USED_AT_UPDATE_INTERVAL:
+                session.execute(
+                    update(ExtractionCache).where(ExtractionCache.id == extraction_cache.id).values(last_used_at=now)
+                )
+                session.commit()
+        data = json.loads(storage.load_once(storage_key))
+    except Exception:
+        logger.warning(f"Failed to load extraction result {storage_key}, extracting again", exc_info=True)
+        return None
+    return [Document(page_content=item["page_content"], metadata=item["metadata"]) for item in data]
+
+
+def _save(tenant_id: str, content_hash: str, extractor: str, documents: list[Document]):
+    extractor_hash = hashlib.sha256(extractor.encode()).hexdigest()
+    storage_key = f"extraction_caches/{tenant_id}/{content_hash}/{extractor_hash}.json"
+    try:
+        data = json.dumps(
+            [{"page_content": document.page_content, "metadata": document.metadata} for document in documents]
+        ).encode()
+        # the storage key only depends on the cache key, concurrent extractions write the same result
+        storage.save(storage_key, data)
+        with Session(db.engine) as session:
+            session.add(
+                ExtractionCache(
+                    tenant_id=tenant_id,
+                    content_hash=content_hash,
+                    extractor=extractor,
+                    storage_key=storage_key,
+                    size=len(data),
+                )
+            )
+            session.commit()
+    except IntegrityError:
+        return
+    except Exception:
+        logger.warning(f"Failed to save extraction result {storage_key}", exc_info=True)
+        return
+
+    try:
+        _evict(tenant_id)
+    except Exception:
+        logger.warning(f"Failed to evict extraction results of tenant {tenant_id}", exc_info=True)
+
+
+def _evict(tenant_id: str):
+    """
+    Delete the expired extraction results of the tenant, and the least recently used ones beyond its size limit
+    """
+    expired_before = datetime.now(UTC).replace(tzinfo=None) - timedelta(
+        days=dify_config.EXTRACTION_CACHE_RETENTION_DAYS
+    )
+    max_size = dify_config.EXTRACTION_CACHE_MAX_SIZE_PER_TENANT * 1024 * 1024
+    with Session(db.engine) as session:
+        _delete_entries(
+            session,
+            session.scalars(
+                select(ExtractionCache).where(
+                    ExtractionCache.tenant_id == tenant_id, ExtractionCache.last_used_at < expired_before
+                )
+            ),
+        )
+
+        size = session.scalar(select(func.sum(ExtractionCache.size)).where(ExtractionCache.tenant_id == tenant_id)) or 0
+        if size <= max_size:
+            return
+
+        evicted = []
+        for extraction_cache in session.scalars(
+            select(ExtractionCache)
+            .where(ExtractionCache.tenant_id == tenant_id)
+            .order_by(ExtractionCache.last_used_at)
+            .execution_options(yield_per=100)
+        ):
+            if size <= max_size:
+                break
+            evicted.append(extraction_cache)
+            size -= extraction_cache.size
+        _delete_entries(session, evicted)
+
+
+def delete(tenant_id: str, content_hashes: Optional[Sequence[str]] = None):
+    """
+    Delete the extraction results of contents of a tenant, or of all its contents if `content_hashes` is None
+    """
+    if content_hashes is not None and not content_hashes:
+        return
+
+    with Session(db.engine) as session:
+        statement = select(ExtractionCache).where(ExtractionCache.tenant_id == tenant_id)
+        if content_hashes is not None:
+            statement = statement.where(ExtractionCache.content_hash.in_(content_hashes))
+        _delete_entries(session, session.scalars(statement))
+
+
+def _delete_entries(session: Session, extraction_caches: Iterable[ExtractionCache]):
+    for extraction_cache in list(extraction_caches):
+        try:
+            storage.delete(extraction_cache.storage_key)
+        except Exception:
+            logger.exception(f"Failed to delete extraction result {extraction_cache.storage_key}")
+        session.delete(extraction_cache)
+    session.commit()
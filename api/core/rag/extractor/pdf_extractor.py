@@ -5,6 +5,7 @@ from typing import Optional, cast
 
 from core.rag.extractor.blob.blob import Blob
 from core.rag.extractor.extractor_base import BaseExtractor
+from core.rag.extractor.pdf_pages import iter_pdf_page_texts
 from core.rag.models.document import Document
 from extensions.ext_storage import storage
 
@@ -23,6 +24,11 @@ class PdfExtractor(BaseExtractor):
         self._file_cache_key = file_cache_key
 
     def extract(self) -> list[Document]:
+        """
+        Extract the pages of the file.
+        All pages are held in memory, as extraction results are cached and split as a whole,
+        `load` yields the pages as they are extracted.
+        """
         plaintext_file_exists = False
         if self._file_cache_key:
             try:
@@ -51,18 +57,8 @@ class PdfExtractor(BaseExtractor):
         yield from self.parse(blob)
 
     def parse(self, blob: Blob) -> Iterator[Document]:
-        """Lazily parse the blob."""
-        import pypdfium2  # type: ignore
-
-        with blob.as_bytes_io() as file_path:
-            pdf_reader = pypdfium2.PdfDocument(file_path, autoclose=True)
-            try:
-                for page_number, page in enumerate(pdf_reader):
-                    text_page = page.get_textpage()
-                    content = text_page.get_text_range()
-                    text_page.close()
-                    page.close()
-                    metadata = {"source": blob.source, "page": page_number}
-                    yield Document(page_content=content, metadata=metadata)
-            finally:
-                pdf_reader.close()
+        """Lazily parse the blob, pages are extracted in parallel if PDF_EXTRACTION_PROCESS_POOL_SIZE is set."""
+        source = str(blob.path) if blob.data is None and blob.path else blob.as_bytes()
+        for page_number, content in enumerate(iter_pdf_page_texts(source)):
+            metadata = {"source": blob.source, "page": page_number}
+            yield Document(page_content=content, metadata=metadata)
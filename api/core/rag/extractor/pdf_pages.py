@@ -0,0 +1,103 @@
+import logging
+import os
+import tempfile
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional, Union
+
+from configs import dify_config
+from core.helper.process_pool import LazyProcessPool
+
+logger = logging.getLogger(__name__)
+
+_executor = LazyProcessPool(lambda: dify_config.PDF_EXTRACTION_PROCESS_POOL_SIZE)
+
+# number of pages extracted by one task of the process pool
+_PAGES_PER_TASK = 32
+
+# documents with fewer pages are extracted inline, starting workers on them costs more than extracting them
+_POOL_MIN_PAGES = 2 * _PAGES_PER_TASK
+
+
+def get_executor() -> Optional[ProcessPoolExecutor]:
+    """
+    Get the PDF extraction process pool, None if PDF_EXTRACTION_PROCESS_POOL_SIZE is not set
+    """
+    return _executor.get()
+
+
+def iter_pdf_page_texts(source: Union[str, bytes]) -> Iterator[str]:
+    """
+    Extract the text of the pages of a PDF file path or content, in page order.
+
+    Large documents are split into page ranges extracted in parallel by the process pool,
+    pages are yielded as soon as the ranges up to them are done.
+    """
+    import pypdfium2  # type: ignore
+
+    executor = get_executor()
+    if executor is not None:
+        pdf = pypdfium2.PdfDocument(source)
+        try:
+            page_count = len(pdf)
+        finally:
+            pdf.close()
+        if page_count >= _POOL_MIN_PAGES:
+            yield from _iter_page_texts_in_pool(executor, source, page_count)
+            return
+
+    yield from _iter_page_texts(source)
+
+
+def _iter_page_texts(source: Union[str, bytes], start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+    """
+    Extract the text of the pages from `start` up to `stop`, or of all pages if `stop` is None
+    """
+    import pypdfium2  # type: ignore
+
+    pdf = pypdfium2.PdfDocument(source)
+    try:
+        pages = pdf if stop is None else (pdf[page_number] for page_number in range(start, stop))
+        for page in pages:
+            text_page = page.get_textpage()
+            text = text_page.get_text_range()
+            text_page.close()
+            page.close()
+            yield text
+    finally:
+        pdf.close()
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> list[str]:
+    return list(_iter_page_texts(file_path, start, stop))
+
+
+def _iter_page_texts_in_pool(
+    executor: ProcessPoolExecutor, source: Union[str, bytes], page_count: int
+) -> Iterator[str]:
+    temp_file_path = None
+    if isinstance(source, bytes):
+        # workers open the document by path, rather than receiving its whole content with every range
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
+            temp_file.write(source)
+        temp_file_path = source = temp_file.name
+
+    futures: list[Future[list[str]]] = [
+        executor.submit(_extract_page_range, source, start, min(start + _PAGES_PER_TASK, page_count))
+        for start in range(0, page_count, _PAGES_PER_TASK)
+    ]
+    try:
+        for future in futures:
+            yield from future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+        if temp_file_path is not None:
+            # wait for the running ranges before removing the file they read
+            for future in futures:
+                if not future.cancelled():
+                    future.exception()
+            try:
+                os.remove(temp_file_path)
+            except OSError:
+                logger.warning(f"Failed to remove temporary PDF file {temp_file_path}")
@@ -25,6 +25,7 @@ class WeightRerankRunner(BaseRerankRunner):
         score_threshold: Optional[float] = None,
         top_n: Optional[int] = None,
         user: Optional[str] = None,
+        query_vector: Optional[list[float]] = None,
     ) -> list[Document]:
         """
         Run rerank model
@@ -33,6 +34,7 @@ class WeightRerankRunner(BaseRerankRunner):
         :param score_threshold: score threshold
         :param top_n: top n
         :param user: unique user id if needed
+        :param query_vector: embedding of the query, if already computed during retrieval
 
         :return:
         """
@@ -46,7 +48,9 @@ class WeightRerankRunner(BaseRerankRunner):
         documents = unique_documents
 
         query_scores = self._calculate_keyword_score(query, documents)
-        query_vector_scores = self._calculate_cosine(self.tenant_id, query, documents, self.weights.vector_setting)
+        query_vector_scores = self._calculate_cosine(
+            self.tenant_id, query, documents, self.weights.vector_setting, query_vector
+        )
 
         rerank_documents = []
         for document, query_score, query_vector_score in zip(documents, query_scores, query_vector_scores):
@@ -141,45 +145,53 @@ class WeightRerankRunner(BaseRerankRunner):
         return similarities
 
     def _calculate_cosine(
-        self, tenant_id: str, query: str, documents: list[Document], vector_setting: VectorSetting
+        self,
+        tenant_id: str,
+        query: str,
+        documents: list[Document],
+        vector_setting: VectorSetting,
+        query_vector: Optional[list[float]] = None,
     ) -> list[float]:
         """
         Calculate Cosine scores
         :param query: search query
         :param documents: documents for reranking
+        :param query_vector: embedding of the query, if already computed during retrieval
 
         :return:
         """
-        query_vector_scores = []
-
-        model_manager = ModelManager()
-
-        embedding_model = model_manager.get_model_instance(
-            tenant_id=tenant_id,
-            provider=vector_setting.embedding_provider_name,
-            model_type=ModelType.TEXT_EMBEDDING,
-            model=vector_setting.embedding_model_name,
-        )
-        cache_embedding = CacheEmbedding(embedding_model)
-        query_vector = cache_embedding.embed_query(query)
-        for document in documents:
-            # calculate cosine similarity
+        query_vector_scores: list[float] = []
+        unscored_indexes = []
+        for index, document in enumerate(documents):
             if document.metadata and "score" in document.metadata:
                 query_vector_scores.append(document.metadata["score"])
             else:
-                # transform to NumPy
-                vec1 = np.array(query_vector)
-                vec2 = np.array(document.vector)
+                query_vector_scores.append(0.0)
+                unscored_indexes.append(index)
 
-                # calculate dot product
-                dot_product = np.dot(vec1, vec2)
+        # the scores of the vector search results are reused, the query is only embedded for the others
+        if not unscored_indexes:
+            return query_vector_scores
 
-                # calculate norm
-                norm_vec1 = np.linalg.norm(vec1)
-                norm_vec2 = np.linalg.norm(vec2)
+        if query_vector is None:
+            model_manager = ModelManager()
 
-                # calculate cosine similarity
-                cosine_sim = dot_product / (norm_vec1 * norm_vec2)
-                query_vector_scores.append(cosine_sim)
+            embedding_model = model_manager.get_model_instance(
+                tenant_id=tenant_id,
+                provider=vector_setting.embedding_provider_name,
+                model_type=ModelType.TEXT_EMBEDDING,
+                model=vector_setting.embedding_model_name,
+            )
+            cache_embedding = CacheEmbedding(embedding_model)
+            query_vector = cache_embedding.embed_query(query)
+
+        # calculate the cosine similarities of all documents at once
+        query_array = np.asarray(query_vector, dtype=np.float64)
+        document_array = np.asarray([documents[index].vector for index in unscored_indexes], dtype=np.float64)
+        cosine_sims = (document_array @ query_array) / (
+            np.linalg.norm(document_array, axis=1) * np.linalg.norm(query_array)
+        )
+        for index, cosine_sim in zip(unscored_indexes, cosine_sims):
+            query_vector_scores[index] = float(cosine_sim)
 
         return query_vector_scores
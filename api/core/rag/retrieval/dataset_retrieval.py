@@ -1,4 +1,5 @@
 import json
+import logging
 import math
 import re
 import threading
@@ -37,10 +38,10 @@ from core.rag.datasource.keyword.jieba.jieba_keyword_table_handler import JiebaK
 from core.rag.datasource.retrieval_service import RetrievalService
 from core.rag.entities.context_entities import DocumentContext
 from core.rag.entities.metadata_entities import Condition, MetadataCondition
-from core.rag.index_processor.constant.index_type import IndexType
 from core.rag.models.document import Document
 from core.rag.rerank.rerank_type import RerankMode
 from core.rag.retrieval.retrieval_methods import RetrievalMethod
+from core.rag.retrieval.retrieval_stats_buffer import RetrievalStatsBuffer
 from core.rag.retrieval.router.multi_dataset_function_call_router import FunctionCallMultiDatasetRouter
 from core.rag.retrieval.router.multi_dataset_react_route import ReactMultiDatasetRouter
 from core.rag.retrieval.template_prompts import (
@@ -55,7 +56,7 @@ from core.rag.retrieval.template_prompts import (
 from core.tools.utils.dataset_retriever.dataset_retriever_base_tool import DatasetRetrieverBaseTool
 from extensions.ext_database import db
 from libs.json_in_md_parser import parse_and_check_json_markdown
-from models.dataset import ChildChunk, Dataset, DatasetMetadata, DatasetQuery, DocumentSegment
+from models.dataset import Dataset, DatasetMetadata
 from models.dataset import Document as DatasetDocument
 from services.external_knowledge_service import ExternalDatasetService
 
@@ -67,6 +68,8 @@ default_retrieval_model: dict[str, Any] = {
     "score_threshold_enabled": False,
 }
 
+logger = logging.getLogger(__name__)
+
 
 class DatasetRetrieval:
     def __init__(self, application_generate_entity=None):
@@ -449,6 +452,9 @@ class DatasetRetrieval:
                     ].embedding_model_provider
                     weights["vector_setting"]["embedding_model_name"] = available_datasets[0].embedding_model
 
+        # the datasets with the same embedding model share one query embedding
+        query_vector = self._get_shared_query_vector(available_datasets, query)
+
         for dataset in available_datasets:
             index_type = dataset.indexing_technique
             document_ids_filter = None
@@ -471,6 +477,7 @@ class DatasetRetrieval:
                     "all_documents": all_documents,
                     "document_ids_filter": document_ids_filter,
                     "metadata_condition": metadata_condition,
+                    "query_vector": query_vector,
                 },
             )
             threads.append(retrieval_thread)
@@ -484,7 +491,11 @@ class DatasetRetrieval:
                 data_post_processor = DataPostProcessor(tenant_id, reranking_mode, reranking_model, weights, False)
 
                 all_documents = data_post_processor.invoke(
-                    query=query, documents=all_documents, score_threshold=score_threshold, top_n=top_k
+                    query=query,
+                    documents=all_documents,
+                    score_threshold=score_threshold,
+                    top_n=top_k,
+                    query_vector=query_vector,
                 )
             else:
                 if index_type == "economy":
@@ -499,43 +510,41 @@ class DatasetRetrieval:
 
         return all_documents
 
+    @staticmethod
+    def _get_shared_query_vector(available_datasets: list, query: str) -> Optional[list[float]]:
+        """
+        Embed the query once for the semantic searches of the datasets, if they all use the same embedding model
+        """
+        datasets = [dataset for dataset in available_datasets if dataset.provider != "external"]
+        if not datasets or any(dataset.indexing_technique != "high_quality" for dataset in datasets):
+            return None
+        if any(
+            dataset.embedding_model_provider != datasets[0].embedding_model_provider
+            or dataset.embedding_model != datasets[0].embedding_model
+            for dataset in datasets
+        ):
+            return None
+        if not any(
+            RetrievalMethod.is_support_semantic_search(
+                (dataset.retrieval_model or default_retrieval_model)["search_method"]
+            )
+            for dataset in datasets
+        ):
+            return None
+
+        try:
+            return RetrievalService.embed_query(datasets[0], query)
+        except Exception:
+            # each search embeds the query itself and reports its error
+            logger.exception("Failed to embed the query of the datasets")
+            return None
+
     def _on_retrieval_end(
         self, documents: list[Document], message_id: Optional[str] = None, timer: Optional[dict] = None
     ) -> None:
         """Handle retrieval end."""
         dify_documents = [document for document in documents if document.provider == "dify"]
-        for document in dify_documents:
-            if document.metadata is not None:
-                dataset_document = DatasetDocument.query.filter(
-                    DatasetDocument.id == document.metadata["document_id"]
-                ).first()
-                if dataset_document:
-                    if dataset_document.doc_form == IndexType.PARENT_CHILD_INDEX:
-                        child_chunk = ChildChunk.query.filter(
-                            ChildChunk.index_node_id == document.metadata["doc_id"],
-                            ChildChunk.dataset_id == dataset_document.dataset_id,
-                            ChildChunk.document_id == dataset_document.id,
-                        ).first()
-                        if child_chunk:
-                            segment = DocumentSegment.query.filter(DocumentSegment.id == child_chunk.segment_id).update(
-                                {DocumentSegment.hit_count: DocumentSegment.hit_count + 1}, synchronize_session=False
-                            )
-                            db.session.commit()
-                    else:
-                        query = db.session.query(DocumentSegment).filter(
-                            DocumentSegment.index_node_id == document.metadata["doc_id"]
-                        )
-
-                        # if 'dataset_id' in document.metadata:
-                        if "dataset_id" in document.metadata:
-                            query = query.filter(DocumentSegment.dataset_id == document.metadata["dataset_id"])
-
-                        # add hit count to document segment
-                        query.update(
-                            {DocumentSegment.hit_count: DocumentSegment.hit_count + 1}, synchronize_session=False
-                        )
-
-                    db.session.commit()
+        RetrievalStatsBuffer.add_segment_hits(dify_documents)
 
         # get tracing instance
         trace_manager: TraceQueueManager | None = (
@@ -552,22 +561,7 @@ class DatasetRetrieval:
         """
         Handle query.
         """
-        if not query:
-            return
-        dataset_queries = []
-        for dataset_id in dataset_ids:
-            dataset_query = DatasetQuery(
-                dataset_id=dataset_id,
-                content=query,
-                source="app",
-                source_app_id=app_id,
-                created_by_role=user_from,
-                created_by=user_id,
-            )
-            dataset_queries.append(dataset_query)
-        if dataset_queries:
-            db.session.add_all(dataset_queries)
-        db.session.commit()
+        RetrievalStatsBuffer.add_queries(query, dataset_ids, app_id, user_from, user_id)
 
     def _retriever(
         self,
@@ -578,6 +572,7 @@ class DatasetRetrieval:
         all_documents: list,
         document_ids_filter: Optional[list[str]] = None,
         metadata_condition: Optional[MetadataCondition] = None,
+        query_vector: Optional[list[float]] = None,
     ):
         with flask_app.app_context():
             dataset = db.session.query(Dataset).filter(Dataset.id == dataset_id).first()
@@ -637,6 +632,7 @@ class DatasetRetrieval:
                             reranking_mode=retrieval_model.get("reranking_mode") or "reranking_model",
                             weights=retrieval_model.get("weights", None),
                             document_ids_filter=document_ids_filter,
+                            query_vector=query_vector,
                         )
 
                         all_documents.extend(documents)
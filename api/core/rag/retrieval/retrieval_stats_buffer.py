@@ -0,0 +1,275 @@
+import json
+import logging
+from collections import defaultdict
+from collections.abc import Mapping, Sequence
+from datetime import UTC, datetime
+from typing import Optional
+
+from redis.exceptions import ResponseError
+from sqlalchemy import insert
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from configs import dify_config
+from core.rag.index_processor.constant.index_type import IndexType
+from core.rag.models.document import Document
+from extensions.ext_database import db
+from extensions.ext_redis import redis_client
+from models.dataset import ChildChunk, DatasetQuery, DocumentSegment
+from models.dataset import Document as DatasetDocument
+
+logger = logging.getLogger(__name__)
+
+
+class RetrievalStatsBuffer:
+    """
+    Segment hit counts and dataset queries of the app retrievals.
+
+    The retrievals only add to a redis hash of hit counts and a redis list of queries,
+    the periodic flush task writes them to the database in batches, so popular segments are not updated
+    by every request. With RETRIEVAL_STATS_BUFFER_ENABLED off, they are written at the end of each retrieval.
+
+    Buffered entries are only removed from redis once they are committed, entries of a failed or interrupted flush
+    are written by the next flush, a flush interrupted between a commit and the removal writes them twice.
+    Queries which fail to insert while the database is available are logged and dropped.
+    """
+
+    _SEGMENT_HITS_KEY = "retrieval_stats:segment_hits"
+    _PROCESSING_SEGMENT_HITS_KEY = "retrieval_stats:segment_hits:processing"
+    _QUERIES_KEY = "retrieval_stats:dataset_queries"
+    _FLUSH_LOCK_KEY = "retrieval_stats:flush_lock"
+    _FLUSH_LOCK_TIMEOUT = 3600
+
+    @classmethod
+    def add_segment_hits(cls, documents: Sequence[Document]) -> None:
+        """
+        Count a hit of the segments of the retrieved documents
+        :param documents: retrieved documents of the dify datasets
+        """
+        hits: dict[str, int] = defaultdict(int)
+        for document in documents:
+            metadata = document.metadata
+            if not metadata or not metadata.get("document_id") or not metadata.get("doc_id"):
+                continue
+            hits[f"{metadata.get('dataset_id') or ''}:{metadata['document_id']}:{metadata['doc_id']}"] += 1
+        if not hits:
+            return
+
+        if not dify_config.RETRIEVAL_STATS_BUFFER_ENABLED:
+            cls._apply_segment_hits(hits)
+            return
+
+        pipeline = redis_client.pipeline(transaction=False)
+        for field, count in hits.items():
+            pipeline.hincrby(cls._SEGMENT_HITS_KEY, field, count)
+        pipeline.execute()
+
+    @classmethod
+    def add_queries(
+        cls, query: str, dataset_ids: Sequence[str], app_id: str, created_by_role: str, created_by: str
+    ) -> None:
+        """
+        Log the query of the datasets
+        """
+        if not query or not dataset_ids:
+            return
+
+        created_at = datetime.now(UTC).replace(tzinfo=None)
+        rows = [
+            {
+                "dataset_id": dataset_id,
+                "content": query,
+                "source": "app",
+                "source_app_id": app_id,
+                "created_by_role": created_by_role,
+                "created_by": created_by,
+                "created_at": created_at,
+            }
+            for dataset_id in dataset_ids
+        ]
+
+        if not dify_config.RETRIEVAL_STATS_BUFFER_ENABLED:
+            cls._insert_queries(rows)
+            return
+
+        redis_client.rpush(
+            cls._QUERIES_KEY, *[json.dumps({**row, "created_at": created_at.isoformat()}) for row in rows]
+        )
+
+    @classmethod
+    def flush(cls) -> tuple[int, int]:
+        """
+        Write the buffered hit counts and queries to the database
+        :return: number of flushed segment hit entries and queries
+        """
+        # a concurrent flush would write the hits it is processing again
+        lock = redis_client.lock(cls._FLUSH_LOCK_KEY, timeout=cls._FLUSH_LOCK_TIMEOUT)
+        if not lock.acquire(blocking=False):
+            logger.info("Retrieval stats flush is already running, skipped")
+            return 0, 0
+
+        try:
+            try:
+                segment_hits = cls._flush_segment_hits()
+            except Exception:
+                db.session.rollback()
+                logger.exception("Failed to flush segment hits, they are kept for the next flush")
+                segment_hits = 0
+            return segment_hits, cls._flush_queries()
+        finally:
+            lock.release()
+
+    @classmethod
+    def _flush_segment_hits(cls) -> int:
+        # hits left by an interrupted flush go back to the buffer
+        cls._restore_processing_segment_hits()
+        # the hits are moved aside atomically, the retrievals during the flush go to a new hash
+        try:
+            redis_client.rename(cls._SEGMENT_HITS_KEY, cls._PROCESSING_SEGMENT_HITS_KEY)
+        except ResponseError:
+            # no hits since the last flush
+            return 0
+
+        hits = {
+            field.decode("utf-8"): int(count)
+            for field, count in redis_client.hgetall(cls._PROCESSING_SEGMENT_HITS_KEY).items()
+        }
+        items = list(hits.items())
+        batch_size = dify_config.RETRIEVAL_STATS_FLUSH_BATCH_SIZE
+        flushed = 0
+        try:
+            for i in range(0, len(items), batch_size):
+                batch = dict(items[i : i + batch_size])
+                cls._apply_segment_hits(batch)
+                redis_client.hdel(cls._PROCESSING_SEGMENT_HITS_KEY, *batch)
+                flushed += len(batch)
+        finally:
+            # the hits of the failed batches are added back to the hits of the next flush
+            cls._restore_processing_segment_hits()
+        return flushed
+
+    @classmethod
+    def _restore_processing_segment_hits(cls) -> None:
+        hits = redis_client.hgetall(cls._PROCESSING_SEGMENT_HITS_KEY)
+        if not hits:
+            return
+
+        pipeline = redis_client.pipeline(transaction=True)
+        for field, count in hits.items():
+            pipeline.hincrby(cls._SEGMENT_HITS_KEY, field, int(count))
+        pipeline.delete(cls._PROCESSING_SEGMENT_HITS_KEY)
+        pipeline.execute()
+
+    @classmethod
+    def _flush_queries(cls) -> int:
+        batch_size = dify_config.RETRIEVAL_STATS_FLUSH_BATCH_SIZE
+        flushed = 0
+        while True:
+            items = redis_client.lrange(cls._QUERIES_KEY, 0, batch_size - 1)
+            if not items:
+                return flushed
+
+            rows = []
+            for item in items:
+                try:
+                    row = json.loads(item)
+                    row["created_at"] = datetime.fromisoformat(row["created_at"])
+                except (ValueError, KeyError, TypeError):
+                    logger.exception("Dropped malformed buffered dataset query: %r", item)
+                    continue
+                rows.append(row)
+            if rows:
+                flushed += cls._insert_query_batch(rows)
+            # the retrievals only append queries, the flushed ones are still at the head of the list
+            redis_client.ltrim(cls._QUERIES_KEY, len(items), -1)
+
+    @classmethod
+    def _insert_query_batch(cls, rows: list[dict]) -> int:
+        """
+        Insert the queries, dropping the ones which fail to insert
+        :return: number of inserted queries
+        """
+        try:
+            cls._insert_queries(rows)
+            return len(rows)
+        except (OperationalError, InterfaceError):
+            # the database is unavailable, the queries are kept for the next flush
+            db.session.rollback()
+            raise
+        except Exception:
+            db.session.rollback()
+            if len(rows) == 1:
+                logger.exception(
+                    "Dropped buffered query of dataset %s which failed to insert", rows[0].get("dataset_id")
+                )
+                return 0
+
+        # a bad query fails its whole batch, the queries are inserted one by one to drop only the bad ones
+        return sum(cls._insert_query_batch([row]) for row in rows)
+
+    @staticmethod
+    def _insert_queries(rows: list[dict]) -> None:
+        db.session.execute(insert(DatasetQuery), rows)
+        db.session.commit()
+
+    @staticmethod
+    def _apply_segment_hits(hits: Mapping[str, int]) -> None:
+        """
+        Add the hit counts to the segments
+        :param hits: hit count by "dataset_id:document_id:doc_id", the dataset id may be empty
+        """
+        entries: list[tuple[Optional[str], str, str, int]] = []
+        for field, count in hits.items():
+            dataset, document_id, doc_id = field.split(":", 2)
+            entries.append((dataset or None, document_id, doc_id, count))
+
+        document_ids = {document_id for _, document_id, _, _ in entries}
+        doc_forms = dict(
+            db.session.query(DatasetDocument.id, DatasetDocument.doc_form)
+            .filter(DatasetDocument.id.in_(document_ids))
+            .all()
+        )
+
+        child_entries = [entry for entry in entries if doc_forms.get(entry[1]) == IndexType.PARENT_CHILD_INDEX]
+        segment_entries = [
+            entry for entry in entries if entry[1] in doc_forms and doc_forms[entry[1]] != IndexType.PARENT_CHILD_INDEX
+        ]
+
+        segment_hits: dict[str, int] = defaultdict(int)
+        if child_entries:
+            child_chunks = (
+                db.session.query(ChildChunk.index_node_id, ChildChunk.document_id, ChildChunk.segment_id)
+                .filter(
+                    ChildChunk.index_node_id.in_({doc_id for _, _, doc_id, _ in child_entries}),
+                    ChildChunk.document_id.in_({document_id for _, document_id, _, _ in child_entries}),
+                )
+                .all()
+            )
+            chunk_segment_ids = {(chunk.index_node_id, chunk.document_id): chunk.segment_id for chunk in child_chunks}
+            for _, document_id, doc_id, count in child_entries:
+                segment_id = chunk_segment_ids.get((doc_id, document_id))
+                if segment_id:
+                    segment_hits[segment_id] += count
+
+        if segment_entries:
+            segments = (
+                db.session.query(DocumentSegment.id, DocumentSegment.index_node_id, DocumentSegment.dataset_id)
+                .filter(DocumentSegment.index_node_id.in_({doc_id for _, _, doc_id, _ in segment_entries}))
+                .all()
+            )
+            segments_by_node: dict[str, list] = defaultdict(list)
+            for segment in segments:
+                segments_by_node[segment.index_node_id].append(segment)
+            for dataset_id, _, doc_id, count in segment_entries:
+                for segment in segments_by_node.get(doc_id, []):
+                    if dataset_id is None or segment.dataset_id == dataset_id:
+                        segment_hits[segment.id] += count
+
+        # one update per distinct count instead of one per segment
+        segment_ids_by_count: dict[int, list[str]] = defaultdict(list)
+        for segment_id, count in segment_hits.items():
+            segment_ids_by_count[count].append(segment_id)
+        for count, segment_ids in sorted(segment_ids_by_count.items()):
+            db.session.query(DocumentSegment).filter(DocumentSegment.id.in_(sorted(segment_ids))).update(
+                {DocumentSegment.hit_count: DocumentSegment.hit_count + count}, synchronize_session=False
+            )
+        db.session.commit()
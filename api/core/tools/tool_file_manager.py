@@ -5,7 +5,7 @@ import logging
 import os
 import time
 from mimetypes import guess_extension, guess_type
-from typing import Optional, Union
+from typing import IO, Optional, Union
 from uuid import uuid4
 
 import httpx
@@ -65,16 +65,9 @@ class ToolFileManager:
         mimetype: str,
         filename: Optional[str] = None,
     ) -> ToolFile:
-        extension = guess_extension(mimetype) or ".bin"
-        unique_name = uuid4().hex
-        unique_filename = f"{unique_name}{extension}"
-        # default just as before
-        present_filename = unique_filename
-        if filename is not None:
-            has_extension = len(filename.split(".")) > 1
-            # Add extension flexibly
-            present_filename = filename if has_extension else f"{filename}{extension}"
-        filepath = f"tools/{tenant_id}/{unique_filename}"
+        filepath, present_filename = ToolFileManager._generate_file_path(
+            tenant_id=tenant_id, mimetype=mimetype, filename=filename
+        )
         storage.save(filepath, file_binary)
 
         tool_file = ToolFile(
@@ -93,6 +86,54 @@ class ToolFileManager:
 
         return tool_file
 
+    @staticmethod
+    def create_file_by_stream(
+        *,
+        user_id: str,
+        tenant_id: str,
+        conversation_id: Optional[str],
+        stream: IO[bytes],
+        size: int,
+        mimetype: str,
+        filename: Optional[str] = None,
+    ) -> ToolFile:
+        """
+        Create a tool file from a readable binary stream of `size` bytes, written to the storage in chunks
+        """
+        filepath, present_filename = ToolFileManager._generate_file_path(
+            tenant_id=tenant_id, mimetype=mimetype, filename=filename
+        )
+        storage.save_stream(filepath, stream)
+
+        tool_file = ToolFile(
+            user_id=user_id,
+            tenant_id=tenant_id,
+            conversation_id=conversation_id,
+            file_key=filepath,
+            mimetype=mimetype,
+            name=present_filename,
+            size=size,
+        )
+
+        db.session.add(tool_file)
+        db.session.commit()
+        db.session.refresh(tool_file)
+
+        return tool_file
+
+    @staticmethod
+    def _generate_file_path(*, tenant_id: str, mimetype: str, filename: Optional[str]) -> tuple[str, str]:
+        extension = guess_extension(mimetype) or ".bin"
+        unique_name = uuid4().hex
+        unique_filename = f"{unique_name}{extension}"
+        # default just as before
+        present_filename = unique_filename
+        if filename is not None:
+            has_extension = len(filename.split(".")) > 1
+            # Add extension flexibly
+            present_filename = filename if has_extension else f"{filename}{extension}"
+        return f"tools/{tenant_id}/{unique_filename}", present_filename
+
     @staticmethod
     def create_file_by_url(
         user_id: str,
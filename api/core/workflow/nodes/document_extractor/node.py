@@ -1,4 +1,5 @@
 import csv
+import hashlib
 import io
 import json
 import logging
@@ -10,7 +11,6 @@ from typing import Any, cast
 import docx
 import pandas as pd
 import pypandoc  # type: ignore
-import pypdfium2  # type: ignore
 import webvtt  # type: ignore
 import yaml  # type: ignore
 from docx.document import Document
@@ -22,6 +22,8 @@ from docx.text.paragraph import Paragraph
 from configs import dify_config
 from core.file import File, FileTransferMethod, file_manager
 from core.helper import ssrf_proxy
+from core.rag.extractor import extraction_cache
+from core.rag.extractor.pdf_pages import iter_pdf_page_texts
 from core.variables import ArrayFileSegment
 from core.variables.segments import FileSegment
 from core.workflow.entities.node_entities import NodeRunResult
@@ -204,15 +206,7 @@ def _extract_text_from_yaml(file_content: bytes) -> str:
 
 def _extract_text_from_pdf(file_content: bytes) -> str:
     try:
-        pdf_file = io.BytesIO(file_content)
-        pdf_document = pypdfium2.PdfDocument(pdf_file, autoclose=True)
-        text = ""
-        for page in pdf_document:
-            text_page = page.get_textpage()
-            text += text_page.get_text_range()
-            text_page.close()
-            page.close()
-        return text
+        return "".join(iter_pdf_page_texts(file_content))
     except Exception as e:
         raise TextExtractionError(f"Failed to extract text from PDF: {str(e)}") from e
 
@@ -328,12 +322,29 @@ def _download_file_content(file: File) -> bytes:
 def _extract_text_from_file(file: File):
     file_content = _download_file_content(file)
     if file.extension:
-        extracted_text = _extract_text_by_file_extension(file_content=file_content, file_extension=file.extension)
+        file_type = file.extension.lower()
+
+        def extract() -> str:
+            return _extract_text_by_file_extension(file_content=file_content, file_extension=file.extension or "")
     elif file.mime_type:
-        extracted_text = _extract_text_by_mime_type(file_content=file_content, mime_type=file.mime_type)
+        file_type = file.mime_type
+
+        def extract() -> str:
+            return _extract_text_by_mime_type(file_content=file_content, mime_type=file.mime_type or "")
     else:
         raise UnsupportedFileTypeError("Unable to determine file type: MIME type or file extension is missing")
-    return extracted_text
+
+    if file_type in extraction_cache.TRIVIAL_FILE_TYPES:
+        return extract()
+
+    # some file types are extracted by the Unstructured API when it is configured
+    etl_type = "Unstructured" if dify_config.UNSTRUCTURED_API_URL else "dify"
+    return extraction_cache.get_or_extract_text(
+        file.tenant_id,
+        hashlib.sha3_256(file_content).hexdigest(),
+        f"workflow:{etl_type}:{file_type}",
+        extract,
+    )
 
 
 def _extract_text_from_csv(file_content: bytes) -> str:
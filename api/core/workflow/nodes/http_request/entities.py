@@ -1,7 +1,8 @@
 import mimetypes
+import os
 from collections.abc import Sequence
 from email.message import Message
-from typing import Any, Literal, Optional
+from typing import IO, Any, Literal, Optional
 
 import httpx
 from pydantic import BaseModel, Field, ValidationInfo, field_validator
@@ -96,10 +97,13 @@ class HttpRequestNodeData(BaseNodeData):
 class Response:
     headers: dict[str, str]
     response: httpx.Response
+    body_file: Optional[IO[bytes]]
 
-    def __init__(self, response: httpx.Response):
+    def __init__(self, response: httpx.Response, body_file: Optional[IO[bytes]] = None):
         self.response = response
         self.headers = dict(response.headers)
+        # body of a streamed response, spooled to a temporary file instead of being read into the response
+        self.body_file = body_file
 
     @property
     def is_file(self):
@@ -135,7 +139,7 @@ class Response:
             # Try to detect if content is text-based by sampling first few bytes
             try:
                 # Sample first 1024 bytes for text detection
-                content_sample = self.response.content[:1024]
+                content_sample = self._read_content(1024)
                 content_sample.decode("utf-8")
                 # If we can decode as UTF-8 and find common text patterns, likely not a file
                 text_markers = (b"{", b"[", b"<", b"function", b"var ", b"const ", b"let ")
@@ -159,11 +163,15 @@ class Response:
 
     @property
     def text(self) -> str:
-        return self.response.text
+        if self.body_file is None:
+            return self.response.text
+        return self.content.decode(self.response.encoding or "utf-8", errors="replace")
 
     @property
     def content(self) -> bytes:
-        return self.response.content
+        if self.body_file is None:
+            return self.response.content
+        return self._read_content()
 
     @property
     def status_code(self) -> int:
@@ -171,7 +179,23 @@ class Response:
 
     @property
     def size(self) -> int:
-        return len(self.content)
+        if self.body_file is None:
+            return len(self.content)
+        return self.body_file.seek(0, os.SEEK_END)
+
+    def _read_content(self, size: int = -1) -> bytes:
+        if self.body_file is None:
+            content = self.response.content
+            return content if size < 0 else content[:size]
+        self.body_file.seek(0)
+        return self.body_file.read(size)
+
+    def close(self):
+        """
+        Close the spooled body of a streamed response
+        """
+        if self.body_file is not None:
+            self.body_file.close()
 
     @property
     def readable_size(self) -> str:
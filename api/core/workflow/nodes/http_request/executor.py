@@ -1,15 +1,16 @@
 import base64
 import json
+import tempfile
 from collections.abc import Mapping
 from copy import deepcopy
 from random import randint
-from typing import Any, Literal
+from typing import IO, Any, Literal
 from urllib.parse import urlencode, urlparse
 
 import httpx
 
 from configs import dify_config
-from core.file import file_manager
+from core.file import File, file_manager
 from core.helper import ssrf_proxy
 from core.variables.segments import ArrayFileSegment, FileSegment
 from core.workflow.entities.variable_pool import VariablePool
@@ -57,9 +58,9 @@ class Executor:
     ]
     url: str
     params: list[tuple[str, str]] | None
-    content: str | bytes | None
+    content: str | bytes | IO[bytes] | None
     data: Mapping[str, Any] | None
-    files: list[tuple[str, tuple[str | None, bytes, str]]] | None
+    files: list[tuple[str, tuple[str | None, bytes | IO[bytes], str]]] | None
     json: Any
     headers: dict[str, str]
     auth: HttpRequestNodeAuthorization
@@ -96,11 +97,17 @@ class Executor:
         self.data = None
         self.json = None
         self.max_retries = max_retries
+        # file streams read into the request body, see `close`
+        self._streams: list[IO[bytes]] = []
 
         # init template
         self.variable_pool = variable_pool
         self.node_data = node_data
-        self._initialize()
+        try:
+            self._initialize()
+        except Exception:
+            self.close()
+            raise
 
     def _initialize(self):
         self._init_url()
@@ -190,7 +197,12 @@ class Executor:
                     if file_variable is None:
                         raise FileFetchError(f"cannot fetch file with selector {file_selector}")
                     file = file_variable.value
-                    self.content = file_manager.download(file)
+                    self.content = self._load_file(file)
+                    if not isinstance(self.content, bytes) and "content-length" not in (
+                        k.lower() for k in self.headers
+                    ):
+                        # send the known size rather than a chunked body
+                        self.headers["Content-Length"] = str(file.size)
                 case "x-www-form-urlencoded":
                     form_data = {
                         self.variable_pool.convert_template(item.key).text: self.variable_pool.convert_template(
@@ -221,13 +233,13 @@ class Executor:
                             files_list.append((key, list(segment.value)))
 
                     # get files from file_manager
-                    files: dict[str, list[tuple[str | None, bytes, str]]] = {}
+                    files: dict[str, list[tuple[str | None, bytes | IO[bytes], str]]] = {}
                     for key, files_in_segment in files_list:
                         for file in files_in_segment:
                             if file.related_id is not None:
                                 file_tuple = (
                                     file.filename,
-                                    file_manager.download(file),
+                                    self._load_file(file),
                                     file.mime_type or "application/octet-stream",
                                 )
                                 if key not in files:
@@ -243,6 +255,15 @@ class Executor:
 
                     self.data = form_data
 
+    def _load_file(self, file: File) -> bytes | IO[bytes]:
+        # files over the threshold are streamed into the request body instead of being loaded into memory
+        if file.size > dify_config.HTTP_REQUEST_NODE_STREAMING_THRESHOLD:
+            stream = file_manager.download_stream(file)
+            self._streams.append(stream)
+            return stream
+        content: bytes = file_manager.download(file)
+        return content
+
     def _assembling_headers(self) -> dict[str, Any]:
         authorization = deepcopy(self.auth)
         headers = deepcopy(self.headers) or {}
@@ -270,7 +291,7 @@ class Executor:
         return headers
 
     def _validate_and_parse_response(self, response: httpx.Response) -> Response:
-        executor_response = Response(response)
+        executor_response = self._read_response(response)
 
         threshold_size = (
             dify_config.HTTP_REQUEST_NODE_MAX_BINARY_SIZE
@@ -286,6 +307,44 @@ class Executor:
 
         return executor_response
 
+    @staticmethod
+    def _read_response(response: httpx.Response) -> Response:
+        """
+        Read the body of a streamed response.
+
+        Bodies of a known size up to HTTP_REQUEST_NODE_STREAMING_THRESHOLD are read into the response,
+        others are spooled to a temporary file, which is moved to disk once it exceeds the threshold.
+        Reading stops as soon as the body exceeds the maximum response size.
+        """
+        max_size = max(dify_config.HTTP_REQUEST_NODE_MAX_BINARY_SIZE, dify_config.HTTP_REQUEST_NODE_MAX_TEXT_SIZE)
+        threshold = dify_config.HTTP_REQUEST_NODE_STREAMING_THRESHOLD
+        content_length = response.headers.get("content-length", "")
+        size_exceeded = ResponseSizeError(f"Response size is too large, max size is {max_size / 1024 / 1024:.2f} MB.")
+
+        try:
+            if content_length.isdigit():
+                if int(content_length) > max_size:
+                    raise size_exceeded
+                if int(content_length) <= threshold:
+                    response.read()
+                    return Response(response)
+
+            # closed by Response.close, once the node is done with the response
+            body_file = tempfile.SpooledTemporaryFile(max_size=threshold)  # noqa: SIM115
+            size = 0
+            for chunk in response.iter_bytes():
+                size += len(chunk)
+                if size > max_size:
+                    body_file.close()
+                    raise size_exceeded
+                body_file.write(chunk)
+        except httpx.HTTPError as e:
+            raise HttpRequestNodeError(str(e))
+        finally:
+            response.close()
+
+        return Response(response, body_file=body_file)
+
     def _do_http_request(self, headers: dict[str, Any]) -> httpx.Response:
         """
         do http request depending on api bundle
@@ -320,6 +379,7 @@ class Executor:
             "ssl_verify": self.ssl_verify,
             "follow_redirects": True,
             "max_retries": self.max_retries,
+            "stream": True,
         }
         # request_args = {k: v for k, v in request_args.items() if v is not None}
         try:
@@ -337,6 +397,14 @@ class Executor:
         # validate response
         return self._validate_and_parse_response(response)
 
+    def close(self):
+        """
+        Close the file streams of the request body
+        """
+        for stream in self._streams:
+            stream.close()
+        self._streams.clear()
+
     def to_log(self):
         url_parts = urlparse(self.url)
         path = url_parts.path or "/"
@@ -374,12 +442,13 @@ class Executor:
             for key, (filename, content, mime_type) in self.files:
                 body_string += f"--{boundary}\r\n"
                 body_string += f'Content-Disposition: form-data; name="{key}"\r\n\r\n'
-                # decode content
-                try:
-                    body_string += content.decode("utf-8")
-                except UnicodeDecodeError:
-                    # fix: decode binary content
-                    pass
+                # decode content, streamed files are not logged
+                if isinstance(content, bytes):
+                    try:
+                        body_string += content.decode("utf-8")
+                    except UnicodeDecodeError:
+                        # fix: decode binary content
+                        pass
                 body_string += "\r\n"
             body_string += f"--{boundary}--\r\n"
         elif self.node_data.body:
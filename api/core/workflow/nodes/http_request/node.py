@@ -62,6 +62,8 @@ class HttpRequestNode(BaseNode[HttpRequestNodeData]):
 
     def _run(self) -> NodeRunResult:
         process_data = {}
+        http_executor = None
+        response = None
         try:
             http_executor = Executor(
                 node_data=self.node_data,
@@ -108,6 +110,12 @@ class HttpRequestNode(BaseNode[HttpRequestNodeData]):
                 process_data=process_data,
                 error_type=type(e).__name__,
             )
+        finally:
+            # the response body is read and stored by now, release its spooled file and the request file streams
+            if response is not None:
+                response.close()
+            if http_executor is not None:
+                http_executor.close()
 
     @staticmethod
     def _get_request_timeout(node_data: HttpRequestNodeData) -> HttpRequestNodeTimeout:
@@ -173,7 +181,6 @@ class HttpRequestNode(BaseNode[HttpRequestNodeData]):
         files: list[File] = []
         is_file = response.is_file
         content_type = response.content_type
-        content = response.content
         parsed_content_disposition = response.parsed_content_disposition
         content_disposition_type = None
 
@@ -192,13 +199,26 @@ class HttpRequestNode(BaseNode[HttpRequestNodeData]):
             content_disposition_type or content_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
         )
 
-        tool_file = ToolFileManager.create_file_by_raw(
-            user_id=self.user_id,
-            tenant_id=self.tenant_id,
-            conversation_id=None,
-            file_binary=content,
-            mimetype=mime_type,
-        )
+        if response.body_file is not None:
+            # streamed response, the spooled body is copied to storage without loading it
+            size = response.size
+            response.body_file.seek(0)
+            tool_file = ToolFileManager.create_file_by_stream(
+                user_id=self.user_id,
+                tenant_id=self.tenant_id,
+                conversation_id=None,
+                stream=response.body_file,
+                size=size,
+                mimetype=mime_type,
+            )
+        else:
+            tool_file = ToolFileManager.create_file_by_raw(
+                user_id=self.user_id,
+                tenant_id=self.tenant_id,
+                conversation_id=None,
+                file_binary=response.content,
+                mimetype=mime_type,
+            )
 
         mapping = {
             "tool_file_id": tool_file.id,
@@ -99,6 +99,18 @@ def init_app(app: DifyApp) -> Celery:
             "schedule": crontab(minute="0", hour="10", day_of_week="1"),
         },
     }
+    if dify_config.APP_STATISTIC_ROLLUP_ENABLED:
+        imports.append("schedule.compact_app_statistics_task")
+        beat_schedule["compact_app_statistics_task"] = {
+            "task": "schedule.compact_app_statistics_task.compact_app_statistics_task",
+            "schedule": timedelta(minutes=dify_config.APP_STATISTIC_ROLLUP_INTERVAL),
+        }
+    if dify_config.RETRIEVAL_STATS_BUFFER_ENABLED:
+        imports.append("schedule.flush_retrieval_stats_task")
+        beat_schedule["flush_retrieval_stats_task"] = {
+            "task": "schedule.flush_retrieval_stats_task.flush_retrieval_stats_task",
+            "schedule": timedelta(seconds=dify_config.RETRIEVAL_STATS_FLUSH_INTERVAL),
+        }
     celery_app.conf.update(beat_schedule=beat_schedule, imports=imports)
 
     return celery_app
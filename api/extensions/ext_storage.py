@@ -1,12 +1,13 @@
+import io
 import logging
 from collections.abc import Callable, Generator
-from typing import Literal, Union, overload
+from typing import IO, Literal, Optional, Union, overload
 
 from flask import Flask
 
 from configs import dify_config
 from dify_app import DifyApp
-from extensions.storage.base_storage import BaseStorage
+from extensions.storage.base_storage import STREAM_CHUNK_SIZE, BaseStorage, StorageFileReader
 from extensions.storage.storage_type import StorageType
 
 logger = logging.getLogger(__name__)
@@ -75,6 +76,9 @@ class Storage:
     def save(self, filename, data):
         self.storage_runner.save(filename, data)
 
+    def save_stream(self, filename: str, stream: IO[bytes]):
+        self.storage_runner.save_stream(filename, stream)
+
     @overload
     def load(self, filename: str, /, *, stream: Literal[False] = False) -> bytes: ...
 
@@ -93,6 +97,18 @@ class Storage:
     def load_stream(self, filename: str) -> Generator:
         return self.storage_runner.load_stream(filename)
 
+    def load_range(self, filename: str, start: int, end: Optional[int] = None) -> bytes:
+        return self.storage_runner.load_range(filename, start, end)
+
+    def get_size(self, filename: str) -> int:
+        return self.storage_runner.get_size(filename)
+
+    def open(self, filename: str, size: Optional[int] = None) -> io.BufferedReader:
+        """
+        Open a stored file as a seekable binary file, read in chunks of STREAM_CHUNK_SIZE with ranged reads
+        """
+        return io.BufferedReader(StorageFileReader(self.storage_runner, filename, size), STREAM_CHUNK_SIZE)
+
     def download(self, filename, target_filepath):
         self.storage_runner.download(filename, target_filepath)
 
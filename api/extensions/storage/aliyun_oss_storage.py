@@ -1,10 +1,11 @@
 import posixpath
 from collections.abc import Generator
+from typing import IO, Optional
 
 import oss2 as aliyun_s3  # type: ignore
 
 from configs import dify_config
-from extensions.storage.base_storage import BaseStorage
+from extensions.storage.base_storage import STREAM_CHUNK_SIZE, BaseStorage
 
 
 class AliyunOssStorage(BaseStorage):
@@ -31,6 +32,11 @@ class AliyunOssStorage(BaseStorage):
     def save(self, filename, data):
         self.client.put_object(self.__wrapper_folder_filename(filename), data)
 
+    def save_stream(self, filename: str, stream: IO[bytes]):
+        # file-like objects are sized with seek and tell, iterables are sent with chunked transfer encoding
+        chunks = iter(lambda: stream.read(STREAM_CHUNK_SIZE), b"")
+        self.client.put_object(self.__wrapper_folder_filename(filename), chunks)
+
     def load_once(self, filename: str) -> bytes:
         obj = self.client.get_object(self.__wrapper_folder_filename(filename))
         data: bytes = obj.read()
@@ -41,6 +47,22 @@ class AliyunOssStorage(BaseStorage):
         while chunk := obj.read(4096):
             yield chunk
 
+    def load_range(self, filename: str, start: int, end: Optional[int] = None) -> bytes:
+        if end is not None and end <= start:
+            return b""
+        obj = self.client.get_object(
+            self.__wrapper_folder_filename(filename),
+            byte_range=(start, None if end is None else end - 1),
+            # without it, an invalid range returns the whole object
+            headers={"x-oss-range-behavior": "standard"},
+        )
+        data: bytes = obj.read()
+        return data
+
+    def get_size(self, filename: str) -> int:
+        size: int = self.client.head_object(self.__wrapper_folder_filename(filename)).content_length
+        return size
+
     def download(self, filename: str, target_filepath):
         self.client.get_object_to_file(self.__wrapper_folder_filename(filename), target_filepath)
 
@@ -1,5 +1,6 @@
 import logging
 from collections.abc import Generator
+from typing import IO, Optional
 
 import boto3  # type: ignore
 from botocore.client import Config  # type: ignore
@@ -51,6 +52,10 @@ class AwsS3Storage(BaseStorage):
     def save(self, filename, data):
         self.client.put_object(Bucket=self.bucket_name, Key=filename, Body=data)
 
+    def save_stream(self, filename: str, stream: IO[bytes]):
+        # managed transfer, large streams are sent as a multipart upload
+        self.client.upload_fileobj(stream, self.bucket_name, filename)
+
     def load_once(self, filename: str) -> bytes:
         try:
             data: bytes = self.client.get_object(Bucket=self.bucket_name, Key=filename)["Body"].read()
@@ -73,6 +78,31 @@ class AwsS3Storage(BaseStorage):
             else:
                 raise
 
+    def load_range(self, filename: str, start: int, end: Optional[int] = None) -> bytes:
+        if end is not None and end <= start:
+            return b""
+        byte_range = f"bytes={start}-" if end is None else f"bytes={start}-{end - 1}"
+        try:
+            data: bytes = self.client.get_object(Bucket=self.bucket_name, Key=filename, Range=byte_range)["Body"].read()
+        except ClientError as ex:
+            if ex.response["Error"]["Code"] == "NoSuchKey":
+                raise FileNotFoundError("File not found")
+            elif ex.response["Error"]["Code"] == "InvalidRange":
+                # the range starts after the end of the file
+                return b""
+            else:
+                raise
+        return data
+
+    def get_size(self, filename: str) -> int:
+        try:
+            size: int = self.client.head_object(Bucket=self.bucket_name, Key=filename)["ContentLength"]
+        except ClientError as ex:
+            if ex.response["Error"]["Code"] in {"NoSuchKey", "404"}:
+                raise FileNotFoundError("File not found")
+            raise
+        return size
+
     def download(self, filename, target_filepath):
         self.client.download_file(self.bucket_name, filename, target_filepath)
 
@@ -1,6 +1,6 @@
 from collections.abc import Generator
 from datetime import UTC, datetime, timedelta
-from typing import Optional
+from typing import IO, Optional
 
 from azure.identity import ChainedTokenCredential, DefaultAzureCredential
 from azure.storage.blob import AccountSasPermissions, BlobServiceClient, ResourceTypes, generate_account_sas
@@ -31,6 +31,12 @@ class AzureBlobStorage(BaseStorage):
         blob_container = client.get_container_client(container=self.bucket_name)
         blob_container.upload_blob(filename, data)
 
+    def save_stream(self, filename: str, stream: IO[bytes]):
+        client = self._sync_client()
+        blob_container = client.get_container_client(container=self.bucket_name)
+        # streams are uploaded as staged blocks
+        blob_container.upload_blob(filename, stream)
+
     def load_once(self, filename: str) -> bytes:
         client = self._sync_client()
         blob = client.get_container_client(container=self.bucket_name)
@@ -44,6 +50,20 @@ class AzureBlobStorage(BaseStorage):
         blob_data = blob.download_blob()
         yield from blob_data.chunks()
 
+    def load_range(self, filename: str, start: int, end: Optional[int] = None) -> bytes:
+        if end is not None and end <= start:
+            return b""
+        client = self._sync_client()
+        blob = client.get_blob_client(container=self.bucket_name, blob=filename)
+        data: bytes = blob.download_blob(offset=start, length=None if end is None else end - start).readall()
+        return data
+
+    def get_size(self, filename: str) -> int:
+        client = self._sync_client()
+        blob = client.get_blob_client(container=self.bucket_name, blob=filename)
+        size: int = blob.get_blob_properties().size
+        return size
+
     def download(self, filename, target_filepath):
         client = self._sync_client()
 
@@ -1,7 +1,12 @@
 """Abstract interface for file storage implementations."""
 
+import io
 from abc import ABC, abstractmethod
 from collections.abc import Generator
+from typing import IO, Optional
+
+# size of the chunks copied by the streaming writes
+STREAM_CHUNK_SIZE = 1024 * 1024
 
 
 class BaseStorage(ABC):
@@ -11,6 +16,14 @@ class BaseStorage(ABC):
     def save(self, filename, data):
         raise NotImplementedError
 
+    def save_stream(self, filename: str, stream: IO[bytes]):
+        """
+        Save the content of a readable binary stream.
+        Backends supporting chunked or multipart uploads override this to avoid holding the whole content,
+        the others read the stream into memory and save it.
+        """
+        self.save(filename, stream.read())
+
     @abstractmethod
     def load_once(self, filename: str) -> bytes:
         raise NotImplementedError
@@ -19,6 +32,32 @@ class BaseStorage(ABC):
     def load_stream(self, filename: str) -> Generator:
         raise NotImplementedError
 
+    def load_range(self, filename: str, start: int, end: Optional[int] = None) -> bytes:
+        """
+        Load the bytes from `start` up to `end` (exclusive) of a file, or up to its end if `end` is None.
+        Backends supporting ranged reads override this, the others skip the stream up to the range.
+        """
+        data = bytearray()
+        if end is not None and end <= start:
+            return bytes(data)
+
+        position = 0
+        for chunk in self.load_stream(filename):
+            chunk_end = position + len(chunk)
+            if chunk_end > start:
+                data += chunk[max(start - position, 0) : None if end is None else end - position]
+            position = chunk_end
+            if end is not None and position >= end:
+                break
+        return bytes(data)
+
+    def get_size(self, filename: str) -> int:
+        """
+        Get the size in bytes of a file.
+        Backends override this with a metadata request, the others read the whole file.
+        """
+        return sum(len(chunk) for chunk in self.load_stream(filename))
+
     @abstractmethod
     def download(self, filename, target_filepath):
         raise NotImplementedError
@@ -38,3 +77,54 @@ class BaseStorage(ABC):
         If a storage backend doesn't support scanning, it will raise NotImplementedError.
         """
         raise NotImplementedError("This storage backend doesn't support scanning")
+
+
+class StorageFileReader(io.RawIOBase):
+    """
+    Seekable read-only file-like object over a stored file, each read being a ranged read of the storage.
+    Wrap it in an `io.BufferedReader` to read it in chunks rather than with one request per small read.
+    """
+
+    def __init__(self, storage: BaseStorage, filename: str, size: Optional[int] = None):
+        self._storage = storage
+        self._filename = filename
+        self._size = storage.get_size(filename) if size is None else size
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._size + offset
+        else:
+            raise ValueError(f"invalid whence {whence}")
+        if position < 0:
+            raise ValueError(f"negative seek position {position}")
+        self._position = position
+        return position
+
+    def readinto(self, buffer) -> int:
+        if self._position >= self._size:
+            return 0
+        data = self._storage.load_range(self._filename, self._position, min(self._position + len(buffer), self._size))
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def readall(self) -> bytes:
+        if self._position >= self._size:
+            return b""
+        data = self._storage.load_range(self._filename, self._position, self._size)
+        self._position += len(data)
+        return data
@@ -2,12 +2,43 @@ import base64
 import io
 import json
 from collections.abc import Generator
+from typing import IO, Optional
 
 from google.cloud import storage as google_cloud_storage  # type: ignore
 
 from configs import dify_config
 from extensions.storage.base_storage import BaseStorage
 
+# size of the chunks of resumable uploads, a multiple of 256 KiB
+_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+class _ResumableUploadReader:
+    """
+    Reader of a stream for resumable uploads, which track the upload position with tell()
+    and take a chunk shorter than requested as the end of the stream.
+    """
+
+    def __init__(self, stream: IO[bytes]):
+        self._stream = stream
+        self._position = 0
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        if size is None or size < 0:
+            data = self._stream.read()
+        else:
+            chunks = []
+            remaining = size
+            while remaining > 0 and (chunk := self._stream.read(remaining)):
+                chunks.append(chunk)
+                remaining -= len(chunk)
+            data = b"".join(chunks)
+        self._position += len(data)
+        return data
+
+    def tell(self) -> int:
+        return self._position
+
 
 class GoogleCloudStorage(BaseStorage):
     """Implementation for Google Cloud storage."""
@@ -32,6 +63,12 @@ class GoogleCloudStorage(BaseStorage):
         with io.BytesIO(data) as stream:
             blob.upload_from_file(stream)
 
+    def save_stream(self, filename: str, stream: IO[bytes]):
+        bucket = self.client.get_bucket(self.bucket_name)
+        blob = bucket.blob(filename, chunk_size=_UPLOAD_CHUNK_SIZE)
+        # streams of unknown size are sent as a chunked resumable upload
+        blob.upload_from_file(_ResumableUploadReader(stream))
+
     def load_once(self, filename: str) -> bytes:
         bucket = self.client.get_bucket(self.bucket_name)
         blob = bucket.get_blob(filename)
@@ -45,6 +82,23 @@ class GoogleCloudStorage(BaseStorage):
             while chunk := blob_stream.read(4096):
                 yield chunk
 
+    def load_range(self, filename: str, start: int, end: Optional[int] = None) -> bytes:
+        if end is not None and end <= start:
+            return b""
+        bucket = self.client.get_bucket(self.bucket_name)
+        blob = bucket.blob(filename)
+        # the end of a download range is inclusive
+        data: bytes = blob.download_as_bytes(start=start, end=None if end is None else end - 1)
+        return data
+
+    def get_size(self, filename: str) -> int:
+        bucket = self.client.get_bucket(self.bucket_name)
+        blob = bucket.get_blob(filename)
+        if blob is None:
+            raise FileNotFoundError("File not found")
+        size: int = blob.size
+        return size
+
     def download(self, filename, target_filepath):
         bucket = self.client.get_bucket(self.bucket_name)
         blob = bucket.get_blob(filename)
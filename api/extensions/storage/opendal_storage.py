@@ -2,11 +2,12 @@ import logging
 import os
 from collections.abc import Generator
 from pathlib import Path
+from typing import IO, Optional
 
 import opendal  # type: ignore[import]
 from dotenv import dotenv_values
 
-from extensions.storage.base_storage import BaseStorage
+from extensions.storage.base_storage import STREAM_CHUNK_SIZE, BaseStorage
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +45,12 @@ class OpenDALStorage(BaseStorage):
         self.op.write(path=filename, bs=data)
         logger.debug(f"file {filename} saved")
 
+    def save_stream(self, filename: str, stream: IO[bytes]) -> None:
+        with self.op.open(path=filename, mode="wb") as file:
+            while chunk := stream.read(STREAM_CHUNK_SIZE):
+                file.write(chunk)
+        logger.debug(f"file {filename} saved as stream")
+
     def load_once(self, filename: str) -> bytes:
         if not self.exists(filename):
             raise FileNotFoundError("File not found")
@@ -62,6 +69,25 @@ class OpenDALStorage(BaseStorage):
             yield chunk
         logger.debug(f"file {filename} loaded as stream")
 
+    def load_range(self, filename: str, start: int, end: Optional[int] = None) -> bytes:
+        if not self.exists(filename):
+            raise FileNotFoundError("File not found")
+        if end is not None and end <= start:
+            return b""
+
+        with self.op.open(path=filename, mode="rb") as file:
+            file.seek(start)
+            content: bytes = file.read() if end is None else file.read(end - start)
+        logger.debug(f"file {filename} range {start}-{end} loaded")
+        return content
+
+    def get_size(self, filename: str) -> int:
+        if not self.exists(filename):
+            raise FileNotFoundError("File not found")
+
+        size: int = self.op.stat(path=filename).content_length
+        return size
+
     def download(self, filename: str, target_filepath: str):
         if not self.exists(filename):
             raise FileNotFoundError("File not found")
@@ -12,13 +12,16 @@ from hashlib import sha256
 from typing import TYPE_CHECKING, Any, Optional, Union, cast
 from zoneinfo import available_timezones
 
-from flask import Response, stream_with_context
+from flask import Response, request, stream_with_context
 from flask_restful import fields  # type: ignore
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
 
 from configs import dify_config
 from core.app.features.rate_limiting.rate_limit import RateLimitGenerator
 from core.file import helpers as file_helpers
 from extensions.ext_redis import redis_client
+from extensions.ext_storage import storage
+from extensions.storage.base_storage import STREAM_CHUNK_SIZE
 
 if TYPE_CHECKING:
     from models.account import Account
@@ -205,6 +208,34 @@ def compact_generate_response(response: Union[Mapping, Generator, RateLimitGener
         return Response(stream_with_context(generate()), status=200, mimetype="text/event-stream")
 
 
+def storage_range_response(storage_key: str, size: int, mimetype: str) -> Optional[Response]:
+    """
+    Build the 206 Partial Content response of a stored file for the Range header of the current request,
+    read with ranged storage reads. Returns None when the whole file should be served instead.
+    """
+    if size <= 0 or request.range is None or request.range.units != "bytes" or len(request.range.ranges) != 1:
+        return None
+
+    byte_range = request.range.range_for_length(size)
+    if byte_range is None:
+        raise RequestedRangeNotSatisfiable(length=size)
+    start, stop = byte_range
+
+    def generate() -> Generator:
+        with storage.open(storage_key, size=size) as file:
+            file.seek(start)
+            remaining = stop - start
+            while remaining > 0 and (chunk := file.read(min(remaining, STREAM_CHUNK_SIZE))):
+                remaining -= len(chunk)
+                yield chunk
+
+    response = Response(generate(), status=206, mimetype=mimetype, direct_passthrough=True)
+    response.headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+    response.headers["Content-Length"] = str(stop - start)
+    response.headers["Accept-Ranges"] = "bytes"
+    return response
+
+
 class TokenManager:
     @classmethod
     def generate_token(
@@ -0,0 +1,65 @@
+from typing import Any, Optional
+
+from sqlalchemy import Select, literal, select, tuple_
+from sqlalchemy.orm import Session
+from werkzeug.exceptions import NotFound
+
+from extensions.ext_database import db
+
+
+class KeysetPagination:
+    """
+    A page of a keyset paginated query.
+    Exposes the attributes of flask_sqlalchemy's Pagination read by the pagination fields,
+    page and total are not computed since keyset pagination does not count the rows.
+    """
+
+    page = None
+    total = None
+
+    def __init__(self, items: list[Any], per_page: int, has_next: bool):
+        self.items = items
+        self.per_page = per_page
+        self.has_next = has_next
+
+
+def paginate_by_last_id(
+    query: Select,
+    *,
+    id_column: Any,
+    order_column: Any,
+    last_id: Optional[str],
+    limit: int,
+    descending: bool = True,
+    session: Optional[Session] = None,
+) -> KeysetPagination:
+    """
+    Paginate a query ordered by order_column after the row of last_id, without OFFSET and COUNT.
+    The query must already be ordered by order_column, id_column is appended as the tie breaker.
+    It must not return a row more than once, e.g. filter with IN or EXISTS instead of joining a one-to-many
+    relationship, otherwise pages come back short and the last page is detected too early.
+
+    :param query: select of the entity to paginate
+    :param id_column: primary key column of the entity
+    :param order_column: column the query is ordered by
+    :param last_id: id of the last row of the previous page, None for the first page
+    :param limit: page size
+    :param descending: whether the query is ordered by order_column descending
+    :param session: session to run the query with, defaults to db.session
+    """
+    db_session = session or db.session
+    if last_id:
+        anchor = db_session.execute(select(order_column).where(id_column == last_id)).first()
+        if anchor is None:
+            raise NotFound("Last record not exists.")
+
+        # row value comparison, so that an index on (..., order_column, id_column) can be used
+        keyset = tuple_(order_column, id_column)
+        anchor_keyset = tuple_(literal(anchor[0], order_column.type), literal(last_id, id_column.type))
+        query = query.where(keyset < anchor_keyset if descending else keyset > anchor_keyset)
+
+    # fetch one more row to know whether there is a next page, instead of counting the rest
+    query = query.order_by(id_column.desc() if descending else id_column.asc()).limit(limit + 1)
+    items = list(db_session.execute(query).unique().scalars())
+
+    return KeysetPagination(items=items[:limit], per_page=limit, has_next=len(items) > limit)
@@ -1,13 +1,44 @@
 import hashlib
+import weakref
+from threading import Lock
 
+from cachetools import TTLCache
 from Crypto.Cipher import AES
 from Crypto.PublicKey import RSA
 from Crypto.Random import get_random_bytes
 
+from configs import dify_config
 from extensions.ext_redis import redis_client
 from extensions.ext_storage import storage
 from libs import gmpy2_pkcs10aep_cipher
 
+# parsed private keys and ciphers of tenants
+_decoding_cache: TTLCache = TTLCache(
+    maxsize=dify_config.CREDENTIAL_DECODING_CACHE_MAX_TENANTS, ttl=dify_config.CREDENTIAL_DECODING_CACHE_TTL
+)
+_decoding_cache_lock = Lock()
+
+# digests of the private keys behind the ciphers handed out by get_decrypt_decoding
+_cipher_key_digests: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+class _TokenBuffer(bytearray):
+    """
+    Decrypted token, overwritten with zeros once the cache drops it.
+    The strings handed out to callers are copies, they are not overwritten.
+    """
+
+    def __del__(self):
+        self[:] = bytes(len(self))
+
+
+# decrypted tokens, keyed by the private key digest and the digest of the encrypted token,
+# expired entries are dropped on every lookup
+_decrypted_token_cache: TTLCache = TTLCache(
+    maxsize=dify_config.DECRYPTED_CREDENTIAL_CACHE_MAX_SIZE, ttl=dify_config.DECRYPTED_CREDENTIAL_CACHE_TTL
+)
+_decrypted_token_cache_lock = Lock()
+
 
 def generate_key_pair(tenant_id):
     private_key = RSA.generate(2048)
@@ -20,6 +51,11 @@ def generate_key_pair(tenant_id):
 
     storage.save(filepath, pem_private)
 
+    # drop the cached decoding of the replaced key pair
+    redis_client.delete(_get_private_key_cache_key(filepath))
+    with _decoding_cache_lock:
+        _decoding_cache.pop(tenant_id, None)
+
     return pem_public.decode()
 
 
@@ -45,10 +81,19 @@ def encrypt(text, public_key):
     return prefix_hybrid + encrypted_data
 
 
+def _get_private_key_cache_key(filepath):
+    return "tenant_privkey:{hash}".format(hash=hashlib.sha3_256(filepath.encode()).hexdigest())
+
+
 def get_decrypt_decoding(tenant_id):
+    with _decoding_cache_lock:
+        decoding = _decoding_cache.get(tenant_id)
+    if decoding:
+        return decoding
+
     filepath = "privkeys/{tenant_id}".format(tenant_id=tenant_id) + "/private.pem"
 
-    cache_key = "tenant_privkey:{hash}".format(hash=hashlib.sha3_256(filepath.encode()).hexdigest())
+    cache_key = _get_private_key_cache_key(filepath)
     private_key = redis_client.get(cache_key)
     if not private_key:
         try:
@@ -61,10 +106,24 @@ def get_decrypt_decoding(tenant_id):
     rsa_key = RSA.import_key(private_key)
     cipher_rsa = gmpy2_pkcs10aep_cipher.new(rsa_key)
 
+    with _decoding_cache_lock:
+        _decoding_cache[tenant_id] = (rsa_key, cipher_rsa)
+        _cipher_key_digests[cipher_rsa] = hashlib.sha256(private_key).digest()
+
     return rsa_key, cipher_rsa
 
 
 def decrypt_token_with_decoding(encrypted_text, rsa_key, cipher_rsa):
+    cache_key = None
+    key_digest = _cipher_key_digests.get(cipher_rsa)
+    if key_digest:
+        cache_key = (key_digest, hashlib.sha256(encrypted_text).digest())
+        with _decrypted_token_cache_lock:
+            _decrypted_token_cache.expire()
+            token = _decrypted_token_cache.get(cache_key)
+            if token is not None:
+                return token.decode()
+
     if encrypted_text.startswith(prefix_hybrid):
         encrypted_text = encrypted_text[len(prefix_hybrid) :]
 
@@ -76,11 +135,16 @@ def decrypt_token_with_decoding(encrypted_text, rsa_key, cipher_rsa):
         aes_key = cipher_rsa.decrypt(enc_aes_key)
 
         cipher_aes = AES.new(aes_key, AES.MODE_EAX, nonce=nonce)
-        decrypted_text = cipher_aes.decrypt_and_verify(ciphertext, tag)
+        decrypted_bytes = cipher_aes.decrypt_and_verify(ciphertext, tag)
     else:
-        decrypted_text = cipher_rsa.decrypt(encrypted_text)
+        decrypted_bytes = cipher_rsa.decrypt(encrypted_text)
+
+    decrypted_text = decrypted_bytes.decode()
+    if cache_key:
+        with _decrypted_token_cache_lock:
+            _decrypted_token_cache[cache_key] = _TokenBuffer(decrypted_bytes)
 
-    return decrypted_text.decode()
+    return decrypted_text
 
 
 def decrypt(encrypted_text, tenant_id):
@@ -0,0 +1,51 @@
+"""add trigram search indexes for conversation logs
+
+Revision ID: 8e2f4a6c1d35
+Revises: 3b1d5c7e9f24
+Create Date: 2025-04-14 10:12:47.309518
+
+"""
+from alembic import op
+import models as models
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e2f4a6c1d35'
+down_revision = '3b1d5c7e9f24'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, column)
+TRGM_INDEXES = [
+    ('message_query_trgm_idx', 'messages', 'query'),
+    ('message_answer_trgm_idx', 'messages', 'answer'),
+    ('conversation_name_trgm_idx', 'conversations', 'name'),
+    ('conversation_introduction_trgm_idx', 'conversations', 'introduction'),
+    ('end_user_session_id_trgm_idx', 'end_users', 'session_id'),
+]
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm;')
+
+    # build the indexes without blocking writes to the messages table
+    with op.get_context().autocommit_block():
+        for index_name, table_name, column_name in TRGM_INDEXES:
+            op.create_index(
+                index_name,
+                table_name,
+                [column_name],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column_name: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for index_name, table_name, _ in reversed(TRGM_INDEXES):
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True)
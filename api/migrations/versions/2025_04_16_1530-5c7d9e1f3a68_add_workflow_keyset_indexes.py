@@ -0,0 +1,55 @@
+"""add keyset pagination indexes for workflow runs and app logs
+
+Revision ID: 5c7d9e1f3a68
+Revises: 8e2f4a6c1d35
+Create Date: 2025-04-16 15:30:12.804127
+
+"""
+from alembic import op
+import models as models
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c7d9e1f3a68'
+down_revision = '8e2f4a6c1d35'
+branch_labels = None
+depends_on = None
+
+
+# (new index, superseded index, table, new columns, superseded columns)
+KEYSET_INDEXES = [
+    (
+        'workflow_run_triggered_from_created_idx',
+        'workflow_run_triggerd_from_idx',
+        'workflow_runs',
+        ['tenant_id', 'app_id', 'triggered_from', 'created_at', 'id'],
+        ['tenant_id', 'app_id', 'triggered_from'],
+    ),
+    (
+        'workflow_app_log_app_created_idx',
+        'workflow_app_log_app_idx',
+        'workflow_app_logs',
+        ['tenant_id', 'app_id', 'created_at', 'id'],
+        ['tenant_id', 'app_id'],
+    ),
+]
+
+
+def upgrade():
+    # build the indexes without blocking writes, the superseded indexes are prefixes of the new ones
+    with op.get_context().autocommit_block():
+        for index_name, old_index_name, table_name, columns, _ in KEYSET_INDEXES:
+            op.create_index(
+                index_name, table_name, columns, unique=False, postgresql_concurrently=True, if_not_exists=True
+            )
+            op.drop_index(old_index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for index_name, old_index_name, table_name, _, old_columns in reversed(KEYSET_INDEXES):
+            op.create_index(
+                old_index_name, table_name, old_columns, unique=False, postgresql_concurrently=True, if_not_exists=True
+            )
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True)
@@ -36,10 +36,12 @@ from .model import (
     AppAnnotationSetting,
     AppMode,
     AppModelConfig,
+    AppStatisticHourly,
     Conversation,
     DatasetRetrieverResource,
     DifySetup,
     EndUser,
+    ExtractionCache,
     IconType,
     InstalledApp,
     Message,
@@ -107,6 +109,7 @@ __all__ = [
     "AppDatasetJoin",
     "AppMode",
     "AppModelConfig",
+    "AppStatisticHourly",
     "BuiltinToolProvider",  # Added
     "CeleryTask",
     "CeleryTaskSet",
@@ -130,6 +133,7 @@ __all__ = [
     "EndUser",
     "ExternalKnowledgeApis",
     "ExternalKnowledgeBindings",
+    "ExtractionCache",
     "IconType",
     "InstalledApp",
     "InvitationCode",
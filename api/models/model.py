@@ -607,6 +607,13 @@ class Conversation(db.Model):  # type: ignore[name-defined]
     __table_args__ = (
         db.PrimaryKeyConstraint("id", name="conversation_pkey"),
         db.Index("conversation_app_from_user_idx", "app_id", "from_source", "from_end_user_id"),
+        db.Index("conversation_name_trgm_idx", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        db.Index(
+            "conversation_introduction_trgm_idx",
+            "introduction",
+            postgresql_using="gin",
+            postgresql_ops={"introduction": "gin_trgm_ops"},
+        ),
     )
 
     id: Mapped[str] = mapped_column(StringUUID, server_default=db.text("uuid_generate_v4()"))
@@ -874,6 +881,8 @@ class Message(db.Model):  # type: ignore[name-defined]
         Index("message_account_idx", "app_id", "from_source", "from_account_id"),
         Index("message_workflow_run_id_idx", "conversation_id", "workflow_run_id"),
         Index("message_created_at_idx", "created_at"),
+        Index("message_query_trgm_idx", "query", postgresql_using="gin", postgresql_ops={"query": "gin_trgm_ops"}),
+        Index("message_answer_trgm_idx", "answer", postgresql_using="gin", postgresql_ops={"answer": "gin_trgm_ops"}),
     )
 
     id: Mapped[str] = mapped_column(StringUUID, server_default=db.text("uuid_generate_v4()"))
@@ -1420,6 +1429,12 @@ class EndUser(Base, UserMixin):
         db.PrimaryKeyConstraint("id", name="end_user_pkey"),
         db.Index("end_user_session_id_idx", "session_id", "type"),
         db.Index("end_user_tenant_session_id_idx", "tenant_id", "session_id", "type"),
+        db.Index(
+            "end_user_session_id_trgm_idx",
+            "session_id",
+            postgresql_using="gin",
+            postgresql_ops={"session_id": "gin_trgm_ops"},
+        ),
     )
 
     id = db.Column(StringUUID, server_default=db.text("uuid_generate_v4()"))
@@ -1587,6 +1602,31 @@ class UploadFile(Base):
         self.source_url = source_url
 
 
+class ExtractionCache(Base):
+    """
+    Index of the extraction results stored in storage, by content hash of the extracted file.
+    `extractor` identifies how the content was extracted, e.g. the ETL type and file extension.
+    """
+
+    __tablename__ = "extraction_caches"
+    __table_args__ = (
+        db.PrimaryKeyConstraint("id", name="extraction_cache_pkey"),
+        db.UniqueConstraint(
+            "tenant_id", "content_hash", "extractor", name="unique_extraction_cache_tenant_hash_extractor"
+        ),
+        db.Index("extraction_cache_tenant_last_used_at_idx", "tenant_id", "last_used_at"),
+    )
+
+    id: Mapped[str] = db.Column(StringUUID, server_default=db.text("uuid_generate_v4()"))
+    tenant_id: Mapped[str] = db.Column(StringUUID, nullable=False)
+    content_hash: Mapped[str] = db.Column(db.String(255), nullable=False)
+    extractor: Mapped[str] = db.Column(db.String(255), nullable=False)
+    storage_key: Mapped[str] = db.Column(db.String(255), nullable=False)
+    size: Mapped[int] = db.Column(db.Integer, nullable=False)
+    created_at: Mapped[datetime] = db.Column(db.DateTime, nullable=False, server_default=func.current_timestamp())
+    last_used_at: Mapped[datetime] = db.Column(db.DateTime, nullable=False, server_default=func.current_timestamp())
+
+
 class ApiRequest(Base):
     __tablename__ = "api_requests"
     __table_args__ = (
@@ -1829,3 +1869,29 @@ class TraceAppConfig(Base):
             "created_at": str(self.created_at) if self.created_at else None,
             "updated_at": str(self.updated_at) if self.updated_at else None,
         }
+
+
+class AppStatisticHourly(db.Model):  # type: ignore[name-defined]
+    """
+    Hourly rollup of app messages and workflow runs, bucketed by UTC hour.
+    Rows are rebuilt by the app statistic compaction task, see AppStatisticRollupService.
+    """
+
+    __tablename__ = "app_statistic_hourly"
+    __table_args__ = (
+        db.PrimaryKeyConstraint("id", name="app_statistic_hourly_pkey"),
+        db.UniqueConstraint("app_id", "hour", name="unique_app_statistic_hourly_app_hour"),
+        db.Index("app_statistic_hourly_hour_idx", "hour"),
+    )
+
+    id = db.Column(StringUUID, server_default=db.text("uuid_generate_v4()"))
+    app_id = db.Column(StringUUID, nullable=False)
+    hour = db.Column(db.DateTime, nullable=False)
+    message_count = db.Column(db.BigInteger, nullable=False, server_default=db.text("0"))
+    message_tokens = db.Column(db.BigInteger, nullable=False, server_default=db.text("0"))
+    answer_tokens = db.Column(db.BigInteger, nullable=False, server_default=db.text("0"))
+    total_price = db.Column(db.Numeric(20, 7), nullable=False, server_default=db.text("0"))
+    provider_response_latency = db.Column(db.Float, nullable=False, server_default=db.text("0"))
+    workflow_run_count = db.Column(db.BigInteger, nullable=False, server_default=db.text("0"))
+    workflow_total_tokens = db.Column(db.BigInteger, nullable=False, server_default=db.text("0"))
+    updated_at = db.Column(db.DateTime, nullable=False, server_default=func.current_timestamp())
@@ -401,8 +401,11 @@ class WorkflowRun(Base):
     __tablename__ = "workflow_runs"
     __table_args__ = (
         db.PrimaryKeyConstraint("id", name="workflow_run_pkey"),
-        db.Index("workflow_run_triggerd_from_idx", "tenant_id", "app_id", "triggered_from"),
+        db.Index(
+            "workflow_run_triggered_from_created_idx", "tenant_id", "app_id", "triggered_from", "created_at", "id"
+        ),
         db.Index("workflow_run_tenant_app_sequence_idx", "tenant_id", "app_id", "sequence_number"),
+        db.Index("workflow_run_created_at_idx", "created_at"),
     )
 
     id: Mapped[str] = mapped_column(StringUUID, server_default=db.text("uuid_generate_v4()"))
@@ -736,7 +739,7 @@ class WorkflowAppLog(Base):
     __tablename__ = "workflow_app_logs"
     __table_args__ = (
         db.PrimaryKeyConstraint("id", name="workflow_app_log_pkey"),
-        db.Index("workflow_app_log_app_idx", "tenant_id", "app_id", "created_at"),
+        db.Index("workflow_app_log_app_created_idx", "tenant_id", "app_id", "created_at", "id"),
         db.Index("workflow_app_log_workflow_run_idx", "workflow_run_id"),
     )
 
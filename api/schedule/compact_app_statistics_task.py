@@ -0,0 +1,17 @@
+import time
+
+import click
+
+import app
+from services.app_statistic_rollup_service import AppStatisticRollupService
+
+
+@app.celery.task(queue="dataset")
+def compact_app_statistics_task():
+    click.echo(click.style("Start compact app statistics.", fg="green"))
+    start_at = time.perf_counter()
+
+    AppStatisticRollupService.compact_recent()
+
+    end_at = time.perf_counter()
+    click.echo(click.style("Compacted app statistics latency: {}".format(end_at - start_at), fg="green"))
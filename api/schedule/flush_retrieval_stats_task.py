@@ -0,0 +1,24 @@
+import time
+
+import click
+
+import app
+from core.rag.retrieval.retrieval_stats_buffer import RetrievalStatsBuffer
+
+
+@app.celery.task(queue="dataset")
+def flush_retrieval_stats_task():
+    click.echo(click.style("Start flush retrieval stats.", fg="green"))
+    start_at = time.perf_counter()
+
+    segment_hits, queries = RetrievalStatsBuffer.flush()
+
+    end_at = time.perf_counter()
+    click.echo(
+        click.style(
+            "Flushed {} segment hits and {} dataset queries, latency: {}".format(
+                segment_hits, queries, end_at - start_at
+            ),
+            fg="green",
+        )
+    )
@@ -51,6 +51,7 @@ from services.errors.account import (
 )
 from services.errors.workspace import WorkSpaceNotAllowedCreateError
 from services.feature_service import FeatureService
+from tasks.clean_extraction_cache_task import clean_extraction_cache_task
 from tasks.delete_account_task import delete_account_task
 from tasks.mail_account_deletion_task import send_account_deletion_verification_code
 from tasks.mail_email_code_login import send_email_code_login_mail_task
@@ -862,9 +863,11 @@ class TenantService:
         """Dissolve tenant"""
         if not TenantService.check_member_permission(tenant, operator, operator, "remove"):
             raise NoPermissionError("No permission to dissolve tenant.")
-        db.session.query(TenantAccountJoin).filter_by(tenant_id=tenant.id).delete()
+        tenant_id = tenant.id
+        db.session.query(TenantAccountJoin).filter_by(tenant_id=tenant_id).delete()
         db.session.delete(tenant)
         db.session.commit()
+        clean_extraction_cache_task.delay(tenant_id)
 
     @staticmethod
     def get_custom_config(tenant_id: str) -> dict:
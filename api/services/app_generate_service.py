@@ -6,6 +6,7 @@ from openai._exceptions import RateLimitError
 from configs import dify_config
 from core.app.apps.advanced_chat.app_generator import AdvancedChatAppGenerator
 from core.app.apps.agent_chat.app_generator import AgentChatAppGenerator
+from core.app.apps.app_generate_executor import AppGenerateExecutor
 from core.app.apps.chat.app_generator import ChatAppGenerator
 from core.app.apps.completion.app_generator import CompletionAppGenerator
 from core.app.apps.workflow.app_generator import WorkflowAppGenerator
@@ -58,6 +59,7 @@ class AppGenerateService:
         request_id = RateLimit.gen_request_key()
         try:
             request_id = rate_limit.enter(request_id)
+            AppGenerateExecutor.get_instance().check_admission()
             if app_model.mode == AppMode.COMPLETION.value:
                 return rate_limit.generate(
                     CompletionAppGenerator.convert_to_event_stream(
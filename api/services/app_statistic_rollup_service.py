@@ -0,0 +1,280 @@
+import logging
+from datetime import UTC, datetime, timedelta
+from typing import Any, Literal, Optional
+
+import pytz
+from sqlalchemy import text
+
+from configs import dify_config
+from extensions.ext_database import db
+from extensions.ext_redis import redis_client
+from models.enums import WorkflowRunTriggeredFrom
+
+logger = logging.getLogger(__name__)
+
+StatisticSource = Literal["messages", "workflow_runs"]
+
+# the rollups cover the UTC hours in [start, end), both are stored as naive UTC datetimes
+ROLLUP_START_KEY = "app_statistic_rollup:start"
+ROLLUP_END_KEY = "app_statistic_rollup:end"
+ROLLUP_LOCK_KEY = "app_statistic_rollup:lock"
+
+_COMPACT_MESSAGES_SQL = """INSERT INTO app_statistic_hourly
+    (app_id, hour, message_count, message_tokens, answer_tokens, total_price, provider_response_latency, updated_at)
+SELECT
+    app_id,
+    DATE_TRUNC('hour', created_at) AS hour,
+    COUNT(*),
+    COALESCE(SUM(message_tokens), 0),
+    COALESCE(SUM(answer_tokens), 0),
+    COALESCE(SUM(total_price), 0),
+    COALESCE(SUM(provider_response_latency), 0),
+    CURRENT_TIMESTAMP
+FROM
+    messages
+WHERE
+    created_at >= :start AND created_at < :end
+GROUP BY app_id, DATE_TRUNC('hour', created_at)"""
+
+_COMPACT_WORKFLOW_RUNS_SQL = """INSERT INTO app_statistic_hourly
+    (app_id, hour, workflow_run_count, workflow_total_tokens, updated_at)
+SELECT
+    app_id,
+    DATE_TRUNC('hour', created_at) AS hour,
+    COUNT(id),
+    COALESCE(SUM(total_tokens), 0),
+    CURRENT_TIMESTAMP
+FROM
+    workflow_runs
+WHERE
+    created_at >= :start AND created_at < :end AND triggered_from = :triggered_from
+GROUP BY app_id, DATE_TRUNC('hour', created_at)
+ON CONFLICT (app_id, hour) DO UPDATE SET
+    workflow_run_count = EXCLUDED.workflow_run_count,
+    workflow_total_tokens = EXCLUDED.workflow_total_tokens,
+    updated_at = EXCLUDED.updated_at"""
+
+_RAW_SQL: dict[str, str] = {
+    "messages": """SELECT
+    DATE(DATE_TRUNC('day', created_at AT TIME ZONE 'UTC' AT TIME ZONE :tz )) AS date,
+    COUNT(*) AS message_count,
+    COALESCE(SUM(message_tokens), 0) AS message_tokens,
+    COALESCE(SUM(answer_tokens), 0) AS answer_tokens,
+    COALESCE(SUM(total_price), 0) AS total_price,
+    COALESCE(SUM(provider_response_latency), 0) AS provider_response_latency
+FROM
+    messages
+WHERE
+    app_id = :app_id""",
+    "workflow_runs": """SELECT
+    DATE(DATE_TRUNC('day', created_at AT TIME ZONE 'UTC' AT TIME ZONE :tz )) AS date,
+    COUNT(id) AS workflow_run_count,
+    COALESCE(SUM(total_tokens), 0) AS workflow_total_tokens
+FROM
+    workflow_runs
+WHERE
+    app_id = :app_id
+    AND triggered_from = :triggered_from""",
+}
+
+_ROLLUP_SQL: dict[str, str] = {
+    "messages": """SELECT
+    DATE(DATE_TRUNC('day', hour AT TIME ZONE 'UTC' AT TIME ZONE :tz )) AS date,
+    CAST(SUM(message_count) AS BIGINT) AS message_count,
+    CAST(SUM(message_tokens) AS BIGINT) AS message_tokens,
+    CAST(SUM(answer_tokens) AS BIGINT) AS answer_tokens,
+    SUM(total_price) AS total_price,
+    SUM(provider_response_latency) AS provider_response_latency
+FROM
+    app_statistic_hourly
+WHERE
+    app_id = :app_id
+    AND message_count > 0""",
+    "workflow_runs": """SELECT
+    DATE(DATE_TRUNC('day', hour AT TIME ZONE 'UTC' AT TIME ZONE :tz )) AS date,
+    CAST(SUM(workflow_run_count) AS BIGINT) AS workflow_run_count,
+    SUM(workflow_total_tokens) AS workflow_total_tokens
+FROM
+    app_statistic_hourly
+WHERE
+    app_id = :app_id
+    AND workflow_run_count > 0""",
+}
+
+
+def _floor_hour(dt: datetime) -> datetime:
+    return dt.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(dt: datetime) -> datetime:
+    floor = _floor_hour(dt)
+    return floor if floor == dt else floor + timedelta(hours=1)
+
+
+def _to_naive_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.astimezone(UTC).replace(tzinfo=None)
+
+
+class AppStatisticRollupService:
+    """
+    Hourly rollups of the additive app statistics (message count, tokens, price, latency, workflow runs).
+
+    Rollups are rebuilt from the messages and workflow_runs tables by a periodic compaction,
+    the daily statistics are re-bucketed from the UTC hours to the timezone of the account,
+    and the hours not covered by the rollups are still aggregated from the raw tables.
+    """
+
+    @staticmethod
+    def get_coverage() -> Optional[tuple[datetime, datetime]]:
+        """
+        Get the UTC hours [start, end) covered by the rollups
+        """
+        start, end = redis_client.mget([ROLLUP_START_KEY, ROLLUP_END_KEY])
+        if not start or not end:
+            return None
+
+        return datetime.fromisoformat(start.decode("utf-8")), datetime.fromisoformat(end.decode("utf-8"))
+
+    @staticmethod
+    def compact(start: datetime, end: datetime) -> None:
+        """
+        Rebuild the rollups of the UTC hours [start, end)
+        :param start: naive UTC datetime aligned to the hour
+        :param end: naive UTC datetime aligned to the hour
+        """
+        params = {"start": start, "end": end, "triggered_from": WorkflowRunTriggeredFrom.APP_RUN.value}
+        with db.engine.begin() as conn:
+            conn.execute(text("DELETE FROM app_statistic_hourly WHERE hour >= :start AND hour < :end"), params)
+            conn.execute(text(_COMPACT_MESSAGES_SQL), params)
+            conn.execute(text(_COMPACT_WORKFLOW_RUNS_SQL), params)
+
+    @classmethod
+    def compact_recent(cls) -> None:
+        """
+        Extend the rollups up to the current hour, rebuilding the last compacted hours on the way
+        """
+        lock = redis_client.lock(ROLLUP_LOCK_KEY, timeout=3600)
+        if not lock.acquire(blocking=False):
+            logger.info("App statistic rollup compaction is already running, skipped")
+            return
+
+        try:
+            now_hour = _floor_hour(datetime.now(UTC).replace(tzinfo=None))
+            lookback = timedelta(hours=dify_config.APP_STATISTIC_ROLLUP_LOOKBACK_HOURS)
+            coverage = cls.get_coverage()
+            start = min(coverage[1], now_hour) - lookback if coverage else now_hour - lookback
+
+            cls.compact(start, now_hour)
+
+            if coverage is None:
+                redis_client.set(ROLLUP_START_KEY, start.isoformat())
+            redis_client.set(ROLLUP_END_KEY, now_hour.isoformat())
+        finally:
+            lock.release()
+
+    @classmethod
+    def backfill(cls, start: datetime) -> None:
+        """
+        Extend the rollups back to the given UTC time, one day per transaction
+        :param start: naive UTC datetime
+        """
+        if cls.get_coverage() is None:
+            cls.compact_recent()
+
+        coverage = cls.get_coverage()
+        if coverage is None:
+            return
+
+        start = _floor_hour(start)
+        chunk_end = coverage[0]
+        while chunk_end > start:
+            chunk_start = max(chunk_end - timedelta(days=1), start)
+            cls.compact(chunk_start, chunk_end)
+            redis_client.set(ROLLUP_START_KEY, chunk_start.isoformat())
+            chunk_end = chunk_start
+
+    @classmethod
+    def get_daily_statistics(
+        cls,
+        source: StatisticSource,
+        app_id: str,
+        timezone: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Optional[list[dict[str, Any]]]:
+        """
+        Get daily sums of the additive statistics of an app in the timezone of the account.
+        Returns None if the rollups can not serve the query, the caller falls back to the raw query.
+        :param source: messages or workflow_runs
+        :param app_id: app id
+        :param timezone: timezone of the account
+        :param start: start time (inclusive)
+        :param end: end time (exclusive)
+        :return: rows ordered by date, each with the date and the sums of the source
+        """
+        if not dify_config.APP_STATISTIC_ROLLUP_ENABLED:
+            return None
+
+        coverage = cls.get_coverage()
+        if coverage is None:
+            return None
+
+        start, end = _to_naive_utc(start), _to_naive_utc(end)
+        rollup_start = _ceil_hour(max(start, coverage[0]) if start else coverage[0])
+        rollup_end = _floor_hour(min(end, coverage[1]) if end else coverage[1])
+        if rollup_start >= rollup_end:
+            return None
+
+        # an hour bucket has to fall into a single local day
+        if not cls._has_whole_hour_offsets(timezone, rollup_start, rollup_end):
+            return None
+
+        arg_dict: dict[str, Any] = {
+            "tz": timezone,
+            "app_id": app_id,
+            "triggered_from": WorkflowRunTriggeredFrom.APP_RUN.value,
+        }
+        queries: list[tuple[str, str, Optional[datetime], Optional[datetime]]] = [
+            (_ROLLUP_SQL[source], "hour", rollup_start, rollup_end)
+        ]
+        if start is None or start < rollup_start:
+            queries.append((_RAW_SQL[source], "created_at", start, rollup_start))
+        if end is None or end > rollup_end:
+            queries.append((_RAW_SQL[source], "created_at", rollup_end, end))
+
+        daily: dict[str, dict[str, Any]] = {}
+        with db.engine.begin() as conn:
+            for sql_query, column, query_start, query_end in queries:
+                query_args = dict(arg_dict)
+                if query_start is not None:
+                    sql_query += f" AND {column} >= :start"
+                    query_args["start"] = query_start
+                if query_end is not None:
+                    sql_query += f" AND {column} < :end"
+                    query_args["end"] = query_end
+                sql_query += " GROUP BY date"
+
+                for row in conn.execute(text(sql_query), query_args):
+                    values = dict(row._mapping)
+                    date = str(values.pop("date"))
+                    if date not in daily:
+                        daily[date] = values
+                    else:
+                        for key, value in values.items():
+                            daily[date][key] += value
+
+        return [{"date": date, **daily[date]} for date in sorted(daily)]
+
+    @staticmethod
+    def _has_whole_hour_offsets(timezone: str, start: datetime, end: datetime) -> bool:
+        tz = pytz.timezone(timezone)
+        day = start
+        while True:
+            offset = pytz.utc.localize(day).astimezone(tz).utcoffset()
+            if offset is None or offset.total_seconds() % 3600:
+                return False
+            if day >= end:
+                return True
+            day = min(day + timedelta(days=1), end)
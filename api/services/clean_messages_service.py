@@ -0,0 +1,152 @@
+import datetime
+import json
+import logging
+import time
+from typing import Any, Optional
+
+from sqlalchemy import literal, tuple_
+
+from extensions.ext_database import db
+from extensions.ext_redis import redis_client
+from models.model import (
+    App,
+    Message,
+    MessageAgentThought,
+    MessageAnnotation,
+    MessageChain,
+    MessageFeedback,
+    MessageFile,
+)
+from models.web import SavedMessage
+from services.feature_service import FeatureService
+
+logger = logging.getLogger(__name__)
+
+# tables holding rows of a message, deleted before the messages themselves
+MESSAGE_CHILD_MODELS: list[Any] = [
+    MessageFeedback,
+    MessageAnnotation,
+    MessageChain,
+    MessageAgentThought,
+    MessageFile,
+    SavedMessage,
+]
+
+
+class CleanMessagesService:
+    """
+    Purge the expired messages of sandbox plan workspaces.
+
+    Messages are walked in (created_at, id) order in batches, the rows of a batch are deleted with one
+    statement per table and committed together. The position of the last batch is kept in redis,
+    so an interrupted run resumes where it stopped instead of starting over.
+    """
+
+    WATERMARK_KEY = "clean_messages:watermark"
+
+    @classmethod
+    def clean_sandbox_messages(cls, before: datetime.datetime, batch_size: int = 1000) -> dict[str, int]:
+        """
+        Delete the messages of sandbox plan workspaces created before the given time
+        :param before: messages created before this time are expired
+        :param batch_size: number of messages scanned per batch
+        :return: number of scanned messages and deleted rows
+        """
+        start_at = time.perf_counter()
+        watermark = cls._get_watermark()
+        plans: dict[str, str] = {}
+        scanned = deleted_messages = deleted_rows = 0
+
+        while True:
+            query = db.session.query(Message.id, Message.app_id, Message.created_at).filter(Message.created_at < before)
+            if watermark:
+                created_at, message_id = watermark
+                query = query.filter(
+                    tuple_(Message.created_at, Message.id) > tuple_(literal(created_at), literal(message_id))
+                )
+            messages = query.order_by(Message.created_at, Message.id).limit(batch_size).all()
+            if not messages:
+                break
+
+            message_ids = cls._filter_sandbox_message_ids(messages, plans)
+            rows = cls._delete_messages(message_ids)
+
+            db.session.commit()
+
+            watermark = (messages[-1].created_at, messages[-1].id)
+            cls._set_watermark(watermark)
+
+            scanned += len(messages)
+            deleted_messages += len(message_ids)
+            deleted_rows += rows
+            elapsed = time.perf_counter() - start_at
+            logger.info(
+                f"Cleaned messages batch, scanned: {scanned}, deleted messages: {deleted_messages}, "
+                f"deleted rows: {deleted_rows}, {deleted_rows / elapsed:.1f} rows/s"
+            )
+
+        # the run is complete, the next one starts from the oldest message again
+        redis_client.delete(cls.WATERMARK_KEY)
+
+        return {"scanned": scanned, "deleted_messages": deleted_messages, "deleted_rows": deleted_rows}
+
+    @classmethod
+    def _filter_sandbox_message_ids(cls, messages: list, plans: dict[str, str]) -> list[str]:
+        """
+        Get the ids of the messages owned by sandbox plan workspaces
+        :param messages: rows of message id, app id and created at
+        :param plans: subscription plan by tenant id, filled as the tenants are resolved
+        """
+        app_ids = {message.app_id for message in messages}
+        app_tenants = dict(db.session.query(App.id, App.tenant_id).filter(App.id.in_(app_ids)).all())
+
+        for tenant_id in set(app_tenants.values()) - plans.keys():
+            plans[tenant_id] = cls._get_plan(tenant_id)
+
+        return [
+            message.id
+            for message in messages
+            if message.app_id in app_tenants and plans[app_tenants[message.app_id]] == "sandbox"
+        ]
+
+    @staticmethod
+    def _get_plan(tenant_id: str) -> str:
+        features_cache_key = f"features:{tenant_id}"
+        plan_cache = redis_client.get(features_cache_key)
+        if plan_cache is not None:
+            plan: str = plan_cache.decode()
+            return plan
+
+        features = FeatureService.get_features(tenant_id)
+        plan = features.billing.subscription.plan
+        redis_client.setex(features_cache_key, 600, plan)
+        return plan
+
+    @staticmethod
+    def _delete_messages(message_ids: list[str]) -> int:
+        """
+        Delete messages and their child rows, without committing
+        :return: number of deleted rows
+        """
+        if not message_ids:
+            return 0
+
+        rows = 0
+        for model in MESSAGE_CHILD_MODELS:
+            rows += db.session.query(model).filter(model.message_id.in_(message_ids)).delete(synchronize_session=False)
+        rows += db.session.query(Message).filter(Message.id.in_(message_ids)).delete(synchronize_session=False)
+        return rows
+
+    @classmethod
+    def _get_watermark(cls) -> Optional[tuple[datetime.datetime, str]]:
+        watermark = redis_client.get(cls.WATERMARK_KEY)
+        if not watermark:
+            return None
+
+        data = json.loads(watermark)
+        return datetime.datetime.fromisoformat(data["created_at"]), data["id"]
+
+    @classmethod
+    def _set_watermark(cls, watermark: tuple[datetime.datetime, str]) -> None:
+        created_at, message_id = watermark
+        redis_client.set(cls.WATERMARK_KEY, json.dumps({"created_at": created_at.isoformat(), "id": message_id}))
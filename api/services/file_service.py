@@ -1,8 +1,11 @@
+import codecs
 import datetime
 import hashlib
+import io
+import logging
 import os
 import uuid
-from typing import Any, Literal, Union
+from typing import IO, Any, Literal, Optional, Union, cast
 
 from flask_login import current_user  # type: ignore
 from werkzeug.exceptions import NotFound
@@ -26,6 +29,37 @@ from .errors.file import FileTooLargeError, UnsupportedFileTypeError
 
 PREVIEW_WORDS_LIMIT = 3000
 
+logger = logging.getLogger(__name__)
+
+
+class _UploadStreamReader(io.RawIOBase):
+    """
+    Reader of an uploaded file stream, computing its size and hash while the storage reads it,
+    and failing as soon as the size limit is exceeded.
+    """
+
+    def __init__(self, stream: IO[bytes], size_limit: int):
+        self._stream = stream
+        self._size_limit = size_limit
+        self.size = 0
+        self.hash = hashlib.sha3_256()
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        chunk = self._stream.read(size if size is not None else -1)
+        self.size += len(chunk)
+        if self.size > self._size_limit:
+            raise FileTooLargeError
+        self.hash.update(chunk)
+        return chunk
+
+    def readinto(self, buffer) -> int:
+        chunk = self.read(len(buffer))
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
 
 class FileService:
     @staticmethod
@@ -38,6 +72,28 @@ class FileService:
         source: Literal["datasets"] | None = None,
         source_url: str = "",
     ) -> UploadFile:
+        return FileService.upload_file_stream(
+            filename=filename,
+            stream=io.BytesIO(content),
+            mimetype=mimetype,
+            user=user,
+            source=source,
+            source_url=source_url,
+        )
+
+    @staticmethod
+    def upload_file_stream(
+        *,
+        filename: str,
+        stream: IO[bytes],
+        mimetype: str,
+        user: Union[Account, EndUser, Any],
+        source: Literal["datasets"] | None = None,
+        source_url: str = "",
+    ) -> UploadFile:
+        """
+        Upload a file from a readable binary stream, which is written to the storage in chunks
+        """
         # get file extension
         extension = os.path.splitext(filename)[1].lstrip(".").lower()
 
@@ -51,12 +107,14 @@ class FileService:
         if source == "datasets" and extension not in DOCUMENT_EXTENSIONS:
             raise UnsupportedFileTypeError()
 
-        # get file size
-        file_size = len(content)
-
-        # check if the file size is exceeded
-        if not FileService.is_file_size_within_limit(extension=extension, file_size=file_size):
-            raise FileTooLargeError
+        # check if the file size is exceeded, before the file is read if its size is known
+        file_size_limit = FileService.get_file_size_limit(extension=extension)
+        if stream.seekable():
+            position = stream.tell()
+            size = stream.seek(0, os.SEEK_END) - position
+            stream.seek(position)
+            if size > file_size_limit:
+                raise FileTooLargeError
 
         # generate file key
         file_uuid = str(uuid.uuid4())
@@ -70,7 +128,18 @@ class FileService:
         file_key = "upload_files/" + (current_tenant_id or "") + "/" + file_uuid + "." + extension
 
         # save file to storage
-        storage.save(file_key, content)
+        reader = _UploadStreamReader(stream, file_size_limit)
+        try:
+            storage.save_stream(file_key, cast(IO[bytes], reader))
+        except Exception as e:
+            # remove the partially written file
+            try:
+                storage.delete(file_key)
+            except Exception:
+                logger.warning(f"Failed to delete the partial upload {file_key}")
+            if isinstance(e, FileTooLargeError) or isinstance(e.__cause__, FileTooLargeError):
+                raise FileTooLargeError
+            raise
 
         # save file to db
         upload_file = UploadFile(
@@ -78,14 +147,14 @@ class FileService:
             storage_type=dify_config.STORAGE_TYPE,
             key=file_key,
             name=filename,
-            size=file_size,
+            size=reader.size,
             extension=extension,
             mime_type=mimetype,
             created_by_role=(CreatedByRole.ACCOUNT if isinstance(user, Account) else CreatedByRole.END_USER),
             created_by=user.id,
             created_at=datetime.datetime.now(datetime.UTC).replace(tzinfo=None),
             used=False,
-            hash=hashlib.sha3_256(content).hexdigest(),
+            hash=reader.hash.hexdigest(),
             source_url=source_url,
         )
 
@@ -100,17 +169,19 @@ class FileService:
         return upload_file
 
     @staticmethod
-    def is_file_size_within_limit(*, extension: str, file_size: int) -> bool:
+    def get_file_size_limit(*, extension: str) -> int:
         if extension in IMAGE_EXTENSIONS:
-            file_size_limit = dify_config.UPLOAD_IMAGE_FILE_SIZE_LIMIT * 1024 * 1024
+            return dify_config.UPLOAD_IMAGE_FILE_SIZE_LIMIT * 1024 * 1024
         elif extension in VIDEO_EXTENSIONS:
-            file_size_limit = dify_config.UPLOAD_VIDEO_FILE_SIZE_LIMIT * 1024 * 1024
+            return dify_config.UPLOAD_VIDEO_FILE_SIZE_LIMIT * 1024 * 1024
         elif extension in AUDIO_EXTENSIONS:
-            file_size_limit = dify_config.UPLOAD_AUDIO_FILE_SIZE_LIMIT * 1024 * 1024
+            return dify_config.UPLOAD_AUDIO_FILE_SIZE_LIMIT * 1024 * 1024
         else:
-            file_size_limit = dify_config.UPLOAD_FILE_SIZE_LIMIT * 1024 * 1024
+            return dify_config.UPLOAD_FILE_SIZE_LIMIT * 1024 * 1024
 
-        return file_size <= file_size_limit
+    @staticmethod
+    def is_file_size_within_limit(*, extension: str, file_size: int) -> bool:
+        return file_size <= FileService.get_file_size_limit(extension=extension)
 
     @staticmethod
     def upload_text(text: str, text_name: str) -> UploadFile:
@@ -157,11 +228,30 @@ class FileService:
         if extension.lower() not in DOCUMENT_EXTENSIONS:
             raise UnsupportedFileTypeError()
 
+        if extension.lower() == "txt":
+            # plain text is extracted as is, only the head of the file is needed
+            preview = FileService._get_plain_text_preview(upload_file.key)
+            if preview is not None:
+                return preview
+
         text = ExtractProcessor.load_from_upload_file(upload_file, return_text=True)
         text = text[0:PREVIEW_WORDS_LIMIT] if text else ""
 
         return text
 
+    @staticmethod
+    def _get_plain_text_preview(key: str) -> Optional[str]:
+        # a character is at most 4 bytes in utf-8, the extra byte completes a trailing \r\n
+        head_size = PREVIEW_WORDS_LIMIT * 4 + 1
+        head = storage.load_range(key, 0, head_size)
+        try:
+            text = codecs.getincrementaldecoder("utf-8")().decode(head, final=len(head) < head_size)
+        except UnicodeDecodeError:
+            # other encodings are detected by the extractor
+            return None
+        # text mode reads of the extractor translate newlines
+        return text.replace("\r\n", "\n").replace("\r", "\n")[0:PREVIEW_WORDS_LIMIT]
+
     @staticmethod
     def get_image_preview(file_id: str, timestamp: str, nonce: str, sign: str):
         result = file_helpers.verify_image_signature(
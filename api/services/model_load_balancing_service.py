@@ -7,7 +7,11 @@ from typing import Optional, Union
 from constants import HIDDEN_VALUE
 from core.entities.provider_configuration import ProviderConfiguration
 from core.helper import encrypter
-from core.helper.model_provider_cache import ProviderCredentialsCache, ProviderCredentialsCacheType
+from core.helper.model_provider_cache import (
+    ProviderConfigurationsCache,
+    ProviderCredentialsCache,
+    ProviderCredentialsCacheType,
+)
 from core.model_manager import LBModelManager
 from core.model_runtime.entities.model_entities import ModelType
 from core.model_runtime.entities.provider_entities import (
@@ -277,6 +281,8 @@ class ModelLoadBalancingService:
         db.session.add(inherit_config)
         db.session.commit()
 
+        ProviderConfigurationsCache(tenant_id=tenant_id).delete()
+
         return inherit_config
 
     def update_load_balancing_configs(
@@ -320,38 +326,76 @@ class ModelLoadBalancingService:
         current_load_balancing_configs_dict = {config.id: config for config in current_load_balancing_configs}
         updated_config_ids = set()
 
-        for config in configs:
-            if not isinstance(config, dict):
-                raise ValueError("Invalid load balancing config")
+        # configs are committed one by one, the cache is invalidated even if a later one is invalid
+        try:
+            for config in configs:
+                if not isinstance(config, dict):
+                    raise ValueError("Invalid load balancing config")
+
+                config_id = config.get("id")
+                name = config.get("name")
+                credentials = config.get("credentials")
+                enabled = config.get("enabled")
+
+                if not name:
+                    raise ValueError("Invalid load balancing config name")
+
+                if enabled is None:
+                    raise ValueError("Invalid load balancing config enabled")
+
+                # is config exists
+                if config_id:
+                    config_id = str(config_id)
 
-            config_id = config.get("id")
-            name = config.get("name")
-            credentials = config.get("credentials")
-            enabled = config.get("enabled")
+                    if config_id not in current_load_balancing_configs_dict:
+                        raise ValueError("Invalid load balancing config id: {}".format(config_id))
 
-            if not name:
-                raise ValueError("Invalid load balancing config name")
+                    updated_config_ids.add(config_id)
 
-            if enabled is None:
-                raise ValueError("Invalid load balancing config enabled")
+                    load_balancing_config = current_load_balancing_configs_dict[config_id]
 
-            # is config exists
-            if config_id:
-                config_id = str(config_id)
+                    # check duplicate name
+                    for current_load_balancing_config in current_load_balancing_configs:
+                        if current_load_balancing_config.id != config_id and current_load_balancing_config.name == name:
+                            raise ValueError("Load balancing config name {} already exists".format(name))
 
-                if config_id not in current_load_balancing_configs_dict:
-                    raise ValueError("Invalid load balancing config id: {}".format(config_id))
+                    if credentials:
+                        if not isinstance(credentials, dict):
+                            raise ValueError("Invalid load balancing config credentials")
 
-                updated_config_ids.add(config_id)
+                        # validate custom provider config
+                        credentials = self._custom_credentials_validate(
+                            tenant_id=tenant_id,
+                            provider_configuration=provider_configuration,
+                            model_type=model_type_enum,
+                            model=model,
+                            credentials=credentials,
+                            load_balancing_model_config=load_balancing_config,
+                            validate=False,
+                        )
+
+                        # update load balancing config
+                        load_balancing_config.encrypted_config = json.dumps(credentials)
+
+                    load_balancing_config.name = name
+                    load_balancing_config.enabled = enabled
+                    load_balancing_config.updated_at = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+                    db.session.commit()
+
+                    self._clear_credentials_cache(tenant_id, config_id)
+                else:
+                    # create load balancing config
+                    if name == "__inherit__":
+                        raise ValueError("Invalid load balancing config name")
 
-                load_balancing_config = current_load_balancing_configs_dict[config_id]
+                    # check duplicate name
+                    for current_load_balancing_config in current_load_balancing_configs:
+                        if current_load_balancing_config.name == name:
+                            raise ValueError("Load balancing config name {} already exists".format(name))
 
-                # check duplicate name
-                for current_load_balancing_config in current_load_balancing_configs:
-                    if current_load_balancing_config.id != config_id and current_load_balancing_config.name == name:
-                        raise ValueError("Load balancing config name {} already exists".format(name))
+                    if not credentials:
+                        raise ValueError("Invalid load balancing config credentials")
 
-                if credentials:
                     if not isinstance(credentials, dict):
                         raise ValueError("Invalid load balancing config credentials")
 
@@ -362,65 +406,31 @@ class ModelLoadBalancingService:
                         model_type=model_type_enum,
                         model=model,
                         credentials=credentials,
-                        load_balancing_model_config=load_balancing_config,
                         validate=False,
                     )
 
-                    # update load balancing config
-                    load_balancing_config.encrypted_config = json.dumps(credentials)
-
-                load_balancing_config.name = name
-                load_balancing_config.enabled = enabled
-                load_balancing_config.updated_at = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
-                db.session.commit()
-
-                self._clear_credentials_cache(tenant_id, config_id)
-            else:
-                # create load balancing config
-                if name == "__inherit__":
-                    raise ValueError("Invalid load balancing config name")
-
-                # check duplicate name
-                for current_load_balancing_config in current_load_balancing_configs:
-                    if current_load_balancing_config.name == name:
-                        raise ValueError("Load balancing config name {} already exists".format(name))
-
-                if not credentials:
-                    raise ValueError("Invalid load balancing config credentials")
-
-                if not isinstance(credentials, dict):
-                    raise ValueError("Invalid load balancing config credentials")
-
-                # validate custom provider config
-                credentials = self._custom_credentials_validate(
-                    tenant_id=tenant_id,
-                    provider_configuration=provider_configuration,
-                    model_type=model_type_enum,
-                    model=model,
-                    credentials=credentials,
-                    validate=False,
-                )
+                    # create load balancing config
+                    load_balancing_model_config = LoadBalancingModelConfig(
+                        tenant_id=tenant_id,
+                        provider_name=provider_configuration.provider.provider,
+                        model_type=model_type_enum.to_origin_model_type(),
+                        model_name=model,
+                        name=name,
+                        encrypted_config=json.dumps(credentials),
+                    )
 
-                # create load balancing config
-                load_balancing_model_config = LoadBalancingModelConfig(
-                    tenant_id=tenant_id,
-                    provider_name=provider_configuration.provider.provider,
-                    model_type=model_type_enum.to_origin_model_type(),
-                    model_name=model,
-                    name=name,
-                    encrypted_config=json.dumps(credentials),
-                )
+                    db.session.add(load_balancing_model_config)
+                    db.session.commit()
 
-                db.session.add(load_balancing_model_config)
+            # get deleted config ids
+            deleted_config_ids = set(current_load_balancing_configs_dict.keys()) - updated_config_ids
+            for config_id in deleted_config_ids:
+                db.session.delete(current_load_balancing_configs_dict[config_id])
                 db.session.commit()
 
-        # get deleted config ids
-        deleted_config_ids = set(current_load_balancing_configs_dict.keys()) - updated_config_ids
-        for config_id in deleted_config_ids:
-            db.session.delete(current_load_balancing_configs_dict[config_id])
-            db.session.commit()
-
-            self._clear_credentials_cache(tenant_id, config_id)
+                self._clear_credentials_cache(tenant_id, config_id)
+        finally:
+            ProviderConfigurationsCache(tenant_id=tenant_id).delete()
 
     def validate_load_balancing_credentials(
         self,
@@ -4,6 +4,7 @@ from datetime import datetime
 from sqlalchemy import and_, func, or_, select
 from sqlalchemy.orm import Session
 
+from libs.keyset_pagination import paginate_by_last_id
 from models import App, EndUser, WorkflowAppLog, WorkflowRun
 from models.enums import CreatedByRole
 from models.workflow import WorkflowRunStatus
@@ -22,6 +23,8 @@ class WorkflowAppService:
         created_at_after: datetime | None = None,
         page: int = 1,
         limit: int = 20,
+        last_id: str | None = None,
+        with_count: bool = True,
     ) -> dict:
         """
         Get paginate workflow app logs using SQLAlchemy 2.0 style
@@ -31,8 +34,10 @@ class WorkflowAppService:
         :param status: filter by status
         :param created_at_before: filter logs created before this timestamp
         :param created_at_after: filter logs created after this timestamp
-        :param page: page number
+        :param page: page number, ignored if last_id is given
         :param limit: items per page
+        :param last_id: id of the last log of the previous page, pages by keyset instead of offset if given
+        :param with_count: whether to count the total, keyset pages are never counted
         :return: Pagination object
         """
         # Build base statement using SQLAlchemy 2.0 style
@@ -74,15 +79,31 @@ class WorkflowAppService:
 
         stmt = stmt.order_by(WorkflowAppLog.created_at.desc())
 
-        # Get total count using the same filters
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total = session.scalar(count_stmt) or 0
+        total = None
+        if last_id:
+            pagination = paginate_by_last_id(
+                stmt,
+                id_column=WorkflowAppLog.id,
+                order_column=WorkflowAppLog.created_at,
+                last_id=last_id,
+                limit=limit,
+                session=session,
+            )
+            items, has_more = pagination.items, pagination.has_next
+        else:
+            if with_count:
+                # Get total count using the same filters
+                count_stmt = select(func.count()).select_from(stmt.subquery())
+                total = session.scalar(count_stmt) or 0
+
+            # Apply pagination limits, fetching one more row to know whether there is a next page
+            offset_stmt = stmt.order_by(WorkflowAppLog.id.desc()).offset((page - 1) * limit).limit(limit + 1)
+
+            # Execute query and get items
+            items = list(session.scalars(offset_stmt).all())
+            has_more = len(items) > limit
+            items = items[:limit]
 
-        # Apply pagination limits
-        offset_stmt = stmt.offset((page - 1) * limit).limit(limit)
-
-        # Execute query and get items
-        items = list(session.scalars(offset_stmt).all())
         OperationRecordLog.Operation_log(
             app_model,
             "query",
@@ -90,10 +111,10 @@ class WorkflowAppService:
             "查看workflow"
         )
         return {
-            "page": page,
+            "page": None if last_id else page,
             "limit": limit,
             "total": total,
-            "has_more": total > page * limit,
+            "has_more": has_more,
             "data": items,
         }
 
@@ -1,6 +1,8 @@
 import threading
 from typing import Optional
 
+from sqlalchemy import literal, tuple_
+
 import contexts
 from core.workflow.repository import RepositoryFactory
 from core.workflow.repository.workflow_node_execution_repository import OrderConfig
@@ -65,6 +67,7 @@ class WorkflowRunService:
             WorkflowRun.triggered_from == WorkflowRunTriggeredFrom.DEBUGGING.value,
         )
 
+        query = base_query
         if args.get("last_id"):
             last_workflow_run = base_query.filter(
                 WorkflowRun.id == args.get("last_id"),
@@ -73,29 +76,15 @@ class WorkflowRunService:
             if not last_workflow_run:
                 raise ValueError("Last workflow run not exists")
 
-            workflow_runs = (
-                base_query.filter(
-                    WorkflowRun.created_at < last_workflow_run.created_at, WorkflowRun.id != last_workflow_run.id
-                )
-                .order_by(WorkflowRun.created_at.desc())
-                .limit(limit)
-                .all()
+            query = base_query.filter(
+                tuple_(WorkflowRun.created_at, WorkflowRun.id)
+                < tuple_(literal(last_workflow_run.created_at), literal(last_workflow_run.id))
             )
-        else:
-            workflow_runs = base_query.order_by(WorkflowRun.created_at.desc()).limit(limit).all()
-
-        has_more = False
-        if len(workflow_runs) == limit:
-            current_page_first_workflow_run = workflow_runs[-1]
-            rest_count = base_query.filter(
-                WorkflowRun.created_at < current_page_first_workflow_run.created_at,
-                WorkflowRun.id != current_page_first_workflow_run.id,
-            ).count()
 
-            if rest_count > 0:
-                has_more = True
+        # fetch one more row to know whether there is a next page, instead of counting the rest
+        workflow_runs = query.order_by(WorkflowRun.created_at.desc(), WorkflowRun.id.desc()).limit(limit + 1).all()
 
-        return InfiniteScrollPagination(data=workflow_runs, limit=limit, has_more=has_more)
+        return InfiniteScrollPagination(data=workflow_runs[:limit], limit=limit, has_more=len(workflow_runs) > limit)
 
     def get_workflow_run(self, app_model: App, run_id: str) -> Optional[WorkflowRun]:
         """
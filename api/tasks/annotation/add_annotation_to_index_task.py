@@ -4,6 +4,7 @@ import time
 import click
 from celery import shared_task  # type: ignore
 
+from core.app.features.annotation_reply.annotation_index import AnnotationIndexManager
 from core.rag.datasource.vdb.vector_factory import Vector
 from core.rag.models.document import Document
 from extensions.ext_database import db
@@ -57,4 +58,5 @@ def add_annotation_to_index_task(
     except Exception:
         logging.exception("Build index for annotation failed")
     finally:
+        AnnotationIndexManager.invalidate(app_id)
         db.session.close()
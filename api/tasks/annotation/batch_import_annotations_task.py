@@ -5,6 +5,7 @@ import click
 from celery import shared_task  # type: ignore
 from werkzeug.exceptions import NotFound
 
+from core.app.features.annotation_reply.annotation_index import AnnotationIndexManager
 from core.rag.datasource.vdb.vector_factory import Vector
 from core.rag.models.document import Document
 from extensions.ext_database import db
@@ -89,4 +90,5 @@ def batch_import_annotations_task(job_id: str, content_list: list[dict], app_id:
             redis_client.setex(indexing_error_msg_key, 600, str(e))
             logging.exception("Build index for batch import annotations failed")
         finally:
+            AnnotationIndexManager.invalidate(app_id)
             db.session.close()
@@ -4,6 +4,7 @@ import time
 import click
 from celery import shared_task  # type: ignore
 
+from core.app.features.annotation_reply.annotation_index import AnnotationIndexManager
 from core.rag.datasource.vdb.vector_factory import Vector
 from extensions.ext_database import db
 from models.dataset import Dataset
@@ -41,4 +42,5 @@ def delete_annotation_index_task(annotation_id: str, app_id: str, tenant_id: str
     except Exception as e:
         logging.exception("Annotation deleted index failed")
     finally:
+        AnnotationIndexManager.invalidate(app_id)
         db.session.close()
@@ -4,6 +4,7 @@ import time
 import click
 from celery import shared_task  # type: ignore
 
+from core.app.features.annotation_reply.annotation_index import AnnotationIndexManager
 from core.rag.datasource.vdb.vector_factory import Vector
 from extensions.ext_database import db
 from extensions.ext_redis import redis_client
@@ -69,4 +70,5 @@ def disable_annotation_reply_task(job_id: str, app_id: str, tenant_id: str):
         redis_client.setex(disable_app_annotation_error_key, 600, str(e))
     finally:
         redis_client.delete(disable_app_annotation_key)
+        AnnotationIndexManager.invalidate(app_id)
         db.session.close()
@@ -5,6 +5,7 @@ import time
 import click
 from celery import shared_task  # type: ignore
 
+from core.app.features.annotation_reply.annotation_index import AnnotationIndexManager
 from core.rag.datasource.vdb.vector_factory import Vector
 from core.rag.models.document import Document
 from extensions.ext_database import db
@@ -122,4 +123,5 @@ def enable_annotation_reply_task(
         db.session.rollback()
     finally:
         redis_client.delete(enable_app_annotation_key)
+        AnnotationIndexManager.invalidate(app_id)
         db.session.close()
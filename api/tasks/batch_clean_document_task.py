@@ -4,6 +4,7 @@ import time
 import click
 from celery import shared_task  # type: ignore
 
+from core.rag.extractor import extraction_cache
 from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
 from core.tools.utils.web_reader_tool import get_image_upload_file_ids
 from extensions.ext_database import db
@@ -57,6 +58,7 @@ def batch_clean_document_task(document_ids: list[str], dataset_id: str, doc_form
             db.session.commit()
         if file_ids:
             files = db.session.query(UploadFile).filter(UploadFile.id.in_(file_ids)).all()
+            content_hashes = [file.hash for file in files if file.hash]
             for file in files:
                 try:
                     storage.delete(file.key)
@@ -64,6 +66,7 @@ def batch_clean_document_task(document_ids: list[str], dataset_id: str, doc_form
                     logging.exception("Delete file failed when document deleted, file_id: {}".format(file.id))
                 db.session.delete(file)
             db.session.commit()
+            extraction_cache.delete(dataset.tenant_id, content_hashes)
 
         end_at = time.perf_counter()
         logging.info(
@@ -4,6 +4,7 @@ import time
 import click
 from celery import shared_task  # type: ignore
 
+from core.rag.extractor import extraction_cache
 from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
 from core.tools.utils.rag_web_reader import get_image_upload_file_ids
 from extensions.ext_database import db
@@ -92,6 +93,7 @@ def clean_dataset_task(
         db.session.query(DatasetMetadata).filter(DatasetMetadata.dataset_id == dataset_id).delete()
         db.session.query(DatasetMetadataBinding).filter(DatasetMetadataBinding.dataset_id == dataset_id).delete()
         # delete files
+        content_hashes = []
         if documents:
             for document in documents:
                 try:
@@ -107,12 +109,15 @@ def clean_dataset_task(
                                 )
                                 if not file:
                                     continue
+                                if file.hash:
+                                    content_hashes.append(file.hash)
                                 storage.delete(file.key)
                                 db.session.delete(file)
                 except Exception:
                     continue
 
         db.session.commit()
+        extraction_cache.delete(tenant_id, content_hashes)
         end_at = time.perf_counter()
         logging.info(
             click.style(
@@ -5,6 +5,7 @@ from typing import Optional
 import click
 from celery import shared_task  # type: ignore
 
+from core.rag.extractor import extraction_cache
 from core.rag.index_processor.index_processor_factory import IndexProcessorFactory
 from core.tools.utils.rag_web_reader import get_image_upload_file_ids
 from extensions.ext_database import db
@@ -60,12 +61,15 @@ def clean_document_task(document_id: str, dataset_id: str, doc_form: str, file_i
         if file_id:
             file = db.session.query(UploadFile).filter(UploadFile.id == file_id).first()
             if file:
+                tenant_id, content_hash = file.tenant_id, file.hash
                 try:
                     storage.delete(file.key)
                 except Exception:
                     logging.exception("Delete file failed when document deleted, file_id: {}".format(file_id))
                 db.session.delete(file)
                 db.session.commit()
+                if content_hash:
+                    extraction_cache.delete(tenant_id, [content_hash])
 
         # delete dataset metadata binding
         db.session.query(DatasetMetadataBinding).filter(
@@ -0,0 +1,30 @@
+import logging
+import time
+
+import click
+from celery import shared_task  # type: ignore
+
+from core.rag.extractor import extraction_cache
+
+
+@shared_task(queue="dataset")
+def clean_extraction_cache_task(tenant_id: str):
+    """
+    Clean the extraction results of a tenant when the tenant is dissolved.
+    :param tenant_id: tenant id
+
+    Usage: clean_extraction_cache_task.delay(tenant_id)
+    """
+    logging.info(click.style("Start clean extraction cache of tenant: {}".format(tenant_id), fg="green"))
+    start_at = time.perf_counter()
+
+    try:
+        extraction_cache.delete(tenant_id)
+        end_at = time.perf_counter()
+        logging.info(
+            click.style(
+                "Cleaned extraction cache of tenant: {} latency: {}".format(tenant_id, end_at - start_at), fg="green"
+            )
+        )
+    except Exception:
+        logging.exception("Clean extraction cache of tenant failed")
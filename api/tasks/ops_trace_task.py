@@ -4,7 +4,7 @@ import logging
 from celery import shared_task  # type: ignore
 from flask import current_app
 
-from core.ops.entities.config_entity import OPS_FILE_PATH, OPS_TRACE_FAILED_KEY
+from core.ops.entities.config_entity import OPS_BATCH_DIR, OPS_FILE_PATH, OPS_TRACE_FAILED_KEY
 from core.ops.entities.trace_entity import trace_info_info_map
 from core.rag.models.document import Document
 from extensions.ext_redis import redis_client
@@ -19,24 +19,52 @@ def process_trace_tasks(file_info):
     Async process trace tasks
     Usage: process_trace_tasks.delay(tasks_data)
     """
+    file_id = file_info.get("file_id")
+    if file_info.get("batch"):
+        # one NDJSON file holding every trace of a flush window
+        file_path = f"{OPS_FILE_PATH}{OPS_BATCH_DIR}{file_id}.jsonl"
+        try:
+            file_data_list = [json.loads(line) for line in storage.load(file_path).splitlines() if line.strip()]
+        except Exception:
+            logging.exception(f"Failed to load trace batch, file_id: {file_id}")
+            return
+    else:
+        file_path = f"{OPS_FILE_PATH}{file_info.get('app_id')}/{file_id}.json"
+        file_data_list = [json.loads(storage.load(file_path))]
+
+    trace_instances: dict = {}
+    try:
+        for file_data in file_data_list:
+            process_trace_task(file_data, trace_instances)
+    finally:
+        storage.delete(file_path)
+
+
+def process_trace_task(file_data: dict, trace_instances: dict):
+    """
+    Process one trace task
+    :param file_data: serialized task data
+    :param trace_instances: trace instances resolved so far, keyed by app id
+    """
     from core.ops.ops_trace_manager import OpsTraceManager
 
-    app_id = file_info.get("app_id")
-    file_id = file_info.get("file_id")
-    file_path = f"{OPS_FILE_PATH}{app_id}/{file_id}.json"
-    file_data = json.loads(storage.load(file_path))
-    trace_info = file_data.get("trace_info")
-    trace_info_type = file_data.get("trace_info_type")
-    trace_instance = OpsTraceManager.get_ops_trace_instance(app_id)
-
-    if trace_info.get("message_data"):
-        trace_info["message_data"] = Message.from_dict(data=trace_info["message_data"])
-    if trace_info.get("workflow_data"):
-        trace_info["workflow_data"] = WorkflowRun.from_dict(data=trace_info["workflow_data"])
-    if trace_info.get("documents"):
-        trace_info["documents"] = [Document(**doc) for doc in trace_info["documents"]]
+    app_id = file_data["app_id"]
+    trace_info = file_data["trace_info"]
+    trace_info_type = file_data["trace_info_type"]
 
     try:
+        # resolved inside the try so that one app with a broken tracing config does not abort the whole batch
+        if app_id not in trace_instances:
+            trace_instances[app_id] = OpsTraceManager.get_ops_trace_instance(app_id)
+        trace_instance = trace_instances[app_id]
+
+        if trace_info.get("message_data"):
+            trace_info["message_data"] = Message.from_dict(data=trace_info["message_data"])
+        if trace_info.get("workflow_data"):
+            trace_info["workflow_data"] = WorkflowRun.from_dict(data=trace_info["workflow_data"])
+        if trace_info.get("documents"):
+            trace_info["documents"] = [Document(**doc) for doc in trace_info["documents"]]
+
         if trace_instance:
             with current_app.app_context():
                 trace_type = trace_info_info_map.get(trace_info_type)
@@ -51,5 +79,3 @@ def process_trace_tasks(file_info):
         failed_key = f"{OPS_TRACE_FAILED_KEY}_{app_id}"
         redis_client.incr(failed_key)
         logging.info(f"Processing trace tasks failed, app_id: {app_id}")
-    finally:
-        storage.delete(file_path)
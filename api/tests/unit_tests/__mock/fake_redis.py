@@ -0,0 +1,98 @@
+from typing import Any
+from unittest.mock import MagicMock
+
+from redis.exceptions import ResponseError
+
+
+class FakePipeline:
+    """Pipeline running the queued commands on the fake client on execute"""
+
+    def __init__(self, client: "FakeRedis"):
+        self.client = client
+        self.commands: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return command
+
+    def execute(self):
+        commands, self.commands = self.commands, []
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+
+class FakeRedis:
+    """In-memory client of the redis commands used by the unit tests, values are stored as bytes"""
+
+    def __init__(self):
+        self.data: dict[str, Any] = {}
+
+    @staticmethod
+    def _encode(value) -> bytes:
+        return value if isinstance(value, bytes) else str(value).encode("utf-8")
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def lock(self, name, timeout=None, **kwargs):
+        return MagicMock(acquire=MagicMock(return_value=True))
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = self._encode(value)
+        return True
+
+    def setex(self, key, ttl, value):
+        return self.set(key, value)
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def exists(self, *keys):
+        return sum(key in self.data for key in keys)
+
+    def expire(self, key, ttl):
+        return key in self.data
+
+    def rename(self, key, new_key):
+        if key not in self.data:
+            raise ResponseError("no such key")
+        self.data[new_key] = self.data.pop(key)
+
+    def hincrby(self, key, field, amount=1):
+        hash_ = self.data.setdefault(key, {})
+        field = self._encode(field)
+        hash_[field] = int(hash_.get(field, 0)) + amount
+        return hash_[field]
+
+    def hdel(self, key, *fields):
+        hash_ = self.data.get(key, {})
+        deleted = sum(hash_.pop(self._encode(field), None) is not None for field in fields)
+        if not hash_:
+            self.data.pop(key, None)
+        return deleted
+
+    def hgetall(self, key):
+        return {field: self._encode(value) for field, value in self.data.get(key, {}).items()}
+
+    def rpush(self, key, *values):
+        list_ = self.data.setdefault(key, [])
+        list_.extend(self._encode(value) for value in values)
+        return len(list_)
+
+    def lrange(self, key, start, end):
+        list_ = self.data.get(key, [])
+        return list_[start:] if end == -1 else list_[start : end + 1]
+
+    def ltrim(self, key, start, end):
+        list_ = self.data.get(key, [])
+        self.data[key] = list_[start:] if end == -1 else list_[start : end + 1]
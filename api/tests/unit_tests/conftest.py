@@ -1,8 +1,13 @@
 import os
+from collections.abc import Generator
+from unittest.mock import patch
 
 import pytest
 from flask import Flask
 
+from extensions.ext_redis import redis_client
+from tests.unit_tests.__mock.fake_redis import FakeRedis
+
 # Getting the absolute path of the current file's directory
 ABS_PATH = os.path.dirname(os.path.abspath(__file__))
 
@@ -21,3 +26,11 @@ def app() -> Flask:
 def _provide_app_context(app: Flask):
     with app.app_context():
         yield
+
+
+@pytest.fixture
+def fake_redis() -> Generator[FakeRedis, None, None]:
+    """In-memory redis behind `extensions.ext_redis.redis_client`"""
+    fake = FakeRedis()
+    with patch.object(redis_client, "_client", fake):
+        yield fake
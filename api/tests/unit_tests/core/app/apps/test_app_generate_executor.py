@@ -0,0 +1,130 @@
+import contextvars
+import threading
+
+import pytest
+
+from core.app.apps.app_generate_executor import AppGenerateExecutor
+from core.errors.error import AppInvokeQuotaExceededError
+
+request_var: contextvars.ContextVar[str] = contextvars.ContextVar("request_var", default="")
+
+
+def test_bounded_executor_queues_and_rejects():
+    executor = AppGenerateExecutor(max_workers=1, max_queued=1)
+    release = threading.Event()
+    started = threading.Event()
+    done = threading.Event()
+
+    def blocking_worker(name: str):
+        started.set()
+        release.wait(timeout=5)
+
+    executor.submit(blocking_worker, name="first")
+    assert started.wait(timeout=5)
+    executor.submit(lambda name: done.set(), name="second")
+    assert executor.active_count == 1
+    assert executor.queued_count == 1
+
+    with pytest.raises(AppInvokeQuotaExceededError):
+        executor.check_admission()
+    with pytest.raises(AppInvokeQuotaExceededError):
+        executor.submit(blocking_worker, name="third")
+
+    release.set()
+    assert done.wait(timeout=5)
+    executor.check_admission()
+
+
+def test_worker_context_does_not_leak_between_generations():
+    executor = AppGenerateExecutor(max_workers=1, max_queued=10)
+    seen = []
+    finished = threading.Event()
+
+    def worker(context: contextvars.Context, last: bool = False):
+        seen.append(request_var.get())
+        for var, val in context.items():
+            var.set(val)
+        if last:
+            finished.set()
+
+    token = request_var.set("first")
+    executor.submit(worker, context=contextvars.copy_context())
+    request_var.reset(token)
+    executor.submit(worker, context=contextvars.copy_context(), last=True)
+
+    assert finished.wait(timeout=5)
+    assert seen == ["", ""]
+
+
+def test_unbounded_executor_never_rejects():
+    executor = AppGenerateExecutor(max_workers=0, max_queued=0)
+    finished = threading.Event()
+
+    executor.check_admission()
+    executor.submit(finished.set)
+
+    assert finished.wait(timeout=5)
+
+
+def test_nested_generations_do_not_wait_for_the_saturated_pool():
+    executor = AppGenerateExecutor(max_workers=2, max_queued=0)
+    results = []
+    all_started = threading.Barrier(3)
+    finished = threading.Semaphore(0)
+
+    def tool_workflow_worker(context: contextvars.Context, done: threading.Event):
+        for var, val in context.items():
+            var.set(val)
+        done.set()
+
+    def workflow_tool_node():
+        # like WorkflowAsTool, generate the tool workflow and block until it is done
+        done = threading.Event()
+        executor.submit(tool_workflow_worker, context=contextvars.copy_context(), done=done)
+        results.append(done.wait(timeout=5))
+
+    def workflow_worker(context: contextvars.Context):
+        for var, val in context.items():
+            var.set(val)
+        all_started.wait(timeout=5)
+        # nodes run on the threads of the graph engine, with a copy of the context of the worker
+        node_context = contextvars.copy_context()
+        node_thread = threading.Thread(target=node_context.run, args=(workflow_tool_node,))
+        node_thread.start()
+        node_thread.join()
+        finished.release()
+
+    for _ in range(2):
+        executor.submit(workflow_worker, context=contextvars.copy_context())
+    # every worker of the pool is busy, the outer generations are rejected
+    all_started.wait(timeout=5)
+    with pytest.raises(AppInvokeQuotaExceededError):
+        executor.submit(workflow_worker, context=contextvars.copy_context())
+
+    for _ in range(2):
+        assert finished.acquire(timeout=10)
+    assert results == [True, True]
+    assert executor.active_count == 0
+    assert executor.queued_count == 0
+
+
+def test_generations_in_nested_block_bypass_admission():
+    executor = AppGenerateExecutor(max_workers=1, max_queued=0)
+    release = threading.Event()
+    started = threading.Event()
+    nested_done = threading.Event()
+
+    def blocking_worker():
+        started.set()
+        release.wait(timeout=5)
+
+    executor.submit(blocking_worker)
+    assert started.wait(timeout=5)
+
+    with AppGenerateExecutor.nested():
+        executor.submit(nested_done.set)
+    assert nested_done.wait(timeout=5)
+
+    with pytest.raises(AppInvokeQuotaExceededError):
+        executor.submit(nested_done.set)
+    release.set()
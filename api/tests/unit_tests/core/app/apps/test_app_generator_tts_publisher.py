@@ -0,0 +1,58 @@
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.app.apps.advanced_chat.app_generator_tts_publisher import AppGeneratorTTSPublisher
+from core.app.entities.queue_entities import QueueTextChunkEvent, WorkflowQueueMessage
+
+
+@pytest.fixture
+def model_instance():
+    model_instance = MagicMock()
+    model_instance.get_tts_voices.return_value = [{"value": "alloy"}]
+    model_instance.invoke_tts.side_effect = lambda content_text, **kwargs: [content_text.encode()]
+    with patch("core.app.apps.advanced_chat.app_generator_tts_publisher.ModelManager") as model_manager:
+        model_manager.return_value.get_default_model_instance.return_value = model_instance
+        yield model_instance
+
+
+def _publish_text(publisher: AppGeneratorTTSPublisher, text: str):
+    publisher.publish(
+        WorkflowQueueMessage(task_id="task_id", app_mode="workflow", event=QueueTextChunkEvent(text=text))
+    )
+
+
+def test_wait_for_audio_returns_first_sentence_without_polling(model_instance):
+    publisher = AppGeneratorTTSPublisher("tenant_id", "alloy")
+    with patch("core.app.apps.advanced_chat.app_generator_tts_publisher._record_first_audio_latency") as record:
+        _publish_text(publisher, "Hello world. And")
+
+        audio = publisher.wait_for_audio(timeout=5)
+        assert audio is not None
+        assert audio.status == "responding"
+        record.assert_called_once()
+
+        _publish_text(publisher, " more.")
+        publisher.publish(None)
+        assert publisher.wait_for_audio(timeout=5).status == "responding"
+        assert publisher.wait_for_audio(timeout=5).status == "finish"
+        # the finish event stays the last event
+        assert publisher.wait_for_audio(timeout=5).status == "finish"
+
+    assert [call.kwargs["content_text"] for call in model_instance.invoke_tts.call_args_list] == [
+        "Hello world.",
+        "And more.",
+    ]
+    record.assert_called_once()
+
+
+def test_wait_for_audio_times_out(model_instance):
+    publisher = AppGeneratorTTSPublisher("tenant_id", "alloy")
+
+    start = time.perf_counter()
+    assert publisher.wait_for_audio(timeout=0.05) is None
+    assert time.perf_counter() - start >= 0.05
+
+    publisher.publish(None)
+    assert publisher.wait_for_audio(timeout=5).status == "finish"
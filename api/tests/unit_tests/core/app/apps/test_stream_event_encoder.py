@@ -0,0 +1,98 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from core.app.apps.base_app_generator import BaseAppGenerator
+from core.app.apps.chat.generate_response_converter import ChatAppGenerateResponseConverter
+from core.app.apps.stream_event_encoder import StreamEventChunk, StreamEventEncoder
+from core.app.apps.workflow.generate_response_converter import WorkflowAppGenerateResponseConverter
+from core.app.entities.task_entities import (
+    ChatbotAppStreamResponse,
+    MessageEndStreamResponse,
+    MessageStreamResponse,
+    TextChunkStreamResponse,
+    WorkflowAppStreamResponse,
+)
+
+
+def _message_stream(answers: list[str]):
+    for answer in answers:
+        yield ChatbotAppStreamResponse(
+            conversation_id="conversation_id",
+            message_id="message_id",
+            created_at=1700000000,
+            stream_response=MessageStreamResponse.model_construct(task_id="task_id", id="message_id", answer=answer),
+        )
+
+
+def _legacy_sse(chunk: dict) -> str:
+    return f"data: {json.dumps(chunk)}\n\n"
+
+
+@pytest.mark.parametrize("orjson_enabled", [False, True])
+def test_message_chunks_match_plain_encoding(orjson_enabled):
+    answers = ["Hello", ", 世界", ' "quoted"\n']
+
+    with patch("core.app.apps.stream_event_encoder.dify_config.STREAM_EVENT_ORJSON_ENABLED", orjson_enabled):
+        chunks = list(ChatAppGenerateResponseConverter.convert_stream_full_response(_message_stream(answers)))
+        events = list(BaseAppGenerator.convert_to_event_stream(iter(chunks)))
+
+    for answer, chunk, event in zip(answers, chunks, events):
+        expected = {
+            "event": "message",
+            "conversation_id": "conversation_id",
+            "message_id": "message_id",
+            "created_at": 1700000000,
+            "task_id": "task_id",
+            "id": "message_id",
+            "answer": answer,
+            "from_variable_selector": None,
+        }
+        assert isinstance(chunk, StreamEventChunk)
+        assert chunk == expected
+        assert json.loads(event.removeprefix("data: ")) == expected
+        if not orjson_enabled:
+            assert event == _legacy_sse(expected)
+
+
+def test_workflow_text_chunk_matches_plain_encoding():
+    stream_response = TextChunkStreamResponse(
+        task_id="task_id", data=TextChunkStreamResponse.Data(text="text", from_variable_selector=["node", "text"])
+    )
+    chunk = next(
+        WorkflowAppGenerateResponseConverter.convert_stream_simple_response(
+            iter([WorkflowAppStreamResponse(workflow_run_id="run_id", stream_response=stream_response)])
+        )
+    )
+
+    expected = {"event": "text_chunk", "workflow_run_id": "run_id", **stream_response.to_dict()}
+    assert chunk == expected
+    assert chunk.to_sse() == _legacy_sse(expected)
+
+
+def test_other_events_are_left_to_converter():
+    stream_response = MessageEndStreamResponse(task_id="task_id", id="message_id")
+
+    assert StreamEventEncoder().delta_chunk({"event": "message_end"}, stream_response) is None
+
+
+def test_envelope_is_serialized_once_per_stream():
+    encoder = StreamEventEncoder()
+    with patch("core.app.apps.stream_event_encoder._dumps", wraps=json.dumps) as dumps:
+        for i in range(3):
+            encoder.chunk({"event": "message", "id": "message_id"}, {"answer": str(i)}).to_sse()
+
+    # one envelope and three deltas
+    assert dumps.call_count == 4
+
+
+def test_message_event_throughput(benchmark):
+    answers = [f"token{i} " for i in range(1000)]
+
+    def stream_tokens():
+        chunks = ChatAppGenerateResponseConverter.convert_stream_full_response(_message_stream(answers))
+        return sum(1 for _ in BaseAppGenerator.convert_to_event_stream(chunks))
+
+    # tokens per second per worker is len(answers) times the reported OPS
+    assert benchmark(stream_tokens) == len(answers)
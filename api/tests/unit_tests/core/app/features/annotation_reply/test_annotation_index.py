@@ -0,0 +1,120 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from core.app.features.annotation_reply.annotation_index import AnnotationIndex, AnnotationIndexManager
+
+
+@pytest.fixture(autouse=True)
+def clear_indexes(fake_redis):
+    AnnotationIndexManager._indexes.clear()
+    yield
+    AnnotationIndexManager._indexes.clear()
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def test_search_returns_most_similar_annotation():
+    index = AnnotationIndex(["a1", "a2"], _normalize([[1, 0], [1, 1]]))
+
+    annotation_id, score = index.search(_normalize([1, 0.9]).tolist(), score_threshold=0.9)
+
+    assert annotation_id == "a2"
+    assert score == pytest.approx(0.9986, abs=1e-4)
+
+
+def test_search_respects_score_threshold():
+    index = AnnotationIndex(["a1"], _normalize([[1, 0]]))
+
+    assert index.search(_normalize([0, 1]).tolist(), score_threshold=0.5) is None
+    assert AnnotationIndex([], np.empty((0, 0), dtype=np.float32)).search([1.0, 0.0], score_threshold=0) is None
+
+
+def test_get_index_is_cached_until_invalidated(fake_redis):
+    with patch.object(AnnotationIndexManager, "_build_index", side_effect=lambda *args: MagicMock()) as build_index:
+        args = ("app_id", "tenant_id", "binding_id", "provider", "model")
+        first = AnnotationIndexManager.get_index(*args)
+        assert AnnotationIndexManager.get_index(*args) is first
+        assert build_index.call_count == 1
+
+        # an annotation task in another process bumps the version
+        fake_redis.setex("annotation_index_version:app_id:app_id", 86400, "other")
+        second = AnnotationIndexManager.get_index(*args)
+        assert second is not first
+
+        # the annotations were re-indexed with another embedding model
+        assert AnnotationIndexManager.get_index("app_id", "tenant_id", "binding_2", "provider", "model") is not second
+
+        AnnotationIndexManager.invalidate("app_id")
+        AnnotationIndexManager.get_index(*args)
+        assert build_index.call_count == 4
+
+
+def test_get_index_skips_large_annotation_sets():
+    db = MagicMock()
+    db.session.query.return_value.filter.return_value.scalar.return_value = 20
+
+    with (
+        patch("core.app.features.annotation_reply.annotation_index.db", db),
+        patch(
+            "core.app.features.annotation_reply.annotation_index.dify_config.ANNOTATION_REPLY_LOCAL_INDEX_MAX_SIZE", 10
+        ),
+    ):
+        assert AnnotationIndexManager.get_index("app_id", "tenant_id", "binding_id", "provider", "model") is None
+        assert AnnotationIndexManager.get_index("app_id", "tenant_id", "binding_id", "provider", "model") is None
+
+    # the size is not counted again until the annotations change
+    assert db.session.query.call_count == 1
+
+
+def test_index_is_built_by_one_request_at_a_time():
+    args = ("app_id", "tenant_id", "binding_id", "provider", "model")
+    built = MagicMock()
+
+    def build_index(*_):
+        # a concurrent request falls back to the vector database instead of building the index again
+        assert AnnotationIndexManager.get_index(*args) is None
+        return built
+
+    with patch.object(AnnotationIndexManager, "_build_index", side_effect=build_index) as mock_build_index:
+        assert AnnotationIndexManager.get_index(*args) is built
+        assert AnnotationIndexManager.get_index(*args) is built
+
+    mock_build_index.assert_called_once()
+
+
+def test_build_index_reads_cached_embeddings_in_bulk():
+    annotations = [
+        MagicMock(id="a1", question="cached"),
+        MagicMock(id="a2", question="missing"),
+        MagicMock(id="a3", question="cached"),
+    ]
+    cached = {"cached": [1.0, 0.0]}
+    embedding_model = MagicMock(provider="provider", model="model")
+    cache_embedding = MagicMock()
+    cache_embedding.return_value.embed_documents.return_value = [[0.0, 1.0]]
+
+    with (
+        patch("core.app.features.annotation_reply.annotation_index.db") as db,
+        patch("core.app.features.annotation_reply.annotation_index.helper.generate_text_hash", side_effect=str),
+        patch("core.app.features.annotation_reply.annotation_index.ModelManager") as model_manager,
+        patch("core.app.features.annotation_reply.annotation_index.CacheEmbedding", cache_embedding),
+    ):
+        db.session.query.return_value.filter.return_value.scalar.return_value = len(annotations)
+        db.session.query.return_value.filter.return_value.all.return_value = annotations
+        db.session.query.return_value.filter.return_value.__iter__.return_value = [
+            MagicMock(hash=text_hash, get_embedding=MagicMock(return_value=embedding))
+            for text_hash, embedding in cached.items()
+        ]
+        model_manager.return_value.get_model_instance.return_value = embedding_model
+
+        index = AnnotationIndexManager._build_index("app_id", "tenant_id", "provider", "model")
+
+    # only the question missing from the embedding cache is embedded
+    cache_embedding.return_value.embed_documents.assert_called_once_with(["missing"])
+    assert index.annotation_ids == ["a1", "a2", "a3"]
+    assert index.vectors.tolist() == [[1.0, 0.0], [0.0, 1.0], [1.0, 0.0]]
@@ -0,0 +1,69 @@
+import base64
+from unittest.mock import MagicMock, patch
+
+from core.file import file_manager
+from core.file.content_cache import FileContentCache
+from core.file.enums import FileTransferMethod, FileType
+from core.file.models import File
+
+
+def test_get_or_load_caches_by_kind_and_key():
+    cache = FileContentCache(max_size=100, max_item_size=100)
+    loader = MagicMock(return_value=b"abc")
+
+    assert cache.get_or_load("bytes", "key", loader) == b"abc"
+    assert cache.get_or_load("bytes", "key", loader) == b"abc"
+    assert cache.get_or_load("base64", "key", lambda: "YWJj") == "YWJj"
+
+    assert loader.call_count == 1
+    assert cache.hits == 1
+    assert cache.misses == 2
+    assert cache.hit_ratio == 1 / 3
+
+
+def test_least_recently_used_entries_are_evicted_over_budget():
+    cache = FileContentCache(max_size=10, max_item_size=10)
+    cache.get_or_load("bytes", "a", lambda: b"a" * 4)
+    cache.get_or_load("bytes", "b", lambda: b"b" * 4)
+    cache.get_or_load("bytes", "a", lambda: b"")
+    cache.get_or_load("bytes", "c", lambda: b"c" * 4)
+
+    assert cache.size == 8
+    assert cache.evictions == 1
+    loader = MagicMock(return_value=b"b" * 4)
+    cache.get_or_load("bytes", "b", loader)
+    loader.assert_called_once()
+
+
+def test_items_over_item_size_are_not_cached():
+    cache = FileContentCache(max_size=100, max_item_size=5)
+    loader = MagicMock(return_value=b"x" * 6)
+
+    cache.get_or_load("bytes", "big", loader)
+    cache.get_or_load("bytes", "big", loader)
+
+    assert loader.call_count == 2
+    assert cache.size == 0
+
+
+def test_encoded_string_is_loaded_once_per_storage_key():
+    cache = FileContentCache(max_size=1024, max_item_size=1024)
+    file = File(
+        tenant_id="tenant",
+        type=FileType.IMAGE,
+        transfer_method=FileTransferMethod.LOCAL_FILE,
+        related_id="upload-file-id",
+        extension=".png",
+        mime_type="image/png",
+        storage_key="upload_files/tenant/image.png",
+    )
+
+    with (
+        patch.object(file_manager, "file_content_cache", cache),
+        patch.object(file_manager, "storage") as mock_storage,
+    ):
+        mock_storage.load.return_value = b"image"
+        for _ in range(3):
+            assert file_manager._get_encoded_string(file) == base64.b64encode(b"image").decode()
+
+    mock_storage.load.assert_called_once_with("upload_files/tenant/image.png", stream=False)
@@ -0,0 +1,61 @@
+from unittest.mock import patch
+
+import pytest
+
+from core.helper.model_provider_cache import ProviderConfigurationsCache
+
+
+@pytest.fixture(autouse=True)
+def clear_snapshots(fake_redis):
+    ProviderConfigurationsCache._snapshots.clear()
+    yield
+    ProviderConfigurationsCache._snapshots.clear()
+
+
+def test_get_cached_snapshot(fake_redis):
+    cache = ProviderConfigurationsCache("tenant_id")
+    version = cache.get_version()
+    snapshot = object()
+
+    assert cache.get(version, "fingerprint") is None
+
+    cache.set(version, "fingerprint", snapshot)
+
+    assert cache.get(version, "fingerprint") is snapshot
+    assert cache.get(version, "other_fingerprint") is None
+    assert ProviderConfigurationsCache("other_tenant_id").get(version, "fingerprint") is None
+
+
+def test_delete_bumps_version(fake_redis):
+    cache = ProviderConfigurationsCache("tenant_id")
+    version = cache.get_version()
+    cache.set(version, "fingerprint", object())
+
+    # another process invalidates the configurations
+    ProviderConfigurationsCache("tenant_id").delete()
+
+    new_version = cache.get_version()
+    assert new_version != version
+    assert cache.get(new_version, "fingerprint") is None
+
+
+def test_snapshot_built_during_write_is_stale(fake_redis):
+    cache = ProviderConfigurationsCache("tenant_id")
+    version = cache.get_version()
+
+    # a write happens while the snapshot is being built with the old version
+    fake_redis.setex("provider_configurations_version:tenant_id:tenant_id", 86400, "new_version")
+    cache.set(version, "fingerprint", object())
+
+    assert cache.get(cache.get_version(), "fingerprint") is None
+
+
+def test_snapshot_expires(fake_redis):
+    cache = ProviderConfigurationsCache("tenant_id")
+    version = cache.get_version()
+
+    with patch("core.helper.versioned_cache.time.monotonic", return_value=1000.0):
+        cache.set(version, "fingerprint", object())
+
+    with patch("core.helper.versioned_cache.time.monotonic", return_value=100000.0):
+        assert cache.get(version, "fingerprint") is None
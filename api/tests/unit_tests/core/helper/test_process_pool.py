@@ -0,0 +1,27 @@
+from unittest.mock import patch
+
+from core.helper import process_pool
+from core.helper.process_pool import LazyProcessPool
+
+
+def test_disabled_pool_is_not_started():
+    pool = LazyProcessPool(lambda: 0)
+
+    with patch.object(process_pool, "ProcessPoolExecutor") as executor_class:
+        assert pool.get() is None
+
+    executor_class.assert_not_called()
+
+
+def test_pool_is_started_once():
+    def initializer():
+        pass
+
+    pool = LazyProcessPool(lambda: 2, initializer=initializer)
+
+    with patch.object(process_pool, "ProcessPoolExecutor") as executor_class:
+        assert pool.get() is pool.get()
+
+    executor_class.assert_called_once()
+    assert executor_class.call_args.kwargs["max_workers"] == 2
+    assert executor_class.call_args.kwargs["initializer"] is initializer
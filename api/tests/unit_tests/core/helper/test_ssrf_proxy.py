@@ -50,3 +50,21 @@ def test_retry_logic_success(mock_request):
     assert response.status_code == 200
     assert mock_request.call_count == SSRF_DEFAULT_MAX_RETRIES + 1
     assert mock_request.call_args_list[0][1].get("method") == "GET"
+
+
+@patch("httpx.Client.close")
+@patch("httpx.Client.send")
+def test_streaming_request_closes_client_with_response(mock_send, mock_close):
+    mock_stream = MagicMock()
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.stream = mock_stream
+    mock_send.return_value = mock_response
+
+    response = make_request("GET", "http://example.com", stream=True, follow_redirects=True)
+
+    assert mock_send.call_args[1] == {"stream": True, "auth": None, "follow_redirects": True}
+    mock_close.assert_not_called()
+    response.stream.close()
+    mock_stream.close.assert_called_once()
+    mock_close.assert_called_once()
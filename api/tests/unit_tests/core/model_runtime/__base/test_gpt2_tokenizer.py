@@ -0,0 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from core.model_runtime.model_providers.__base.tokenizers.gpt2_tokenzier import GPT2Tokenizer
+
+
+def test_get_num_tokens_batch_inline():
+    with (
+        patch.object(GPT2Tokenizer, "get_executor", return_value=None),
+        patch.object(GPT2Tokenizer, "_get_num_tokens_by_gpt2", side_effect=len) as get_num_tokens_by_gpt2,
+    ):
+        assert GPT2Tokenizer.get_num_tokens_batch(["a", "bb"]) == [1, 2]
+        assert GPT2Tokenizer.get_num_tokens("ccc") == 3
+        assert get_num_tokens_by_gpt2.call_count == 3
+
+
+def test_get_num_tokens_batch_sends_large_texts_to_pool():
+    large_text = "a" * 10000
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with (
+            patch.object(GPT2Tokenizer, "get_executor", return_value=executor),
+            patch.object(executor, "submit", wraps=executor.submit) as submit,
+            patch.object(GPT2Tokenizer, "_get_num_tokens_by_gpt2", side_effect=len),
+        ):
+            assert GPT2Tokenizer.get_num_tokens_batch(["a", large_text, "bb"]) == [1, 10000, 2]
+            assert submit.call_count == 1
@@ -0,0 +1,128 @@
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import Flask
+
+from core.app.apps.base_app_queue_manager import AppQueueManager
+from core.moderation.base import ModerationAction, ModerationOutputsResult
+from core.moderation.output_moderation import (
+    ModerationRule,
+    OutputModeration,
+    OutputModerationWorker,
+    _verdict_cache,
+)
+
+
+class FakeModeration:
+    def __init__(self, keyword: str, action: ModerationAction = ModerationAction.DIRECT_OUTPUT):
+        self.keyword = keyword
+        self.action = action
+        self.texts: list[str] = []
+
+    def moderation_for_outputs(self, text: str) -> ModerationOutputsResult:
+        self.texts.append(text)
+        return ModerationOutputsResult(
+            flagged=self.keyword in text,
+            action=self.action,
+            preset_response="blocked",
+            text=text.replace(self.keyword, "***"),
+        )
+
+
+@pytest.fixture
+def fake_moderation():
+    moderation = FakeModeration("secret")
+    _verdict_cache.clear()
+    with (
+        patch("core.moderation.output_moderation.ModerationFactory", return_value=moderation),
+        patch("core.moderation.output_moderation.dify_config.MODERATION_BUFFER_SIZE", 10),
+        patch("core.moderation.output_moderation.dify_config.MODERATION_WINDOW_OVERLAP", 4),
+    ):
+        yield moderation
+    _verdict_cache.clear()
+
+
+def _output_moderation() -> OutputModeration:
+    return OutputModeration(
+        tenant_id="tenant_id",
+        app_id="app_id",
+        rule=ModerationRule(type="keywords", config={}),
+        queue_manager=MagicMock(spec=AppQueueManager),
+    )
+
+
+def test_windows_overlap_and_skip_moderated_text(fake_moderation):
+    output_moderation = _output_moderation()
+
+    output_moderation.buffer = "0123456789"
+    output_moderation.check_pending_window()
+    output_moderation.buffer += "abcdefghij"
+    assert output_moderation.has_pending_window()
+    output_moderation.check_pending_window()
+
+    assert fake_moderation.texts == ["0123456789", "6789abcdefghij"]
+    assert not output_moderation.has_pending_window()
+
+
+def test_flagged_window_publishes_direct_output(fake_moderation):
+    output_moderation = _output_moderation()
+
+    output_moderation.buffer = "here is the secret"
+    output_moderation.check_pending_window()
+
+    assert output_moderation.should_direct_output()
+    assert output_moderation.get_final_output() == "blocked"
+    output_moderation.queue_manager.publish.assert_called_once()
+    assert not output_moderation.running
+
+
+def test_overridden_window_keeps_moderated_prefix(fake_moderation):
+    fake_moderation.action = ModerationAction.OVERRIDDEN
+    output_moderation = _output_moderation()
+
+    output_moderation.buffer = "0123456789"
+    output_moderation.check_pending_window()
+    output_moderation.buffer += " the secret"
+    output_moderation.check_pending_window()
+
+    event = output_moderation.queue_manager.publish.call_args.args[0]
+    assert event.text == "0123456789 the ***"
+
+
+def test_completion_checks_only_the_rest(fake_moderation):
+    output_moderation = _output_moderation()
+    output_moderation.buffer = "0123456789"
+    output_moderation.check_pending_window()
+
+    assert output_moderation.moderation_completion("0123456789 done") == ("0123456789 done", False)
+    assert fake_moderation.texts[-1] == "6789 done"
+
+    assert output_moderation.moderation_completion("0123456789 secret") == ("blocked", True)
+
+
+def test_verdicts_are_cached_by_text(fake_moderation):
+    first, second = _output_moderation(), _output_moderation()
+
+    first.moderation_completion("same answer")
+    second.moderation_completion("same answer")
+
+    assert fake_moderation.texts == ["same answer"]
+
+
+def test_worker_checks_registered_streams(fake_moderation):
+    worker = OutputModerationWorker(max_workers=2)
+    output_moderation = _output_moderation()
+
+    with (
+        patch.object(OutputModerationWorker, "get_instance", return_value=worker),
+        Flask(__name__).app_context(),
+    ):
+        output_moderation.append_new_token("0123456789secret")
+
+        deadline = time.time() + 5
+        while not output_moderation.should_direct_output() and time.time() < deadline:
+            time.sleep(0.01)
+
+    assert output_moderation.get_final_output() == "blocked"
+    assert fake_moderation.texts == ["0123456789secret"]
@@ -0,0 +1,154 @@
+import json
+import queue
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import Flask
+
+from core.ops import ops_trace_manager
+from core.ops.entities.trace_entity import GenerateNameTraceInfo
+from core.ops.ops_trace_manager import OpsTraceManager, TraceQueueManager
+from tasks.ops_trace_task import process_trace_tasks
+
+
+@pytest.fixture
+def trace_instances_cache(fake_redis):
+    OpsTraceManager.app_ops_trace_instances_cache.clear()
+    yield
+    OpsTraceManager.app_ops_trace_instances_cache.clear()
+
+
+@pytest.fixture
+def trace_queue_manager():
+    manager = TraceQueueManager.__new__(TraceQueueManager)
+    manager.app_id = "app_id"
+    manager.user_id = None
+    manager.trace_instance = MagicMock()
+    manager.flask_app = Flask(__name__)
+    with (
+        patch.object(ops_trace_manager, "trace_manager_queue", queue.Queue(maxsize=3)),
+        patch.object(ops_trace_manager, "trace_manager_batch_size", 2),
+        patch.object(ops_trace_manager, "trace_manager_dropped_count", 0),
+        patch.object(TraceQueueManager, "start_timer"),
+    ):
+        yield manager
+
+
+def _trace_task(name: str) -> MagicMock:
+    trace_task = MagicMock()
+    trace_task.execute.return_value = GenerateNameTraceInfo(
+        conversation_id=name, inputs={}, outputs={}, tenant_id="tenant_id", metadata={}
+    )
+    return trace_task
+
+
+def test_get_ops_trace_instance_is_cached_until_invalidated(trace_instances_cache):
+    with patch.object(OpsTraceManager, "_get_ops_trace_instance", side_effect=lambda app_id: object()) as lookup:
+        instance = OpsTraceManager.get_ops_trace_instance("app_id")
+        assert OpsTraceManager.get_ops_trace_instance("app_id") is instance
+        assert lookup.call_count == 1
+
+        OpsTraceManager.invalidate_app_tracing_config("app_id")
+
+        assert OpsTraceManager.get_ops_trace_instance("app_id") is not instance
+        assert lookup.call_count == 2
+
+
+def test_get_ops_trace_instance_dropped_by_other_process(fake_redis, trace_instances_cache):
+    with patch.object(OpsTraceManager, "_get_ops_trace_instance", side_effect=lambda app_id: object()) as lookup:
+        OpsTraceManager.get_ops_trace_instance("app_id")
+
+        # another process bumps the version
+        fake_redis.setex("ops_trace_config_version:app_id:app_id", 86400, "new_version")
+
+        OpsTraceManager.get_ops_trace_instance("app_id")
+        assert lookup.call_count == 2
+
+
+def test_add_trace_task_drops_when_queue_full(trace_queue_manager):
+    for i in range(5):
+        trace_queue_manager.add_trace_task(_trace_task(str(i)))
+
+    assert ops_trace_manager.trace_manager_queue.qsize() == 3
+    assert ops_trace_manager.trace_manager_dropped_count == 2
+
+
+def test_run_exports_one_file_and_task_per_batch(trace_queue_manager):
+    for i in range(3):
+        trace_queue_manager.add_trace_task(_trace_task(str(i)))
+
+    with (
+        patch("core.ops.ops_trace_manager.storage", new=MagicMock()) as storage,
+        patch("core.ops.ops_trace_manager.process_trace_tasks") as process_trace_tasks_mock,
+    ):
+        trace_queue_manager.run()
+
+    assert ops_trace_manager.trace_manager_queue.empty()
+    # 3 tasks with a batch size of 2
+    assert storage.save.call_count == 2
+    assert process_trace_tasks_mock.delay.call_count == 2
+
+    lines = storage.save.call_args_list[0].args[1].decode("utf-8").splitlines()
+    assert [json.loads(line)["trace_info"]["conversation_id"] for line in lines] == ["0", "1"]
+    file_info = process_trace_tasks_mock.delay.call_args_list[0].args[0]
+    assert file_info["batch"] is True
+    assert storage.save.call_args_list[0].args[0].endswith(f"{file_info['file_id']}.jsonl")
+
+
+def test_process_trace_tasks_batch():
+    batch = "\n".join(
+        json.dumps(
+            {
+                "app_id": app_id,
+                "trace_info_type": "GenerateNameTraceInfo",
+                "trace_info": {"inputs": {}, "outputs": {}, "tenant_id": "tenant_id", "metadata": {}},
+            }
+        )
+        for app_id in ["app_1", "app_1", "app_2"]
+    )
+    trace_instance = MagicMock()
+
+    with (
+        Flask(__name__).app_context(),
+        patch("tasks.ops_trace_task.storage", new=MagicMock(load=MagicMock(return_value=batch.encode()))) as storage,
+        patch.object(OpsTraceManager, "get_ops_trace_instance", return_value=trace_instance) as get_instance,
+    ):
+        process_trace_tasks({"file_id": "file_id", "batch": True})
+
+    assert trace_instance.trace.call_count == 3
+    assert isinstance(trace_instance.trace.call_args.args[0], GenerateNameTraceInfo)
+    # trace instance is resolved once per app in a batch
+    assert get_instance.call_count == 2
+    storage.delete.assert_called_once_with("ops_trace/batches/file_id.jsonl")
+
+
+def test_process_trace_tasks_batch_isolates_failing_app():
+    batch = "\n".join(
+        json.dumps(
+            {
+                "app_id": app_id,
+                "trace_info_type": "GenerateNameTraceInfo",
+                "trace_info": {"inputs": {}, "outputs": {}, "tenant_id": "tenant_id", "metadata": {}},
+            }
+        )
+        for app_id in ["app_1", "app_2"]
+    )
+    trace_instance = MagicMock()
+
+    def get_ops_trace_instance(app_id):
+        if app_id == "app_1":
+            raise ValueError("invalid tracing config")
+        return trace_instance
+
+    with (
+        Flask(__name__).app_context(),
+        patch("tasks.ops_trace_task.storage", new=MagicMock(load=MagicMock(return_value=batch.encode()))) as storage,
+        patch("tasks.ops_trace_task.redis_client", new=MagicMock()) as redis_client,
+        patch.object(OpsTraceManager, "get_ops_trace_instance", side_effect=get_ops_trace_instance),
+    ):
+        process_trace_tasks({"file_id": "file_id", "batch": True})
+
+    # the failing app is counted and the rest of the batch is still traced
+    trace_instance.trace.assert_called_once()
+    redis_client.incr.assert_called_once_with("FAILED_OPS_TRACE_app_1")
+    storage.delete.assert_called_once_with("ops_trace/batches/file_id.jsonl")
@@ -0,0 +1,88 @@
+from unittest.mock import patch
+
+from core.rag.datasource.retrieval_service import RetrievalService
+from core.rag.index_processor.constant.index_type import IndexType
+from core.rag.models.document import Document
+from models.dataset import ChildChunk, DocumentSegment
+from models.dataset import Document as DatasetDocument
+
+
+class FakeQuery:
+    def __init__(self, rows: list):
+        self.rows = rows
+
+    def filter(self, *args):
+        return self
+
+    def options(self, *args):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, rows: dict):
+        self.rows = rows
+        self.queries: list = []
+
+    def query(self, entity):
+        self.queries.append(entity)
+        return FakeQuery(self.rows[entity])
+
+
+def _retrieved(doc_id: str, document_id: str, score: float) -> Document:
+    return Document(page_content=doc_id, metadata={"doc_id": doc_id, "document_id": document_id, "score": score})
+
+
+def _format(top_k: int):
+    dataset_documents = [
+        DatasetDocument(id="parent_child_document", dataset_id="dataset_1", doc_form=IndexType.PARENT_CHILD_INDEX),
+        DatasetDocument(id="paragraph_document", dataset_id="dataset_2", doc_form=IndexType.PARAGRAPH_INDEX),
+    ]
+    # two child chunks per parent segment
+    child_chunks = [
+        ChildChunk(
+            id=f"child_{i}", index_node_id=f"child_node_{i}", segment_id=f"parent_{i // 2}", content="", position=i
+        )
+        for i in range(top_k)
+    ]
+    segments = [
+        DocumentSegment(id=f"parent_{i}", dataset_id="dataset_1", index_node_id=f"parent_node_{i}")
+        for i in range(top_k)
+    ]
+    segments += [
+        DocumentSegment(id=f"segment_{i}", dataset_id="dataset_2", index_node_id=f"node_{i}") for i in range(top_k)
+    ]
+
+    documents = [_retrieved(f"child_node_{i}", "parent_child_document", i / 100) for i in range(top_k)]
+    documents += [_retrieved(f"node_{i}", "paragraph_document", 0.5) for i in range(top_k)]
+
+    session = FakeSession({DatasetDocument: dataset_documents, ChildChunk: child_chunks, DocumentSegment: segments})
+    with patch("core.rag.datasource.retrieval_service.db.session", session):
+        results = RetrievalService.format_retrieval_documents(documents)
+    return results, session.queries
+
+
+def test_format_retrieval_documents_groups_child_chunks():
+    results, _ = _format(top_k=4)
+
+    assert [result.segment.id for result in results] == [
+        "parent_0",
+        "parent_1",
+        "segment_0",
+        "segment_1",
+        "segment_2",
+        "segment_3",
+    ]
+    assert [chunk.id for chunk in results[0].child_chunks] == ["child_0", "child_1"]
+    assert results[1].score == 0.03
+    assert results[2].child_chunks is None
+    assert results[2].score == 0.5
+
+
+def test_format_retrieval_documents_query_count_does_not_grow_with_top_k():
+    _, queries = _format(top_k=2)
+    _, more_queries = _format(top_k=20)
+
+    assert queries == more_queries == [DatasetDocument, ChildChunk, DocumentSegment]
@@ -0,0 +1,189 @@
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.rag.extractor import extraction_cache
+from core.rag.extractor.entity.extract_setting import ExtractSetting
+from core.rag.extractor.extract_processor import ExtractProcessor
+from core.rag.models.document import Document
+from core.workflow.nodes.document_extractor import node
+
+
+class FakeStorage:
+    def __init__(self):
+        self.files: dict[str, bytes] = {}
+
+    def save(self, filename, data):
+        self.files[filename] = data
+
+    def load_once(self, filename):
+        return self.files[filename]
+
+    def delete(self, filename):
+        del self.files[filename]
+
+
+@pytest.fixture
+def cache():
+    """Fake storage and index table, the index maps (tenant, hash, extractor) to index rows"""
+    fake_storage = FakeStorage()
+    index: dict[frozenset, SimpleNamespace] = {}
+
+    def execute(statement):
+        result = MagicMock()
+        result.first.return_value = index.get(frozenset(statement.compile().params.values()))
+        return result
+
+    def add(row):
+        index[frozenset((row.tenant_id, row.content_hash, row.extractor))] = SimpleNamespace(
+            id=row.storage_key, storage_key=row.storage_key, last_used_at=datetime.now(UTC).replace(tzinfo=None)
+        )
+
+    session = MagicMock()
+    session.execute.side_effect = execute
+    session.add.side_effect = add
+    # nothing to evict
+    session.scalars.return_value = []
+    session.scalar.return_value = 0
+    with (
+        patch.object(extraction_cache, "storage", fake_storage),
+        patch.object(extraction_cache, "Session") as mock_session,
+        patch.object(extraction_cache, "db"),
+        patch.object(extraction_cache, "dify_config") as mock_config,
+    ):
+        mock_session.return_value.__enter__.return_value = session
+        mock_config.EXTRACTION_CACHE_ENABLED = True
+        mock_config.EXTRACTION_CACHE_RETENTION_DAYS = 30
+        mock_config.EXTRACTION_CACHE_MAX_SIZE_PER_TENANT = 1
+        yield SimpleNamespace(storage=fake_storage, index=index, config=mock_config, session=session)
+
+
+def test_extraction_results_are_reused(cache):
+    documents = [Document(page_content="page 1", metadata={"page": 0}), Document(page_content="page 2")]
+    extract = MagicMock(return_value=documents)
+
+    first = extraction_cache.get_or_extract("tenant", "hash", "dify:.pdf", extract)
+    second = extraction_cache.get_or_extract("tenant", "hash", "dify:.pdf", extract)
+
+    extract.assert_called_once()
+    assert first == documents
+    assert [(d.page_content, d.metadata) for d in second] == [("page 1", {"page": 0}), ("page 2", {})]
+    assert len(cache.storage.files) == 1
+    (storage_key,) = cache.storage.files
+    assert storage_key.startswith("extraction_caches/tenant/hash/")
+
+
+def test_extraction_results_are_keyed_by_tenant_and_extractor(cache):
+    extract = MagicMock(return_value=[Document(page_content="text")])
+
+    extraction_cache.get_or_extract("tenant", "hash", "dify:.pdf", extract)
+    extraction_cache.get_or_extract("other-tenant", "hash", "dify:.pdf", extract)
+    extraction_cache.get_or_extract("tenant", "hash", "Unstructured:.pdf", extract)
+
+    assert extract.call_count == 3
+    assert len(cache.storage.files) == 3
+
+
+def test_missing_result_is_extracted_again(cache):
+    extract = MagicMock(return_value=[Document(page_content="text")])
+    extraction_cache.get_or_extract("tenant", "hash", "dify:.pdf", extract)
+    cache.storage.files.clear()
+
+    assert extraction_cache.get_or_extract_text("tenant", "hash", "dify:.pdf", lambda: "text") == "text"
+
+
+def test_disabled_cache_always_extracts(cache):
+    cache.config.EXTRACTION_CACHE_ENABLED = False
+    extract = MagicMock(return_value=[Document(page_content="text")])
+
+    extraction_cache.get_or_extract("tenant", "hash", "dify:.pdf", extract)
+    extraction_cache.get_or_extract("tenant", "hash", "dify:.pdf", extract)
+
+    assert extract.call_count == 2
+    assert cache.storage.files == {}
+
+
+def test_extract_processor_skips_download_on_hit(cache):
+    upload_file = SimpleNamespace(tenant_id="tenant", key="upload_files/tenant/doc.pdf", hash="hash", created_by="user")
+    extract_setting = ExtractSetting.model_construct(datasource_type="upload_file", upload_file=upload_file)
+
+    with patch.object(ExtractProcessor, "_extract_file", return_value=[Document(page_content="text")]) as extract:
+        for _ in range(2):
+            documents = ExtractProcessor.extract(extract_setting)
+            assert [d.page_content for d in documents] == ["text"]
+
+    extract.assert_called_once()
+
+
+def test_extract_processor_does_not_cache_word_documents(cache):
+    # word documents are extracted with their images saved as upload files of the extracted file
+    upload_file = SimpleNamespace(
+        tenant_id="tenant", key="upload_files/tenant/doc.docx", hash="hash", created_by="user"
+    )
+    extract_setting = ExtractSetting.model_construct(datasource_type="upload_file", upload_file=upload_file)
+
+    with patch.object(ExtractProcessor, "_extract_file", return_value=[Document(page_content="text")]) as extract:
+        ExtractProcessor.extract(extract_setting)
+        ExtractProcessor.extract(extract_setting)
+
+    assert extract.call_count == 2
+    assert cache.storage.files == {}
+
+
+def test_delete_removes_results_and_index_rows(cache):
+    extraction_cache.get_or_extract("tenant", "hash", "dify:.pdf", lambda: [Document(page_content="text")])
+    (storage_key,) = cache.storage.files
+    row = SimpleNamespace(storage_key=storage_key)
+    cache.session.scalars.return_value = [row]
+
+    extraction_cache.delete("tenant", ["hash"])
+
+    assert cache.storage.files == {}
+    cache.session.delete.assert_called_once_with(row)
+    cache.session.commit.assert_called()
+
+
+def test_delete_without_content_hashes_does_nothing(cache):
+    extraction_cache.delete("tenant", [])
+
+    cache.session.scalars.assert_not_called()
+
+
+def test_last_use_is_recorded_on_hits(cache):
+    extraction_cache.get_or_extract("tenant", "hash", "dify:.pdf", lambda: [Document(page_content="text")])
+    (row,) = cache.index.values()
+    cache.session.reset_mock()
+
+    extraction_cache.get_or_extract("tenant", "hash", "dify:.pdf", MagicMock())
+    # the last use was just recorded
+    assert cache.session.execute.call_count == 1
+
+    row.last_used_at -= timedelta(days=1)
+    extraction_cache.get_or_extract("tenant", "hash", "dify:.pdf", MagicMock())
+    assert cache.session.execute.call_count == 3
+    assert cache.session.execute.call_args.args[0].is_update
+
+
+def test_expired_and_least_recently_used_results_are_evicted(cache):
+    megabyte = 1024 * 1024
+    expired = SimpleNamespace(storage_key="expired", size=megabyte)
+    least_recently_used = [SimpleNamespace(storage_key=f"result_{i}", size=megabyte) for i in range(3)]
+    cache.storage.files.update({"expired": b"", **{row.storage_key: b"" for row in least_recently_used}})
+    cache.session.scalars.side_effect = [[expired], least_recently_used]
+    cache.session.scalar.return_value = 3 * megabyte
+
+    extraction_cache._evict("tenant")
+
+    # results are evicted until the tenant is back under its limit of 1 MB
+    assert cache.storage.files.keys() == {"result_2"}
+    assert [call.args[0] for call in cache.session.delete.call_args_list] == [expired, *least_recently_used[:2]]
+
+
+def test_workflow_does_not_cache_plain_text_files(cache):
+    file = SimpleNamespace(tenant_id="tenant", extension=".txt", mime_type="text/plain")
+    with patch.object(node, "_download_file_content", return_value=b"text"):
+        assert node._extract_text_from_file(file) == "text"
+
+    assert cache.storage.files == {}
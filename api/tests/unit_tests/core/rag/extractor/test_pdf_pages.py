@@ -0,0 +1,103 @@
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest.mock import patch
+
+from core.rag.extractor import pdf_pages
+from core.rag.extractor.pdf_pages import iter_pdf_page_texts
+
+logger = logging.getLogger(__name__)
+
+
+def _synthetic_pdf(page_count: int, lines_per_page: int = 40) -> bytes:
+    """Build a PDF of `page_count` pages of text lines"""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids ["
+        + b" ".join(f"{4 + 2 * i} 0 R".encode() for i in range(page_count))
+        + f"] /Count {page_count} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i in range(page_count):
+        lines = " ".join(
+            f"(page {i} line {j} lorem ipsum dolor sit amet consectetur) Tj T*" for j in range(lines_per_page)
+        )
+        content = f"BT /F1 10 Tf 12 TL 40 800 Td {lines} ET".encode()
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents {5 + 2 * i} 0 R"
+            " /Resources << /Font << /F1 3 0 R >> >> >>".encode()
+        )
+        objects.append(f"<< /Length {len(content)} >>\nstream\n".encode() + content + b"\nendstream")
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref_offset = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    pdf += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return bytes(pdf)
+
+
+def test_iter_pdf_page_texts_inline():
+    with patch.object(pdf_pages, "get_executor", return_value=None):
+        texts = list(iter_pdf_page_texts(_synthetic_pdf(3)))
+
+    assert len(texts) == 3
+    for i, text in enumerate(texts):
+        assert f"page {i} line 0" in text
+        assert f"page {i} line 39" in text
+
+
+def test_iter_pdf_page_texts_in_pool_keeps_page_order(tmp_path):
+    content = _synthetic_pdf(100)
+    with patch.object(pdf_pages, "get_executor", return_value=None):
+        expected = list(iter_pdf_page_texts(content))
+
+    # pdfium is not thread safe, a single thread stands in for the process pool
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with (
+            patch.object(pdf_pages, "get_executor", return_value=executor),
+            patch.object(executor, "submit", wraps=executor.submit) as submit,
+            patch("tempfile.tempdir", str(tmp_path)),
+        ):
+            assert list(iter_pdf_page_texts(content)) == expected
+            # 100 pages in ranges of 32 pages
+            assert submit.call_count == 4
+
+    # the temporary copy of the content is removed
+    assert os.listdir(tmp_path) == []
+
+
+def test_iter_pdf_page_texts_small_documents_are_extracted_inline():
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with (
+            patch.object(pdf_pages, "get_executor", return_value=executor),
+            patch.object(executor, "submit") as submit,
+        ):
+            assert len(list(iter_pdf_page_texts(_synthetic_pdf(10)))) == 10
+            submit.assert_not_called()
+
+
+def test_benchmark_pdf_extraction_process_pool(tmp_path):
+    file_path = tmp_path / "large.pdf"
+    file_path.write_bytes(_synthetic_pdf(1000))
+
+    with patch.object(pdf_pages, "get_executor", return_value=None):
+        started_at = time.perf_counter()
+        expected = list(iter_pdf_page_texts(str(file_path)))
+        inline_latency = time.perf_counter() - started_at
+
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        with patch.object(pdf_pages, "get_executor", return_value=executor):
+            # spawn the workers before measuring
+            list(iter_pdf_page_texts(str(file_path)))
+            started_at = time.perf_counter()
+            texts = list(iter_pdf_page_texts(str(file_path)))
+            pool_latency = time.perf_counter() - started_at
+
+    assert texts == expected
+    logger.info(f"1000 pages extracted in {inline_latency:.2f}s inline, {pool_latency:.2f}s with 4 processes")
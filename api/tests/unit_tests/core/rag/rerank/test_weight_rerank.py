@@ -0,0 +1,65 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from core.rag.models.document import Document
+from core.rag.rerank.entity.weight import KeywordSetting, VectorSetting, Weights
+from core.rag.rerank.weight_rerank import WeightRerankRunner
+
+VECTOR_SETTING = VectorSetting(vector_weight=1.0, embedding_provider_name="openai", embedding_model_name="embedding")
+
+
+@pytest.fixture
+def runner():
+    return WeightRerankRunner(
+        "tenant_id", Weights(vector_setting=VECTOR_SETTING, keyword_setting=KeywordSetting(keyword_weight=0.0))
+    )
+
+
+def _document(doc_id: str, vector: list[float], score=None) -> Document:
+    metadata = {"doc_id": doc_id}
+    if score is not None:
+        metadata["score"] = score
+    return Document(page_content=doc_id, vector=vector, metadata=metadata)
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def test_scored_documents_skip_the_embedding_model(runner):
+    documents = [_document("a", [1.0, 0.0], score=0.9), _document("b", [0.0, 1.0], score=0.2)]
+
+    with patch("core.rag.rerank.weight_rerank.ModelManager") as model_manager:
+        scores = runner._calculate_cosine("tenant_id", "query", documents, VECTOR_SETTING)
+
+    assert scores == [0.9, 0.2]
+    model_manager.assert_not_called()
+
+
+def test_cosine_uses_the_passed_query_vector(runner):
+    query_vector = [0.6, 0.8, 0.0]
+    vectors = [[1.0, 0.0, 0.0], [0.3, 0.4, 1.2], [2.0, 1.0, 3.0]]
+    documents = [_document("a", vectors[0]), _document("b", vectors[1], score=0.5), _document("c", vectors[2])]
+
+    with patch("core.rag.rerank.weight_rerank.ModelManager") as model_manager:
+        scores = runner._calculate_cosine("tenant_id", "query", documents, VECTOR_SETTING, query_vector)
+
+    assert scores == pytest.approx([_cosine(query_vector, vectors[0]), 0.5, _cosine(query_vector, vectors[2])])
+    model_manager.assert_not_called()
+
+
+def test_query_is_embedded_without_query_vector(runner):
+    documents = [_document("a", [1.0, 0.0]), _document("b", [0.0, 1.0])]
+
+    with (
+        patch("core.rag.rerank.weight_rerank.ModelManager"),
+        patch("core.rag.rerank.weight_rerank.CacheEmbedding") as cache_embedding,
+    ):
+        cache_embedding.return_value.embed_query.return_value = [1.0, 1.0]
+        reranked = runner.run("query", documents, top_n=1)
+
+    cache_embedding.return_value.embed_query.assert_called_once_with("query")
+    assert len(reranked) == 1
+    assert reranked[0].metadata["score"] == pytest.approx(_cosine([1.0, 1.0], [1.0, 0.0]))
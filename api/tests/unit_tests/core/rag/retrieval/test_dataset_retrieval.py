@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from flask import Flask
+
+from core.rag.retrieval.dataset_retrieval import DatasetRetrieval
+
+
+def _dataset(dataset_id: str, model: str = "embedding", search_method: str = "semantic_search"):
+    return SimpleNamespace(
+        id=dataset_id,
+        tenant_id="tenant_id",
+        provider="vendor",
+        indexing_technique="high_quality",
+        embedding_model_provider="openai",
+        embedding_model=model,
+        retrieval_model={
+            "search_method": search_method,
+            "top_k": 2,
+            "score_threshold_enabled": False,
+            "reranking_enable": False,
+        },
+    )
+
+
+def test_query_is_embedded_once_for_datasets_with_the_same_model():
+    datasets = [_dataset("dataset_1"), _dataset("dataset_2"), _dataset("dataset_3", search_method="hybrid_search")]
+    datasets_by_id = {dataset.id: dataset for dataset in datasets}
+    # db.session.query(Dataset).filter(Dataset.id == dataset_id).first()
+    session = SimpleNamespace(
+        query=lambda model: SimpleNamespace(
+            filter=lambda condition: SimpleNamespace(first=lambda: datasets_by_id[condition.right.value])
+        )
+    )
+
+    with (
+        patch("core.rag.retrieval.dataset_retrieval.RetrievalService.embed_query", return_value=[0.1, 0.2]) as embed,
+        patch("core.rag.retrieval.dataset_retrieval.RetrievalService.retrieve", return_value=[]) as retrieve,
+        patch("core.rag.retrieval.dataset_retrieval.db.session", session),
+        patch.object(DatasetRetrieval, "_on_query"),
+    ):
+        with Flask(__name__).app_context():
+            DatasetRetrieval().multiple_retrieve(
+                app_id="app_id",
+                tenant_id="tenant_id",
+                user_id="user_id",
+                user_from="account",
+                available_datasets=datasets,
+                query="query",
+                top_k=4,
+                score_threshold=0.0,
+                reranking_mode="reranking_model",
+                reranking_enable=False,
+            )
+
+    embed.assert_called_once_with(datasets[0], "query")
+    assert retrieve.call_count == 3
+    assert all(call.kwargs["query_vector"] == [0.1, 0.2] for call in retrieve.call_args_list)
+
+
+def test_query_is_not_shared_between_embedding_models():
+    datasets = [_dataset("dataset_1"), _dataset("dataset_2", model="other_embedding")]
+
+    with patch("core.rag.retrieval.dataset_retrieval.RetrievalService.embed_query") as embed:
+        assert DatasetRetrieval._get_shared_query_vector(datasets, "query") is None
+        assert DatasetRetrieval._get_shared_query_vector([_dataset("d", search_method="full_text_search")], "q") is None
+
+    embed.assert_not_called()
@@ -0,0 +1,140 @@
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from core.rag.models.document import Document
+from core.rag.retrieval.retrieval_stats_buffer import RetrievalStatsBuffer
+
+
+@pytest.fixture(autouse=True)
+def buffer_enabled():
+    with patch("core.rag.retrieval.retrieval_stats_buffer.dify_config.RETRIEVAL_STATS_BUFFER_ENABLED", True):
+        yield
+
+
+def _document(doc_id: str, document_id: str = "document_id") -> Document:
+    return Document(
+        page_content="content",
+        metadata={"doc_id": doc_id, "document_id": document_id, "dataset_id": "dataset_id"},
+        provider="dify",
+    )
+
+
+def test_buffered_stats_are_flushed_in_batches(fake_redis):
+    with (
+        patch.object(RetrievalStatsBuffer, "_apply_segment_hits") as apply_segment_hits,
+        patch.object(RetrievalStatsBuffer, "_insert_queries") as insert_queries,
+    ):
+        RetrievalStatsBuffer.add_segment_hits([_document("node_1"), _document("node_2")])
+        RetrievalStatsBuffer.add_segment_hits([_document("node_1"), Document(page_content="external")])
+        RetrievalStatsBuffer.add_queries("query", ["dataset_1", "dataset_2"], "app_id", "end_user", "user_id")
+
+        # nothing is written on the request path
+        apply_segment_hits.assert_not_called()
+        insert_queries.assert_not_called()
+
+        assert RetrievalStatsBuffer.flush() == (2, 2)
+
+        apply_segment_hits.assert_called_once_with(
+            {"dataset_id:document_id:node_1": 2, "dataset_id:document_id:node_2": 1}
+        )
+        rows = insert_queries.call_args.args[0]
+        assert [row["dataset_id"] for row in rows] == ["dataset_1", "dataset_2"]
+        assert rows[0]["created_by_role"] == "end_user"
+        assert rows[0]["created_at"] == rows[1]["created_at"]
+
+        # the buffers were emptied
+        assert RetrievalStatsBuffer.flush() == (0, 0)
+
+
+def test_stats_are_written_directly_when_buffer_disabled(fake_redis):
+    with (
+        patch("core.rag.retrieval.retrieval_stats_buffer.dify_config.RETRIEVAL_STATS_BUFFER_ENABLED", False),
+        patch.object(RetrievalStatsBuffer, "_apply_segment_hits") as apply_segment_hits,
+        patch.object(RetrievalStatsBuffer, "_insert_queries") as insert_queries,
+    ):
+        RetrievalStatsBuffer.add_segment_hits([_document("node_1"), _document("node_1")])
+        RetrievalStatsBuffer.add_queries("query", ["dataset_1"], "app_id", "account", "user_id")
+
+    apply_segment_hits.assert_called_once_with({"dataset_id:document_id:node_1": 2})
+    insert_queries.assert_called_once()
+    assert fake_redis.data == {}
+
+
+def test_segment_hits_of_a_failed_flush_are_flushed_next_time(fake_redis):
+    with (
+        patch.object(RetrievalStatsBuffer, "_apply_segment_hits") as apply_segment_hits,
+        patch.object(RetrievalStatsBuffer, "_insert_queries"),
+        patch("core.rag.retrieval.retrieval_stats_buffer.db"),
+    ):
+        RetrievalStatsBuffer.add_segment_hits([_document("node_1"), _document("node_2")])
+        apply_segment_hits.side_effect = Exception("database unavailable")
+
+        assert RetrievalStatsBuffer.flush() == (0, 0)
+
+        # the hits are back in the buffer, with the hits of the retrievals since
+        RetrievalStatsBuffer.add_segment_hits([_document("node_1")])
+        apply_segment_hits.side_effect = None
+        apply_segment_hits.reset_mock()
+
+        assert RetrievalStatsBuffer.flush() == (2, 0)
+        apply_segment_hits.assert_called_once_with(
+            {"dataset_id:document_id:node_1": 2, "dataset_id:document_id:node_2": 1}
+        )
+        assert fake_redis.data == {}
+
+
+def test_segment_hits_of_an_interrupted_flush_are_flushed_next_time(fake_redis):
+    # hits left aside by a flush which was killed before applying them
+    fake_redis.hincrby(RetrievalStatsBuffer._PROCESSING_SEGMENT_HITS_KEY, "dataset_id:document_id:node_1", 3)
+    RetrievalStatsBuffer.add_segment_hits([_document("node_1")])
+
+    with (
+        patch.object(RetrievalStatsBuffer, "_apply_segment_hits") as apply_segment_hits,
+        patch.object(RetrievalStatsBuffer, "_insert_queries"),
+    ):
+        assert RetrievalStatsBuffer.flush() == (1, 0)
+
+    apply_segment_hits.assert_called_once_with({"dataset_id:document_id:node_1": 4})
+
+
+def test_queries_are_kept_until_inserted(fake_redis):
+    RetrievalStatsBuffer.add_queries("query", ["dataset_1", "dataset_2"], "app_id", "end_user", "user_id")
+
+    with (
+        patch.object(
+            RetrievalStatsBuffer,
+            "_insert_queries",
+            side_effect=OperationalError("INSERT", {}, Exception("database unavailable")),
+        ),
+        patch("core.rag.retrieval.retrieval_stats_buffer.db"),
+        pytest.raises(OperationalError, match="database unavailable"),
+    ):
+        RetrievalStatsBuffer.flush()
+
+    with patch.object(RetrievalStatsBuffer, "_insert_queries") as insert_queries:
+        assert RetrievalStatsBuffer.flush() == (0, 2)
+
+    assert [row["dataset_id"] for row in insert_queries.call_args.args[0]] == ["dataset_1", "dataset_2"]
+    assert fake_redis.data[RetrievalStatsBuffer._QUERIES_KEY] == []
+
+
+def test_queries_failing_to_insert_are_dropped(fake_redis):
+    RetrievalStatsBuffer.add_queries("query", ["dataset_1", "bad_dataset", "dataset_2"], "app_id", "account", "id")
+    fake_redis.rpush(RetrievalStatsBuffer._QUERIES_KEY, "not json")
+    inserted = []
+
+    def insert_queries(rows):
+        if any(row["dataset_id"] == "bad_dataset" for row in rows):
+            raise IntegrityError("INSERT", {}, Exception("foreign key violation"))
+        inserted.extend(row["dataset_id"] for row in rows)
+
+    with (
+        patch.object(RetrievalStatsBuffer, "_insert_queries", side_effect=insert_queries),
+        patch("core.rag.retrieval.retrieval_stats_buffer.db"),
+    ):
+        assert RetrievalStatsBuffer.flush() == (0, 2)
+
+    assert inserted == ["dataset_1", "dataset_2"]
+    assert fake_redis.data[RetrievalStatsBuffer._QUERIES_KEY] == []
@@ -0,0 +1,40 @@
+import random
+import string
+
+from core.rag.splitter.fixed_text_splitter import FixedRecursiveCharacterTextSplitter
+
+
+def _generate_document(size: int) -> str:
+    rand = random.Random(0)
+    words = ["".join(rand.choices(string.ascii_lowercase, k=rand.randint(2, 10))) for _ in range(5000)]
+
+    paragraphs = []
+    length = 0
+    while length < size:
+        paragraph = " ".join(rand.choices(words, k=rand.randint(40, 200))) + "."
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+
+    return "\n\n".join(paragraphs)
+
+
+def test_split_text_respects_chunk_size():
+    splitter = FixedRecursiveCharacterTextSplitter.from_encoder(
+        embedding_model_instance=None, chunk_size=500, chunk_overlap=50, fixed_separator="\n\n"
+    )
+
+    chunks = splitter.split_text(_generate_document(100 * 1024))
+
+    assert chunks
+    assert all(len(chunk) <= 500 for chunk in chunks)
+
+
+def test_split_10mb_document(benchmark):
+    text = _generate_document(10 * 1024 * 1024)
+    splitter = FixedRecursiveCharacterTextSplitter.from_encoder(
+        embedding_model_instance=None, chunk_size=500, chunk_overlap=50, fixed_separator="\n\n"
+    )
+
+    chunks = benchmark.pedantic(splitter.split_text, args=(text,), rounds=1, iterations=1)
+
+    assert chunks
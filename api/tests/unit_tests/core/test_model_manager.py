@@ -1,11 +1,11 @@
 from unittest.mock import MagicMock, patch
 
 import pytest
-import redis
 
 from core.entities.provider_entities import ModelLoadBalancingConfiguration
-from core.model_manager import LBModelManager
+from core.model_manager import LBModelManager, ModelInstance
 from core.model_runtime.entities.model_entities import ModelType
+from core.model_runtime.model_providers.__base.text_embedding_model import TextEmbeddingModel
 from extensions.ext_redis import redis_client
 
 
@@ -21,7 +21,7 @@ def lb_model_manager():
         tenant_id="tenant_id",
         provider="openai",
         model_type=ModelType.LLM,
-        model="gpt-4",
+        model="gpt-4-round-robin",
         load_balancing_configs=load_balancing_configs,
         managed_credentials={"openai_api_key": "fake_key"},
     )
@@ -40,8 +40,7 @@ def lb_model_manager():
 
 
 def test_lb_model_manager_fetch_next(mocker, lb_model_manager):
-    # initialize redis client
-    redis_client.initialize(redis.Redis())
+    mocker.patch("core.model_manager.dify_config.MODEL_LB_LATENCY_WEIGHTING_ENABLED", False)
 
     assert len(lb_model_manager._load_balancing_configs) == 3
 
@@ -53,20 +52,102 @@ def test_lb_model_manager_fetch_next(mocker, lb_model_manager):
     assert lb_model_manager.in_cooldown(config2) is False
     assert lb_model_manager.in_cooldown(config3) is False
 
-    start_index = 0
+    # config1 is in cooldown and skipped
+    assert lb_model_manager.fetch_next() == config2
+    assert lb_model_manager.fetch_next() == config3
+    assert lb_model_manager.fetch_next() == config2
+    assert lb_model_manager._state.index == 2
 
-    def incr(key):
-        nonlocal start_index
-        start_index += 1
-        return start_index
+    # observed response times are recorded, but do not weight the round robin unless enabled
+    lb_model_manager.observe_latency(config2, 1.0)
+    lb_model_manager.observe_latency(config2, 2.0)
+    assert lb_model_manager._state.latencies == {"id2": pytest.approx(1.3)}
+    assert lb_model_manager.fetch_next() == config3
+
+
+def test_lb_model_manager_state_is_shared_by_managers_of_the_model():
+    first_manager = _create_lb_model_manager("gpt-4-shared-state")
+    second_manager = _create_lb_model_manager("gpt-4-shared-state")
+    other_model_manager = _create_lb_model_manager("gpt-4-other-state")
+
+    with patch.object(LBModelManager, "in_cooldown", return_value=False):
+        assert first_manager.fetch_next().id == "id1"
+        assert second_manager.fetch_next().id == "id2"
+        assert first_manager.fetch_next().id == "id1"
+        assert other_model_manager.fetch_next().id == "id1"
+
+    assert first_manager._state is second_manager._state
+    assert first_manager._state is not other_model_manager._state
+
+
+def _create_lb_model_manager(model: str) -> LBModelManager:
+    return LBModelManager(
+        tenant_id="tenant_id",
+        provider="openai",
+        model_type=ModelType.LLM,
+        model=model,
+        load_balancing_configs=[
+            ModelLoadBalancingConfiguration(id="id1", name="first", credentials={"openai_api_key": "fake_key"}),
+            ModelLoadBalancingConfiguration(id="id2", name="second", credentials={"openai_api_key": "fake_key"}),
+        ],
+    )
+
+
+def test_lb_model_manager_mirrors_cooldowns_from_redis(fake_redis):
+    lb_model_manager = _create_lb_model_manager("gpt-4-cooldown")
+
+    pipeline = MagicMock()
+    pipeline.execute.return_value = [30000, -2]
 
     with (
-        patch.object(redis_client, "incr", side_effect=incr),
-        patch.object(redis_client, "set", return_value=None),
-        patch.object(redis_client, "expire", return_value=None),
+        patch.object(redis_client, "pipeline", return_value=pipeline) as mock_pipeline,
+        patch.object(redis_client, "setex", return_value=None),
     ):
-        config = lb_model_manager.fetch_next()
-        assert config == config2
+        # cooldown of id1 is set by another process
+        assert lb_model_manager.fetch_next().id == "id2"
+        assert lb_model_manager.fetch_next().id == "id2"
+
+        lb_model_manager.cooldown(lb_model_manager._load_balancing_configs[1], expire=10)
+        assert lb_model_manager.fetch_next() is None
+
+        # redis is read once per refresh interval, not per invocation
+        assert mock_pipeline.call_count == 1
+        assert pipeline.pttl.call_count == 2
+
+
+def test_lb_model_manager_latency_weighting(mocker):
+    lb_model_manager = _create_lb_model_manager("gpt-4-latency")
+    config1, config2 = lb_model_manager._load_balancing_configs
+
+    mocker.patch("core.model_manager.dify_config.MODEL_LB_LATENCY_WEIGHTING_ENABLED", True)
+    mocker.patch.object(lb_model_manager, "in_cooldown", return_value=False)
+    choices = mocker.patch("core.model_manager.random.choices", return_value=[config1])
+
+    lb_model_manager.observe_latency(config1, 1.0)
+    lb_model_manager.observe_latency(config2, 4.0)
+    lb_model_manager.observe_latency(config2, 4.0)
+
+    assert lb_model_manager.fetch_next() == config1
+    assert choices.call_args.kwargs["weights"] == [1.0, 0.25]
+
+
+def test_get_text_embedding_num_tokens_is_memoized():
+    model_instance = ModelInstance.__new__(ModelInstance)
+    model_instance.provider_model_bundle = MagicMock()
+    model_instance.provider_model_bundle.configuration.tenant_id = "tenant_id"
+    model_instance.provider = "openai"
+    model_instance.model = "text-embedding-memoized"
+    model_instance.credentials = {}
+    model_instance.load_balancing_manager = None
+    model_instance.model_type_instance = MagicMock(spec=TextEmbeddingModel)
+    get_num_tokens = model_instance.model_type_instance.get_num_tokens
+    get_num_tokens.side_effect = lambda model, credentials, texts: [len(text) for text in texts]
+
+    assert model_instance.get_text_embedding_num_tokens(["a", "bb", "a"]) == [1, 2, 1]
+    assert get_num_tokens.call_args.kwargs["texts"] == ["a", "bb"]
+
+    assert model_instance.get_text_embedding_num_tokens(["bb", "ccc"]) == [2, 3]
+    assert get_num_tokens.call_args.kwargs["texts"] == ["ccc"]
 
-        config = lb_model_manager.fetch_next()
-        assert config == config3
+    assert model_instance.get_text_embedding_num_tokens(["a", "ccc"]) == [1, 3]
+    assert get_num_tokens.call_count == 2
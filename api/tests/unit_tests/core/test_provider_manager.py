@@ -1,3 +1,58 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from core.entities.provider_entities import ProviderQuotaType, QuotaConfiguration, QuotaUnit
+from core.provider_manager import ProviderManager
+
+
+def _configurations_with_trial_quota(quota_used: int, quota_limit: int):
+    quota_configuration = QuotaConfiguration(
+        quota_type=ProviderQuotaType.TRIAL,
+        quota_unit=QuotaUnit.TIMES,
+        quota_used=quota_used,
+        quota_limit=quota_limit,
+        is_valid=quota_limit > quota_used,
+    )
+    provider_configuration = SimpleNamespace(
+        system_configuration=SimpleNamespace(quota_configurations=[quota_configuration])
+    )
+    return SimpleNamespace(configurations={"langgenius/openai/openai": provider_configuration}), quota_configuration
+
+
+def _provider_record(quota_used: int, quota_limit: int):
+    return SimpleNamespace(provider_name="openai", quota_type="trial", quota_used=quota_used, quota_limit=quota_limit)
+
+
+def test_refresh_quota_configurations_updates_quota_usage():
+    provider_configurations, quota_configuration = _configurations_with_trial_quota(quota_used=10, quota_limit=200)
+
+    with patch("core.provider_manager.db") as db:
+        db.session.query.return_value.filter.return_value.all.return_value = [_provider_record(42, 200)]
+        assert ProviderManager._refresh_quota_configurations("tenant_id", provider_configurations)
+
+    assert quota_configuration.quota_used == 42
+    assert quota_configuration.is_valid
+
+
+def test_refresh_quota_configurations_detects_exhausted_quota():
+    provider_configurations, _ = _configurations_with_trial_quota(quota_used=199, quota_limit=200)
+
+    with patch("core.provider_manager.db") as db:
+        db.session.query.return_value.filter.return_value.all.return_value = [_provider_record(200, 200)]
+        assert not ProviderManager._refresh_quota_configurations("tenant_id", provider_configurations)
+
+
+def test_refresh_quota_configurations_skips_query_without_hosted_quotas():
+    provider_configurations = SimpleNamespace(
+        configurations={"provider": SimpleNamespace(system_configuration=SimpleNamespace(quota_configurations=[]))}
+    )
+
+    with patch("core.provider_manager.db") as db:
+        assert ProviderManager._refresh_quota_configurations("tenant_id", provider_configurations)
+
+    db.session.query.assert_not_called()
+
+
 # from core.entities.provider_entities import ModelSettings
 # from core.model_runtime.entities.model_entities import ModelType
 # from core.model_runtime.model_providers.model_provider_factory import ModelProviderFactory
@@ -1,3 +1,11 @@
+import io
+
+import httpx
+import pytest
+
+from configs import dify_config
+from core.file import File, FileTransferMethod, FileType
+from core.variables import FileVariable
 from core.workflow.entities.variable_pool import VariablePool
 from core.workflow.nodes.http_request import (
     BodyData,
@@ -6,6 +14,7 @@ from core.workflow.nodes.http_request import (
     HttpRequestNodeData,
 )
 from core.workflow.nodes.http_request.entities import HttpRequestNodeTimeout
+from core.workflow.nodes.http_request.exc import ResponseSizeError
 from core.workflow.nodes.http_request.executor import Executor
 
 
@@ -334,3 +343,87 @@ def test_init_params():
     executor = create_executor("key1:value1\n\nkey2:value2\n\n")
     executor._init_params()
     assert executor.params == [("key1", "value1"), ("key2", "value2")]
+
+
+def test_executor_streams_large_binary_file(monkeypatch):
+    monkeypatch.setattr(dify_config, "HTTP_REQUEST_NODE_STREAMING_THRESHOLD", 10)
+    stream = io.BytesIO(b"x" * 100)
+    monkeypatch.setattr("core.workflow.nodes.http_request.executor.file_manager.download_stream", lambda f: stream)
+    variable_pool = VariablePool(system_variables={}, user_inputs={})
+    variable_pool.add(
+        ["1111", "file"],
+        FileVariable(
+            name="file",
+            value=File(
+                tenant_id="1",
+                type=FileType.DOCUMENT,
+                transfer_method=FileTransferMethod.LOCAL_FILE,
+                related_id="1111",
+                storage_key="upload_files/1/file.bin",
+                size=100,
+            ),
+        ),
+    )
+    node_data = HttpRequestNodeData(
+        title="Test streamed binary body",
+        method="post",
+        url="https://api.example.com/upload",
+        authorization=HttpRequestNodeAuthorization(type="no-auth"),
+        headers="",
+        params="",
+        body=HttpRequestNodeBody(type="binary", data=[BodyData(key="file", type="file", file=["1111", "file"])]),
+    )
+
+    executor = Executor(
+        node_data=node_data,
+        timeout=HttpRequestNodeTimeout(connect=10, read=30, write=30),
+        variable_pool=variable_pool,
+    )
+
+    assert executor.content is stream
+    assert executor.headers["Content-Length"] == "100"
+    # the streamed body is not read to build the log
+    executor.to_log()
+    assert stream.tell() == 0
+
+    executor.close()
+    assert stream.closed
+
+
+def _chunked_response(content: bytes, content_type: str = "application/octet-stream") -> httpx.Response:
+    chunks = (content[i : i + 16] for i in range(0, len(content), 16))
+    return httpx.Response(200, headers={"content-type": content_type}, content=chunks)
+
+
+def test_read_response_spools_large_body(monkeypatch):
+    monkeypatch.setattr(dify_config, "HTTP_REQUEST_NODE_STREAMING_THRESHOLD", 64)
+    content = bytes(range(256)) * 4
+
+    response = Executor._read_response(_chunked_response(content))
+
+    assert response.body_file is not None
+    assert response.size == len(content)
+    assert response.content == content
+    assert response.is_file
+
+    response.close()
+    assert response.body_file.closed
+
+
+def test_read_response_keeps_small_body_in_response():
+    response = Executor._read_response(httpx.Response(200, content=b'{"status": "ok"}'))
+
+    assert response.body_file is None
+    assert response.text == '{"status": "ok"}'
+
+
+def test_read_response_stops_at_max_size(monkeypatch):
+    monkeypatch.setattr(dify_config, "HTTP_REQUEST_NODE_MAX_BINARY_SIZE", 100)
+    monkeypatch.setattr(dify_config, "HTTP_REQUEST_NODE_MAX_TEXT_SIZE", 100)
+
+    with pytest.raises(ResponseSizeError):
+        Executor._read_response(_chunked_response(b"x" * 200))
+
+    # a declared size over the limit is rejected before the body is read
+    with pytest.raises(ResponseSizeError):
+        Executor._read_response(httpx.Response(200, content=b"x" * 200))
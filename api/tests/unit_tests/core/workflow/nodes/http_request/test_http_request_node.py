@@ -1,5 +1,9 @@
+import io
+import tempfile
+
 import httpx
 
+from configs import dify_config
 from core.app.entities.app_invoke_entities import InvokeFrom
 from core.file import File, FileTransferMethod, FileType
 from core.variables import ArrayFileVariable, FileVariable
@@ -322,3 +326,82 @@ def test_http_request_node_form_with_multiple_files(monkeypatch):
     assert result.outputs is not None
     assert result.outputs["body"] == '{"status":"success"}'
     print(result.outputs["body"])
+
+
+def test_http_request_node_closes_streamed_bodies(monkeypatch):
+    monkeypatch.setattr(dify_config, "HTTP_REQUEST_NODE_STREAMING_THRESHOLD", 10)
+    data = HttpRequestNodeData(
+        title="test",
+        method="post",
+        url="http://example.org/post",
+        authorization=HttpRequestNodeAuthorization(type="no-auth"),
+        headers="",
+        params="",
+        body=HttpRequestNodeBody(
+            type="binary",
+            data=[BodyData(key="file", type="file", value="", file=["1111", "file"])],
+        ),
+    )
+    variable_pool = VariablePool(system_variables={}, user_inputs={})
+    variable_pool.add(
+        ["1111", "file"],
+        FileVariable(
+            name="file",
+            value=File(
+                tenant_id="1",
+                type=FileType.DOCUMENT,
+                transfer_method=FileTransferMethod.LOCAL_FILE,
+                related_id="1111",
+                storage_key="",
+                size=100,
+            ),
+        ),
+    )
+    node = HttpRequestNode(
+        id="1",
+        config={"id": "1", "data": data.model_dump()},
+        graph_init_params=GraphInitParams(
+            tenant_id="1",
+            app_id="1",
+            workflow_type=WorkflowType.WORKFLOW,
+            workflow_id="1",
+            graph_config={},
+            user_id="1",
+            user_from=UserFrom.ACCOUNT,
+            invoke_from=InvokeFrom.SERVICE_API,
+            call_depth=0,
+        ),
+        graph=Graph(
+            root_node_id="1",
+            answer_stream_generate_routes=AnswerStreamGenerateRoute(answer_dependencies={}, answer_generate_route={}),
+            end_stream_param=EndStreamParam(end_dependencies={}, end_stream_variable_selector_mapping={}),
+        ),
+        graph_runtime_state=GraphRuntimeState(variable_pool=variable_pool, start_at=0),
+    )
+    request_stream = io.BytesIO(b"x" * 100)
+    monkeypatch.setattr(
+        "core.workflow.nodes.http_request.executor.file_manager.download_stream", lambda *args: request_stream
+    )
+    monkeypatch.setattr(
+        "core.helper.ssrf_proxy.post",
+        lambda *args, **kwargs: httpx.Response(
+            200, headers={"content-type": "text/plain"}, content=iter([kwargs["content"].read()])
+        ),
+    )
+    body_files = []
+    spooled_temporary_file = tempfile.SpooledTemporaryFile
+
+    def record_body_file(*args, **kwargs):
+        body_files.append(spooled_temporary_file(*args, **kwargs))
+        return body_files[-1]
+
+    monkeypatch.setattr(tempfile, "SpooledTemporaryFile", record_body_file)
+
+    result = node._run()
+
+    assert result.status == WorkflowNodeExecutionStatus.SUCCEEDED
+    assert result.outputs is not None
+    assert result.outputs["body"] == "x" * 100
+    assert request_stream.closed
+    assert len(body_files) == 1
+    assert body_files[0].closed
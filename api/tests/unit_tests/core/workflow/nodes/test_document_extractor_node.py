@@ -97,6 +97,7 @@ def test_run_extract_text(
     document_extractor_node.graph_runtime_state = mock_graph_runtime_state
 
     mock_file = Mock(spec=File)
+    mock_file.tenant_id = "test_tenant_id"
     mock_file.mime_type = mime_type
     mock_file.transfer_method = transfer_method
     mock_file.related_id = "test_file_id" if transfer_method == FileTransferMethod.LOCAL_FILE else None
@@ -115,6 +116,7 @@ def test_run_extract_text(
 
     monkeypatch.setattr("core.file.file_manager.download", mock_download)
     monkeypatch.setattr("core.helper.ssrf_proxy.get", mock_ssrf_proxy_get)
+    monkeypatch.setattr("core.rag.extractor.extraction_cache.dify_config.EXTRACTION_CACHE_ENABLED", False)
 
     if mime_type == "application/pdf":
         mock_pdf_extract = Mock(return_value=expected_text[0])
@@ -158,7 +160,7 @@ def test_extract_text_from_pdf(mock_pdf_document):
     mock_text_page = Mock()
     mock_text_page.get_text_range.return_value = "PDF content"
     mock_page.get_textpage.return_value = mock_text_page
-    mock_pdf_document.return_value = [mock_page]
+    mock_pdf_document.return_value.__iter__.return_value = iter([mock_page])
     text = _extract_text_from_pdf(b"%PDF-1.5\n%Test PDF content")
     assert text == "PDF content"
 
@@ -0,0 +1,75 @@
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from werkzeug.exceptions import NotFound
+
+from libs.keyset_pagination import paginate_by_last_id
+from models.model import Conversation
+
+
+def _mock_db(anchor, items):
+    session = MagicMock()
+    anchor_result = MagicMock(first=MagicMock(return_value=anchor))
+    items_result = MagicMock()
+    items_result.unique.return_value.scalars.return_value = iter(items)
+    session.execute.side_effect = [anchor_result, items_result] if anchor is not None else [anchor_result]
+    return patch("libs.keyset_pagination.db", new=MagicMock(session=session)), session
+
+
+def _compile(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_first_page_has_next():
+    session = MagicMock()
+    session.execute.return_value.unique.return_value.scalars.return_value = iter([1, 2, 3])
+    query = select(Conversation).order_by(Conversation.created_at.desc())
+
+    with patch("libs.keyset_pagination.db", new=MagicMock(session=session)):
+        pagination = paginate_by_last_id(
+            query, id_column=Conversation.id, order_column=Conversation.created_at, last_id=None, limit=2
+        )
+
+    assert pagination.items == [1, 2]
+    assert pagination.has_next is True
+    assert pagination.per_page == 2
+    assert pagination.total is None
+
+    sql = _compile(session.execute.call_args.args[0])
+    assert "ORDER BY conversations.created_at DESC, conversations.id DESC" in sql
+    assert "OFFSET" not in sql
+
+
+def test_next_page_seeks_after_last_id():
+    mock_db, session = _mock_db((datetime(2025, 1, 1),), [1])
+    query = select(Conversation).order_by(Conversation.updated_at.asc())
+
+    with mock_db:
+        pagination = paginate_by_last_id(
+            query,
+            id_column=Conversation.id,
+            order_column=Conversation.updated_at,
+            last_id="last_id",
+            limit=2,
+            descending=False,
+        )
+
+    assert pagination.items == [1]
+    assert pagination.has_next is False
+
+    sql = _compile(session.execute.call_args.args[0])
+    assert "(conversations.updated_at, conversations.id) > " in sql
+    assert "ORDER BY conversations.updated_at ASC, conversations.id ASC" in sql
+
+
+def test_unknown_last_id():
+    mock_db, _ = _mock_db(None, [])
+    query = select(Conversation).order_by(Conversation.created_at.desc())
+
+    with mock_db, pytest.raises(NotFound):
+        paginate_by_last_id(
+            query, id_column=Conversation.id, order_column=Conversation.created_at, last_id="last_id", limit=2
+        )
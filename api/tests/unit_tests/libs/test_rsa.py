@@ -1,7 +1,11 @@
+import weakref
+from unittest.mock import MagicMock
+
+import pytest
 import rsa as pyrsa
 from Crypto.PublicKey import RSA
 
-from libs import gmpy2_pkcs10aep_cipher
+from libs import gmpy2_pkcs10aep_cipher, rsa
 
 
 def test_gmpy2_pkcs10aep_cipher() -> None:
@@ -27,3 +31,70 @@ def test_gmpy2_pkcs10aep_cipher() -> None:
     encrypted_by_private_key = private_cipher_rsa.encrypt(message=raw_text_bytes)
     decrypted_by_private_key = private_cipher_rsa.decrypt(encrypted_by_private_key)
     assert decrypted_by_private_key == raw_text_bytes
+
+
+def _mock_key_storage(mocker, private_key: bytes):
+    mocker.patch("libs.rsa.redis_client", new=MagicMock(get=MagicMock(return_value=None)))
+    storage = mocker.patch("libs.rsa.storage", new=MagicMock(load=MagicMock(return_value=private_key)))
+    return storage.load
+
+
+def test_decrypt_caches_decoding_and_tokens(mocker) -> None:
+    private_key = RSA.generate(2048)
+    storage_load = _mock_key_storage(mocker, private_key.export_key())
+    rsa_decrypt = mocker.spy(gmpy2_pkcs10aep_cipher.PKCS1OAepCipher, "decrypt")
+
+    encrypted_text = rsa.encrypt("raw_text", private_key.publickey().export_key())
+
+    assert rsa.decrypt(encrypted_text, "tenant_decrypt") == "raw_text"
+    assert rsa.decrypt(encrypted_text, "tenant_decrypt") == "raw_text"
+
+    assert storage_load.call_count == 1
+    assert rsa_decrypt.call_count == 1
+
+
+@pytest.mark.parametrize("cached", [True, False], ids=["cached", "uncached"])
+def test_credential_resolution_latency(mocker, benchmark, cached) -> None:
+    private_key = RSA.generate(2048)
+    _mock_key_storage(mocker, private_key.export_key())
+
+    public_key = private_key.publickey().export_key()
+    encrypted_texts = [rsa.encrypt(f"api_key_{i}", public_key) for i in range(5)]
+
+    def resolve_credentials():
+        rsa_key, cipher_rsa = rsa.get_decrypt_decoding("tenant_benchmark")
+        return [rsa.decrypt_token_with_decoding(text, rsa_key, cipher_rsa) for text in encrypted_texts]
+
+    def clear_caches():
+        rsa._decoding_cache.clear()
+        rsa._decrypted_token_cache.clear()
+
+    benchmark.group = "credential_resolution"
+    if cached:
+        credentials = benchmark(resolve_credentials)
+    else:
+        # baseline: every round parses the private key and decrypts every token again
+        credentials = benchmark.pedantic(resolve_credentials, setup=clear_caches, rounds=20)
+    assert credentials == [f"api_key_{i}" for i in range(5)]
+
+
+def test_decrypted_tokens_are_overwritten_once_dropped(mocker) -> None:
+    private_key = RSA.generate(2048)
+    _mock_key_storage(mocker, private_key.export_key())
+    now = 0.0
+    mocker.patch.object(rsa, "_decrypted_token_cache", rsa.TTLCache(maxsize=8, ttl=10, timer=lambda: now))
+
+    encrypted_text = rsa.encrypt("raw_text", private_key.publickey().export_key())
+    assert rsa.decrypt(encrypted_text, "tenant_overwrite") == "raw_text"
+    (token,) = rsa._decrypted_token_cache.values()
+    token_ref = weakref.ref(token)
+    del token
+
+    # the expired token is dropped on the next lookup
+    now = 11.0
+    assert rsa.decrypt(encrypted_text, "tenant_overwrite") == "raw_text"
+    assert token_ref() is None
+
+    token = rsa._TokenBuffer(b"raw_text")
+    token.__del__()
+    assert token == bytes(8)
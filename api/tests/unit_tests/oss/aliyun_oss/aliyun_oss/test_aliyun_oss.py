@@ -1,13 +1,18 @@
-from unittest.mock import patch
+import io
+from unittest.mock import MagicMock, patch
 
 import pytest
 from oss2 import Auth  # type: ignore
+from oss2.utils import make_crc_adapter  # type: ignore
 
 from extensions.storage.aliyun_oss_storage import AliyunOssStorage
+from extensions.storage.base_storage import STREAM_CHUNK_SIZE
+from services.file_service import _UploadStreamReader
 from tests.unit_tests.oss.__mock.aliyun_oss import setup_aliyun_oss_mock
 from tests.unit_tests.oss.__mock.base import (
     BaseStorageTest,
     get_example_bucket,
+    get_example_filename,
     get_example_folder,
 )
 
@@ -20,3 +25,18 @@ class TestAliyunOss(BaseStorageTest):
             self.storage = AliyunOssStorage()
         self.storage.bucket_name = get_example_bucket()
         self.storage.folder = get_example_folder()
+
+    def test_save_stream_sends_unseekable_stream_in_chunks(self):
+        content = b"x" * (2 * STREAM_CHUNK_SIZE + 10)
+        stream = _UploadStreamReader(io.BytesIO(content), size_limit=len(content))
+        sent = []
+
+        def put_object(key, data):
+            # like the bucket, which wraps the data to check its crc before sending it
+            sent.extend(make_crc_adapter(data))
+
+        with patch.object(self.storage, "client", MagicMock(put_object=put_object)):
+            self.storage.save_stream(get_example_filename(), stream)
+
+        assert b"".join(sent) == content
+        assert stream.size == len(content)
@@ -0,0 +1,72 @@
+import io
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from extensions.storage import google_cloud_storage
+from extensions.storage.google_cloud_storage import GoogleCloudStorage
+from services.file_service import _UploadStreamReader
+
+MB = 1024 * 1024
+
+
+def _resumable_upload(stream, chunk_size: int) -> bytes:
+    """Send a stream like a resumable upload of unknown size, which positions the chunks with tell()"""
+    if stream.tell() != 0:
+        raise ValueError("Stream must be at beginning.")
+    uploaded = bytearray()
+    while True:
+        start = stream.tell()
+        payload = stream.read(chunk_size)
+        assert stream.tell() - start == len(payload)
+        assert start == len(uploaded)
+        uploaded += payload
+        if len(payload) < chunk_size:
+            return bytes(uploaded)
+
+
+class ShortReadStream(io.RawIOBase):
+    """Non seekable stream returning at most 1000 bytes per read"""
+
+    def __init__(self, content: bytes):
+        self._content = io.BytesIO(content)
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        return self._content.read(1000 if size is None or size < 0 else min(size, 1000))
+
+
+@pytest.fixture
+def gcs():
+    with (
+        patch.object(google_cloud_storage, "google_cloud_storage") as mock_module,
+        patch.object(google_cloud_storage, "dify_config") as mock_config,
+    ):
+        mock_config.GOOGLE_STORAGE_SERVICE_ACCOUNT_JSON_BASE64 = None
+        mock_config.GOOGLE_STORAGE_BUCKET_NAME = "dify"
+        storage = GoogleCloudStorage()
+        blob = MagicMock()
+        mock_module.Client.return_value.get_bucket.return_value.blob.return_value = blob
+        yield storage, blob
+
+
+@pytest.mark.parametrize(
+    "make_stream",
+    [
+        lambda content: _UploadStreamReader(io.BytesIO(content), size_limit=len(content)),
+        ShortReadStream,
+    ],
+)
+def test_save_stream_uploads_unseekable_streams(gcs, make_stream):
+    storage, blob = gcs
+    content = b"x" * (17 * MB + 10)
+    uploaded = []
+    blob.upload_from_file.side_effect = lambda stream: uploaded.append(_resumable_upload(stream, 8 * MB))
+
+    storage.save_stream("upload_files/tenant/file.bin", make_stream(content))
+
+    assert uploaded == [content]
+    bucket = storage.client.get_bucket.return_value
+    assert bucket.blob.call_args.kwargs["chunk_size"] % (256 * 1024) == 0
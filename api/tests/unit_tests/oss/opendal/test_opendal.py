@@ -1,8 +1,10 @@
+import io
 from collections.abc import Generator
 from pathlib import Path
 
 import pytest
 
+from extensions.storage.base_storage import StorageFileReader
 from extensions.storage.opendal_storage import OpenDALStorage
 from tests.unit_tests.oss.__mock.base import (
     get_example_data,
@@ -83,3 +85,28 @@ class TestOpenDAL:
 
         self.storage.delete(filename)
         assert not self.storage.exists(filename)
+
+    def test_load_range(self):
+        """Test loading a byte range."""
+        filename = get_example_filename()
+        data = get_example_data()
+
+        self.storage.save(filename, data)
+        assert self.storage.load_range(filename, 1, 3) == data[1:3]
+        assert self.storage.load_range(filename, 2) == data[2:]
+        assert self.storage.load_range(filename, 3, 3) == b""
+        assert self.storage.get_size(filename) == len(data)
+
+    def test_file_reader(self):
+        """Test reading a file through the seekable reader."""
+        filename = get_example_filename()
+        data = bytes(range(256)) * 16
+
+        self.storage.save(filename, data)
+        with io.BufferedReader(StorageFileReader(self.storage, filename), buffer_size=1000) as file:
+            assert file.read(10) == data[:10]
+            file.seek(-100, io.SEEK_END)
+            assert file.read() == data[-100:]
+            file.seek(2000)
+            assert file.tell() == 2000
+            assert file.read(1500) == data[2000:3500]
@@ -0,0 +1,125 @@
+from datetime import UTC, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from services.app_statistic_rollup_service import (
+    ROLLUP_END_KEY,
+    ROLLUP_START_KEY,
+    AppStatisticRollupService,
+)
+from tests.unit_tests.__mock.fake_redis import FakeRedis
+
+
+class FakeConnection:
+    def __init__(self, results: list[list[dict]]):
+        self.results = results
+        self.executed: list[tuple[str, dict]] = []
+
+    def execute(self, statement, params=None):
+        self.executed.append((str(statement), params))
+        rows = self.results.pop(0) if self.results else []
+        return [SimpleNamespace(_mapping=row) for row in rows]
+
+
+def _mock_db(conn: FakeConnection):
+    engine = MagicMock()
+    engine.begin.return_value.__enter__.return_value = conn
+    return patch("services.app_statistic_rollup_service.db", new=MagicMock(engine=engine))
+
+
+def _set_coverage(fake_redis: FakeRedis, start: datetime, end: datetime):
+    fake_redis.set(ROLLUP_START_KEY, start.isoformat())
+    fake_redis.set(ROLLUP_END_KEY, end.isoformat())
+
+
+def test_get_daily_statistics_without_rollups(fake_redis):
+    assert AppStatisticRollupService.get_daily_statistics("messages", "app_id", "UTC") is None
+
+
+def test_get_daily_statistics_merges_rollups_and_raw_edges(fake_redis):
+    _set_coverage(fake_redis, datetime(2025, 1, 1), datetime(2025, 1, 10, 12))
+    conn = FakeConnection(
+        [
+            # rollups
+            [
+                {"date": "2025-01-09", "message_count": 10, "total_price": Decimal("1.5")},
+                {"date": "2025-01-10", "message_count": 3, "total_price": Decimal("0.5")},
+            ],
+            # raw hours after the rollups
+            [{"date": "2025-01-10", "message_count": 2, "total_price": Decimal("0.25")}],
+        ]
+    )
+
+    with _mock_db(conn):
+        data = AppStatisticRollupService.get_daily_statistics(
+            "messages",
+            "app_id",
+            "UTC",
+            start=datetime(2025, 1, 9, tzinfo=UTC),
+            end=datetime(2025, 1, 11, tzinfo=UTC),
+        )
+
+    assert data == [
+        {"date": "2025-01-09", "message_count": 10, "total_price": Decimal("1.5")},
+        {"date": "2025-01-10", "message_count": 5, "total_price": Decimal("0.75")},
+    ]
+    (rollup_sql, rollup_args), (raw_sql, raw_args) = conn.executed
+    assert "FROM\n    app_statistic_hourly" in rollup_sql
+    assert (rollup_args["start"], rollup_args["end"]) == (datetime(2025, 1, 9), datetime(2025, 1, 10, 12))
+    assert "FROM\n    messages" in raw_sql
+    assert (raw_args["start"], raw_args["end"]) == (datetime(2025, 1, 10, 12), datetime(2025, 1, 11))
+
+
+def test_get_daily_statistics_aligns_rollups_to_hours(fake_redis):
+    _set_coverage(fake_redis, datetime(2025, 1, 1), datetime(2025, 1, 10))
+    conn = FakeConnection([])
+
+    with _mock_db(conn):
+        AppStatisticRollupService.get_daily_statistics(
+            "workflow_runs",
+            "app_id",
+            "UTC",
+            start=datetime(2025, 1, 2, 3, 30, tzinfo=UTC),
+        )
+
+    rollup, before, after = (args for _, args in conn.executed)
+    assert (rollup["start"], rollup["end"]) == (datetime(2025, 1, 2, 4), datetime(2025, 1, 10))
+    assert (before["start"], before["end"]) == (datetime(2025, 1, 2, 3, 30), datetime(2025, 1, 2, 4))
+    assert after["start"] == datetime(2025, 1, 10)
+    assert "end" not in after
+
+
+def test_get_daily_statistics_skips_fractional_hour_timezones(fake_redis):
+    _set_coverage(fake_redis, datetime(2025, 1, 1), datetime(2025, 1, 10))
+
+    assert AppStatisticRollupService.get_daily_statistics("messages", "app_id", "Asia/Kolkata") is None
+
+
+def test_compact_recent_extends_coverage(fake_redis):
+    _set_coverage(fake_redis, datetime(2025, 1, 1), datetime(2025, 1, 10, 12))
+
+    with (
+        patch.object(AppStatisticRollupService, "compact") as compact,
+        patch("services.app_statistic_rollup_service.datetime") as mock_datetime,
+    ):
+        mock_datetime.now.return_value = datetime(2025, 1, 10, 15, 20, tzinfo=UTC)
+        mock_datetime.fromisoformat.side_effect = datetime.fromisoformat
+        AppStatisticRollupService.compact_recent()
+
+    compact.assert_called_once_with(datetime(2025, 1, 10, 10), datetime(2025, 1, 10, 15))
+    assert fake_redis.data[ROLLUP_START_KEY] == datetime(2025, 1, 1).isoformat().encode()
+    assert fake_redis.data[ROLLUP_END_KEY] == datetime(2025, 1, 10, 15).isoformat().encode()
+
+
+def test_backfill_extends_coverage_back_by_day(fake_redis):
+    _set_coverage(fake_redis, datetime(2025, 1, 3), datetime(2025, 1, 10))
+
+    with patch.object(AppStatisticRollupService, "compact") as compact:
+        AppStatisticRollupService.backfill(datetime(2025, 1, 1, 6, 30))
+
+    assert [call.args for call in compact.call_args_list] == [
+        (datetime(2025, 1, 2), datetime(2025, 1, 3)),
+        (datetime(2025, 1, 1, 6), datetime(2025, 1, 2)),
+    ]
+    assert fake_redis.data[ROLLUP_START_KEY] == datetime(2025, 1, 1, 6).isoformat().encode()
@@ -0,0 +1,74 @@
+import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from services.clean_messages_service import CleanMessagesService
+
+
+def _message(message_id: str, app_id: str, minute: int):
+    return SimpleNamespace(id=message_id, app_id=app_id, created_at=datetime.datetime(2025, 1, 1, 0, minute))
+
+
+@pytest.fixture
+def mock_query():
+    query = MagicMock()
+    query.filter.return_value = query
+    query.order_by.return_value = query
+    query.limit.return_value = query
+    with patch("services.clean_messages_service.db", new=MagicMock()) as db:
+        db.session.query.return_value = query
+        yield query
+
+
+def test_clean_sandbox_messages_in_batches(fake_redis, mock_query):
+    mock_query.all.side_effect = [
+        [_message("m1", "a1", 1), _message("m2", "a2", 2)],
+        [_message("m3", "a1", 3)],
+        [],
+    ]
+    watermarks = []
+
+    with (
+        patch.object(
+            CleanMessagesService,
+            "_filter_sandbox_message_ids",
+            side_effect=lambda messages, plans: [m.id for m in messages if m.app_id == "a1"],
+        ),
+        patch.object(CleanMessagesService, "_delete_messages", side_effect=lambda ids: len(ids) * 3) as delete,
+        patch.object(CleanMessagesService, "_set_watermark", side_effect=watermarks.append),
+    ):
+        result = CleanMessagesService.clean_sandbox_messages(before=datetime.datetime(2025, 2, 1), batch_size=2)
+
+    assert [call.args[0] for call in delete.call_args_list] == [["m1"], ["m3"]]
+    assert watermarks == [(datetime.datetime(2025, 1, 1, 0, 2), "m2"), (datetime.datetime(2025, 1, 1, 0, 3), "m3")]
+    assert result == {"scanned": 3, "deleted_messages": 2, "deleted_rows": 6}
+    # completed runs start over from the oldest message
+    assert CleanMessagesService.WATERMARK_KEY not in fake_redis.data
+
+
+def test_clean_sandbox_messages_resumes_from_watermark(fake_redis, mock_query):
+    CleanMessagesService._set_watermark((datetime.datetime(2025, 1, 1), "m2"))
+    mock_query.all.side_effect = [[]]
+
+    CleanMessagesService.clean_sandbox_messages(before=datetime.datetime(2025, 2, 1))
+
+    # created_at < before, then (created_at, id) > watermark
+    assert mock_query.filter.call_count == 2
+    watermark_filter = mock_query.filter.call_args_list[1].args[0]
+    assert [value.value for value in watermark_filter.right.clauses] == [datetime.datetime(2025, 1, 1), "m2"]
+
+
+def test_filter_sandbox_message_ids(fake_redis):
+    fake_redis.setex("features:t1", 600, "sandbox")
+    fake_redis.setex("features:t2", 600, "professional")
+    messages = [_message("m1", "a1", 1), _message("m2", "a2", 2), _message("m3", "deleted_app", 3)]
+
+    with patch("services.clean_messages_service.db", new=MagicMock()) as db:
+        db.session.query.return_value.filter.return_value.all.return_value = [("a1", "t1"), ("a2", "t2")]
+        plans: dict[str, str] = {}
+        message_ids = CleanMessagesService._filter_sandbox_message_ids(messages, plans)
+
+    assert message_ids == ["m1"]
+    assert plans == {"t1": "sandbox", "t2": "professional"}
@@ -0,0 +1,144 @@
+import hashlib
+import io
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from extensions.storage.base_storage import STREAM_CHUNK_SIZE
+from services.errors.file import FileTooLargeError
+from services.file_service import FileService
+
+MB = 1024 * 1024
+
+
+class ChunkedStorage:
+    """Storage consuming streams chunk by chunk, keeping only the written size"""
+
+    def __init__(self):
+        self.saved: dict[str, int] = {}
+        self.deleted: list[str] = []
+
+    def save_stream(self, filename, stream):
+        size = 0
+        while chunk := stream.read(STREAM_CHUNK_SIZE):
+            size += len(chunk)
+        self.saved[filename] = size
+
+    def delete(self, filename):
+        self.deleted.append(filename)
+
+
+class UnsizedStream(io.RawIOBase):
+    """Non seekable stream generating `size` bytes, like a chunked request body"""
+
+    def __init__(self, size: int):
+        self._remaining = size
+        self.consumed = 0
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self._remaining
+        size = min(size, self._remaining)
+        self._remaining -= size
+        self.consumed += size
+        return b"x" * size
+
+
+@pytest.fixture
+def storage():
+    fake = ChunkedStorage()
+    with (
+        patch("services.file_service.storage", fake),
+        patch("services.file_service.db") as mock_db,
+        patch("services.file_service.file_helpers"),
+        patch("services.file_service.dify_config") as mock_config,
+    ):
+        mock_db.session = MagicMock()
+        mock_config.UPLOAD_FILE_SIZE_LIMIT = 15
+        mock_config.STORAGE_TYPE = "opendal"
+        yield fake
+
+
+def _upload(stream):
+    user = SimpleNamespace(id="user-id", tenant_id="tenant-id")
+    return FileService.upload_file_stream(filename="doc.txt", stream=stream, mimetype="text/plain", user=user)
+
+
+def test_upload_file_stream_computes_size_and_hash(storage):
+    content = b"hello world" * 1000
+
+    upload_file = _upload(io.BytesIO(content))
+
+    assert upload_file.size == len(content)
+    assert upload_file.hash == hashlib.sha3_256(content).hexdigest()
+    assert storage.saved[upload_file.key] == len(content)
+
+
+def test_upload_file_keeps_bytes_api(storage):
+    user = SimpleNamespace(id="user-id", tenant_id="tenant-id")
+
+    upload_file = FileService.upload_file(filename="a.txt", content=b"abc", mimetype="text/plain", user=user)
+
+    assert upload_file.size == 3
+    assert upload_file.hash == hashlib.sha3_256(b"abc").hexdigest()
+
+
+def test_oversize_seekable_stream_is_rejected_before_reading(storage):
+    stream = io.BytesIO(b"x" * (16 * MB))
+
+    with pytest.raises(FileTooLargeError):
+        _upload(stream)
+
+    assert stream.tell() == 0
+    assert storage.saved == {}
+
+
+def test_oversize_unsized_stream_is_rejected_early(storage):
+    stream = UnsizedStream(100 * MB)
+
+    with pytest.raises(FileTooLargeError):
+        _upload(stream)
+
+    # reading stops at the first chunk over the limit and the partial file is removed
+    assert stream.consumed <= 15 * MB + STREAM_CHUNK_SIZE
+    assert len(storage.deleted) == 1
+    assert storage.saved == {}
+
+
+def test_upload_file_stream_peak_memory(storage):
+    file_size = 14 * MB
+
+    tracemalloc.start()
+    try:
+        upload_file = _upload(UnsizedStream(file_size))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert upload_file.size == file_size
+    # a few chunks are alive at a time, never the whole file
+    assert peak < 4 * STREAM_CHUNK_SIZE
+
+
+def test_plain_text_preview_reads_only_the_head():
+    content = ("line\r\n" * 2000).encode()
+    with patch("services.file_service.storage") as mock_storage:
+        mock_storage.load_range.side_effect = lambda key, start, end: content[start:end]
+
+        preview = FileService._get_plain_text_preview("upload_files/tenant/doc.txt")
+
+    assert preview == ("line\n" * 2000)[:3000]
+    _, start, end = mock_storage.load_range.call_args[0]
+    assert (start, end) == (0, 3000 * 4 + 1)
+
+
+def test_plain_text_preview_falls_back_on_other_encodings():
+    with patch("services.file_service.storage") as mock_storage:
+        mock_storage.load_range.return_value = "café".encode("latin-1")
+
+        assert FileService._get_plain_text_preview("upload_files/tenant/doc.txt") is None
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from services.workflow_app_service import WorkflowAppService
+
+
+def _compile(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture
+def app_model():
+    return SimpleNamespace(id="app_id", tenant_id="tenant_id")
+
+
+@pytest.fixture(autouse=True)
+def mock_operation_log():
+    with patch("services.workflow_app_service.OperationRecordLog"):
+        yield
+
+
+def test_offset_page_probes_next_page_instead_of_counting(app_model):
+    session = MagicMock()
+    session.scalars.return_value.all.return_value = ["log1", "log2", "log3"]
+
+    pagination = WorkflowAppService().get_paginate_workflow_app_logs(
+        session=session, app_model=app_model, page=2, limit=2, with_count=False
+    )
+
+    assert pagination == {"page": 2, "limit": 2, "total": None, "has_more": True, "data": ["log1", "log2"]}
+    session.scalar.assert_not_called()
+    sql = _compile(session.scalars.call_args.args[0])
+    assert "ORDER BY workflow_app_logs.created_at DESC, workflow_app_logs.id DESC" in sql
+    assert "LIMIT %(param_1)s OFFSET %(param_2)s" in sql
+
+
+def test_offset_page_with_count(app_model):
+    session = MagicMock()
+    session.scalar.return_value = 2
+    session.scalars.return_value.all.return_value = ["log1", "log2"]
+
+    pagination = WorkflowAppService().get_paginate_workflow_app_logs(session=session, app_model=app_model, limit=2)
+
+    assert pagination["total"] == 2
+    assert pagination["has_more"] is False
+
+
+def test_keyset_page_after_last_id(app_model):
+    session = MagicMock()
+    session.execute.return_value.first.return_value = ("2025-01-01 00:00:00",)
+    session.execute.return_value.unique.return_value.scalars.return_value = ["log1"]
+
+    pagination = WorkflowAppService().get_paginate_workflow_app_logs(
+        session=session, app_model=app_model, limit=2, last_id="last_id"
+    )
+
+    assert pagination == {"page": None, "limit": 2, "total": None, "has_more": False, "data": ["log1"]}
+    session.scalar.assert_not_called()
+    sql = _compile(session.execute.call_args.args[0])
+    assert "(workflow_app_logs.created_at, workflow_app_logs.id) < " in sql
+    assert "OFFSET" not in sql